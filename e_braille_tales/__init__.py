@@ -0,0 +1,28 @@
+#The "e_braille_tales" package can be imported by other Python code (for example, a
+#long-running process that keeps the model loaded while handling many documents),
+#while the "e-braille-tales.py" script (or "python3 -m e_braille_tales") provides the
+#command line interface. The deep learning libraries are only imported by "load_model".
+from .document import (BrailleDocument, braille_to_format, braille_to_pef, braille_to_rtf,
+register_writer, write_document, write_file_atomically, writers)
+from .recognition import (assemble_page_string, classify_cells, enable_dot_detection, enable_fine_tuned_models,
+enable_line_models, enable_student_models, get_cell_lookup, get_page_string, is_line_model, load_model, predict_cells,
+predict_line_strips, recognize_cells, recognize_page, select_page_cells)
+from .dot_detection import decode_dot_positions, detect_dots
+from .calibration import calibrate_grid, enable_grid_calibration, fit_grid
+from .confidences import (enable_confidence_sidecars, find_low_confidence_cells, load_confidence_file,
+write_confidence_file)
+from .segmentation import crop_cells, draw_character_rectangles, gather_cells, gather_line_strips, segment_page
+from .transcription import transcribe, transcription_rules
+from .cache import transcribe_incrementally
+from .pipeline import (generate_outputs, get_document_name, group_JPEG_files_by_document, ocr_document,
+ocr_page, read_braille_text_file)
+from .batch import print_batch_summary, process_batch
+from .daemon import watch_folder
+from .debug_images import DebugImageWriter, draw_debug_image
+from .distributed import assemble_documents, run_worker
+from .line_model import convert_to_line_model, create_line_model
+from .distillation import build_student_model, create_student_model
+from .fine_tuning import cache_embeddings, create_fine_tuned_model, split_model_head
+from .dataset import DatasetShardWriter, align_page_cells, build_dataset, load_dataset_index, load_dataset_shard
+from .preview import recognize_region, segment_band, segment_line
+from .server import BrailleServer, InferenceBatcher, serve
@@ -0,0 +1,6 @@
+from .cli import main
+
+#The command line interface is only run when the script is run (and not when its module is
+#imported again by the worker processes of "build_dataset" on platforms that spawn them).
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+import time
+
+from .pipeline import (generate_outputs, get_document_name, group_JPEG_files_by_document, ocr_document,
+read_braille_text_file)
+from .segmentation import first_character_x_min
+
+#The documents of the batch are returned as [document name, JPEG file names] (grouped
+#by "group_JPEG_files_by_document") or [document name, text file name].
+def get_batch_documents(working_folder, text_file_names=None):
+    if text_file_names == None:
+        return list(group_JPEG_files_by_document(os.listdir(os.path.join(working_folder, "OCR Raw Data"))).items())
+    return [[get_document_name(file_name), file_name] for file_name in text_file_names]
+
+#In batch mode, several documents are processed one after the other in the same process,
+#sharing the model (which is loaded at most once, see "load_model") and the transcription
+#rules. When no "text_file_names" are provided, the JPEG images of the "OCR Raw Data"
+#folder of the "working_folder" are grouped into documents by their names (up to the last
+#hyphen, see "group_JPEG_files_by_document"), instead of being gathered into a single
+#document named after the first JPEG image. Otherwise, every modified braille text file
+#of the "text_file_names" (found in the "OCR Raw Data" folder) is processed as its own
+#document. The output files of every document are written to its own subfolder of the
+#"OCR Predictions" folder. Should a document fail, the error is recorded and the code
+#carries on with the next document. The JPEG images with overlaid character rectangles
+#are written by the "debug_images" writer, if one is provided. The summary of the batch is returned as a list of
+#[document name, number of pages (or name of the text file), number of braille cells,
+#output formats that were generated, processing time in seconds, error (or None)].
+def process_batch(working_folder, formats, text_file_names=None, force=False, x_min=first_character_x_min,
+progress=None, debug_images=None):
+    raw_data_folder = os.path.join(working_folder, "OCR Raw Data")
+    summary = []
+    for document_name, document_files in get_batch_documents(working_folder, text_file_names):
+        start_time = time.perf_counter()
+        if text_file_names == None:
+            document_input = str(len(document_files)) + " page(s)"
+        else:
+            document_input = document_files
+        path = os.path.join(working_folder, "OCR Predictions", document_name) + "/"
+        try:
+            if text_file_names != None:
+                character_string = read_braille_text_file(os.path.join(raw_data_folder, document_files))
+            if not os.path.exists(path):
+                os.makedirs(path)
+            if text_file_names == None:
+                character_string = ocr_document(raw_data_folder, document_files, path + document_name,
+                model_path=os.path.join(working_folder, "Model_Perkins_Brailler_acc9997"),
+                debug_images=debug_images, progress=progress, x_min=x_min)
+            generated_formats = generate_outputs(character_string, path + document_name, formats, force)
+            summary.append([document_name, document_input, len(character_string), generated_formats,
+            time.perf_counter() - start_time, None])
+        except Exception as error:
+            summary.append([document_name, document_input, 0, [], time.perf_counter() - start_time, repr(error)])
+    return summary
+
+#The summary of the batch is printed as a table, followed by the totals.
+def print_batch_summary(summary):
+    rows = [["Document", "Input", "Cells", "Output files", "Seconds"]]
+    for document_name, document_input, cell_count, generated_formats, duration, error in summary:
+        if error != None:
+            output_files = "error: " + error
+        elif generated_formats == []:
+            output_files = "up to date"
+        else:
+            output_files = ", ".join(generated_formats)
+        rows.append([document_name, document_input, str(cell_count), output_files, str(round(duration, 2))])
+    column_widths = [max([len(row[i]) for row in rows]) for i in range(4)]
+    for row in rows:
+        print("  ".join([row[i].ljust(column_widths[i]) for i in range(4)] + [row[4].rjust(7)]))
+    error_count = len([row for row in summary if row[5] != None])
+    print("\n" + str(len(summary)) + " document(s) processed in " +
+    str(round(sum([row[4] for row in summary]), 2)) + " seconds, " + str(error_count) + " error(s).")
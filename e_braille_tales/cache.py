@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import re
+
+from . import document, transcription
+from .document import typeform_prefixes, writers
+from .profiling import record_stage, start_stage
+from .transcription import transcribe
+
+#Every output file carries a fingerprint recorded in the "-fingerprints.json" file of
+#the output folder, which is the SHA-256 hash of the braille text it was generated from,
+#of the output format and of the source code of the "document.py" and "transcription.py"
+#modules (which contain the output writers and the transcription rule tables, such that
+#any change made to them will also change the fingerprints). Just like with the "make"
+#utility, an output file is only generated again if it is missing or if its fingerprint
+#has changed since the last run (for example, after correcting mistakes in the ".txt" file).
+source_code_hash = hashlib.sha256()
+for module in [document, transcription]:
+    with open(module.__file__, "rb") as source_file:
+        source_code_hash.update(source_file.read())
+source_code_hash = source_code_hash.hexdigest()
+
+def get_fingerprint(character_string, format_name):
+    return hashlib.sha256((source_code_hash + "\n" + format_name + "\n" +
+    character_string).encode("utf-8")).hexdigest()
+
+#The fingerprints (and the transcription cache, see "transcribe_incrementally" below)
+#are stored in JSON files, which are empty dictionaries when they don't exist yet.
+def load_json_file(file_path):
+    if os.path.exists(file_path):
+        with open(file_path, "r", encoding="utf-8") as json_file:
+            return json.load(json_file)
+    return {}
+
+#The formats for which the output file is missing or out of date are returned.
+def get_stale_formats(character_string, file_root, formats, fingerprints):
+    return [format_name for format_name in formats if not os.path.exists(file_root +
+    writers[format_name][0]) or fingerprints.get(format_name) != get_fingerprint(character_string, format_name)]
+
+#When a modified ".txt" file is submitted again (see the proofreading steps in the README),
+#most of its paragraphs are usually unchanged. The braille text is thus split into paragraphs
+#at the new paragraph ("⠸⠡⠏⠜⠀"), page break ("⠸⠡⠏⠁⠛⠑⠀") and section break ("⠸⠡⠎⠃⠅⠏⠁⠛⠑⠀")
+#RTF commands, and the transcription of every paragraph is stored in the "-transcription cache.json"
+#file of the output folder. Only the paragraphs that aren't found in the cache are transcribed.
+paragraph_boundary_pattern = re.compile("⠸⠡⠏⠜⠀|⠸⠡⠏⠁⠛⠑⠀|⠸⠡⠎⠃⠅⠏⠁⠛⠑⠀")
+
+#The passages written in italics, bold, underline, script, capital letters or grade I
+#(initiated by "⠨⠶", "⠘⠶", "⠸⠶", "⠈⠶", "⠠⠠⠠" and "⠰⠰⠰", respectively) can extend over
+#several paragraphs. The text isn't split within such passages, which are kept together
+#until their terminator symbols ("⠨⠄", "⠘⠄", "⠸⠄", "⠈⠄", "⠠⠄" and "⠰⠄", respectively).
+#Consequently, adding or removing a passage indicator changes the paragraphs that
+#it applies to, which will be transcribed again.
+passage_indicators = ([[typeform_prefix + "⠶", typeform_prefix + "⠄"] for typeform_prefix, typeform in typeform_prefixes] +
+[["⠠⠠⠠", "⠠⠄"], ["⠰⠰⠰", "⠰⠄"]])
+
+def passage_is_open(character_string, index):
+    for passage_initiator, passage_terminator in passage_indicators:
+        initiator_index = character_string.rfind(passage_initiator, 0, index)
+        if initiator_index != -1 and character_string.find(passage_terminator, initiator_index, index) == -1:
+            return True
+    return False
+
+#Every paragraph is returned along with the RTF command that precedes it (or an empty
+#string for the first paragraph), as the transcription of the first word of a paragraph
+#depends on the character before it (for example, "⠦" stands for "his" at the start of a
+#paragraph, but for an opening quotation mark elsewhere). The RTF command that ends the
+#paragraph is included at the end of it.
+def split_paragraphs(character_string):
+    paragraphs = []
+    paragraph_start = 0
+    preceding_command = ""
+    for match in paragraph_boundary_pattern.finditer(character_string):
+        if not passage_is_open(character_string, match.end()):
+            paragraphs.append([preceding_command, character_string[paragraph_start:match.end()]])
+            preceding_command = match.group(0)
+            paragraph_start = match.end()
+    if paragraph_start < len(character_string) or paragraphs == []:
+        paragraphs.append([preceding_command, character_string[paragraph_start:]])
+    return paragraphs
+
+#The paragraph is transcribed after its preceding RTF command, the transcription of which
+#(ex: "\par \tab ") is then removed. Should the transcription not start with that of the
+#RTF command, "None" is returned and the document will be transcribed as a whole instead.
+def transcribe_paragraph(preceding_command, paragraph):
+    if preceding_command == "":
+        return transcribe(paragraph)
+    transcription = transcribe(preceding_command + paragraph)
+    command_transcription = transcribe(preceding_command) + " "
+    if not transcription.startswith(command_transcription):
+        return None
+    return transcription[len(command_transcription):]
+
+#The paragraphs are looked up in the cache by the SHA-256 hash of their braille text
+#(along with the preceding RTF command). The cache is started over if the code was
+#modified since it was written (see "source_code_hash" above), and only the paragraphs
+#of the current version of the document are kept in it. The transcriptions of the
+#paragraphs are joined by spaces, as the transcription removes the leading and trailing
+#spaces of every paragraph. The updated cache is returned along with the transcription.
+def transcribe_incrementally(character_string, transcription_cache):
+    start_time = start_stage()
+    if transcription_cache.get("source_code_hash") != source_code_hash:
+        transcription_cache = {"source_code_hash": source_code_hash, "paragraphs": {}}
+    paragraph_transcriptions = []
+    cached_paragraphs = {}
+    cache_hit_count = 0
+    for preceding_command, paragraph in split_paragraphs(character_string):
+        paragraph_hash = hashlib.sha256((preceding_command + "\n" + paragraph).encode("utf-8")).hexdigest()
+        paragraph_transcription = transcription_cache["paragraphs"].get(paragraph_hash)
+        if paragraph_transcription == None:
+            paragraph_transcription = transcribe_paragraph(preceding_command, paragraph)
+            if paragraph_transcription == None:
+                return transcribe(character_string), {"source_code_hash": source_code_hash, "paragraphs": {}}
+        else:
+            cache_hit_count += 1
+        cached_paragraphs[paragraph_hash] = paragraph_transcription
+        paragraph_transcriptions.append(paragraph_transcription)
+    record_stage("transcription_cache", start_time, paragraphs=len(paragraph_transcriptions),
+    cache_hits=cache_hit_count)
+    return (" ".join(paragraph_transcriptions),
+    {"source_code_hash": source_code_hash, "paragraphs": cached_paragraphs})
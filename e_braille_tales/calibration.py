@@ -0,0 +1,200 @@
+import json
+import os
+import threading
+import cv2
+import numpy as np
+
+from .document import write_file_atomically
+from .profiling import record_stage, start_stage
+from .segmentation import character_spacing, character_width, characters_per_line, crop_margin, first_character_x_min
+
+'''GRID CALIBRATION PARAMETERS'''
+#Instead of finding "x_min" by hand for every brailler and scanner combination (see "Figure 1
+#(explanation of x_min).png"), the grid of braille cells can be calibrated from the pages
+#themselves (with the "--calibrate-grid" option). The pitch of the braille cells (along the x
+#axis) is looked for within "pitch_tolerance" pixels of its nominal value (character_width +
+#character_spacing). The calibration is only made on a page with at least "min_calibration_lines"
+#lines of braille cells, holding braille characters in at least "min_calibration_cells" of the 41
+#positions along the lines (as the pitch can't be told apart over only a few braille cells), and
+#only kept if the contrast of the dot columns (see "fit_grid") is at least "min_grid_contrast".
+#It is then cached for the scanner profile (see "enable_grid_calibration") and the size of the
+#pages, and on every page that follows, "x_min" is only corrected by at most "max_grid_drift"
+#pixels, for the page might have moved slightly on the scanner. Should a page hold braille
+#characters just outside of the 41 braille cells of the cached grid, the grid is fitted again.
+pitch_tolerance = 3
+min_calibration_lines = 3
+min_calibration_cells = 20
+min_grid_contrast = 0.5
+max_grid_drift = 12
+grid_settings = {"calibration": False, "cache_file_path": None, "scanner_profile": "default"}
+grid_calibrations = {}
+grid_calibration_lock = threading.Lock()
+
+#The calibrations are cached in a JSON file (such as the "OCR Grid Calibration.json" file of the
+#working folder), under the name of the scanner profile, such that the pages scanned with other
+#scanners (or settings) can be calibrated separately. The file (or its entry for the scanner
+#profile) should be removed to calibrate the grid again.
+def enable_grid_calibration(cache_file_path, scanner_profile="default", enabled=True):
+    grid_settings["calibration"] = enabled
+    grid_settings["cache_file_path"] = cache_file_path
+    grid_settings["scanner_profile"] = scanner_profile
+    grid_calibrations.clear()
+    if enabled and os.path.exists(cache_file_path):
+        with open(cache_file_path, "r", encoding="utf-8") as cache_file:
+            grid_calibrations.update(json.load(cache_file))
+
+#The column projection profile of the page counts the non-white pixels (!= 255, as in
+#"count_non_white_pixels") along the y axis for every x coordinate, only within the lines of
+#braille cells found by "segment_page" (every line being given by its first braille cell).
+#The x coordinates where more than half of the pixels are non-white (such as the darkened
+#edges of the scanned image) are left out, as they can't be braille dots.
+def get_column_profile(image, chars_x_y_coordinates):
+    profile = np.zeros(image.shape[0], np.int64)
+    line_pixel_count = 0
+    for char_x_y_coordinates in chars_x_y_coordinates[::characters_per_line]:
+        y_min, y_max = char_x_y_coordinates[0][1], char_x_y_coordinates[1][1]
+        line_mask = (image[:, y_min:y_max] != 255).view(np.uint8)
+        profile += cv2.reduce(line_mask, 1, cv2.REDUCE_SUM, dtype=cv2.CV_32S)[:, 0]
+        line_pixel_count += y_max - y_min
+    profile[profile > line_pixel_count/2] = 0
+    return profile
+
+#The template of a braille cell along the x axis is positive over its two columns of dots (a
+#quarter and three quarters of the way across the braille cell, a quarter of the braille cell
+#wide), and negative elsewhere, up to the next braille cell, such that it sums to zero. Every
+#length is scaled with the pitch of the braille cells.
+def get_cell_template(cell_pitch):
+    scale = cell_pitch/(character_width + character_spacing)
+    positions = np.arange(cell_pitch)
+    dot_columns = np.zeros(cell_pitch, np.bool_)
+    for dot_column in [character_width/4, 3*character_width/4]:
+        dot_columns |= np.abs(positions - dot_column*scale) <= character_width/8*scale
+    return np.where(dot_columns, 1/dot_columns.sum(), -1/(~dot_columns).sum())
+
+#The numbers of non-white pixels of the column projection profile within the braille cells
+#starting at the "x_mins" are found from its cumulative sum ("cumulative_profile").
+def get_cell_pixel_counts(cumulative_profile, x_mins):
+    return cumulative_profile[x_mins + character_width] - cumulative_profile[x_mins]
+
+#The pitch and phase of the grid (the position of the first braille cell, modulo the pitch)
+#are found by folding the column projection profile over every candidate pitch (adding up
+#the x coordinates that lie at the same position within a braille cell), and cross-correlating
+#the folded profile with the template of a braille cell (see "get_cell_template") for every
+#phase at once. The folded profile only stays sharp for the right pitch. The contrast of the
+#dot columns is the score of the best pitch and phase, relative to the average number of
+#non-white pixels per x coordinate of the profile. Then, as the braille cells of the grid
+#could start at any multiple of the pitch after the phase, the grid is anchored by its extent
+#of 41 braille cells: the first braille cell is the one for which the 41 braille cells of the
+#grid hold the most non-white pixels (such that a page on which every line is indented, leaving
+#the first braille cell empty, doesn't shift the grid). Should several of them hold all of the
+#braille characters of the page (as when the lines are shorter than 41 braille cells), the one
+#closest to "nominal_x_min" (the "x_min" given to "segment_page") is kept. The [x_min, cell_pitch,
+#contrast] of the grid are returned, or None if the profile is empty, if too few braille cells of
+#the grid (at least a quarter as inked as the most inked braille cells) hold braille characters
+#or if the grid wouldn't fit within the page.
+def fit_grid(profile, nominal_pitch=character_width + character_spacing, nominal_x_min=first_character_x_min):
+    if profile.sum() == 0:
+        return None
+    x_coordinates = np.arange(len(profile))
+    best_fit = None
+    for cell_pitch in range(nominal_pitch - pitch_tolerance, nominal_pitch + pitch_tolerance + 1):
+        folded_profile = np.bincount(x_coordinates % cell_pitch, profile, cell_pitch)
+        phases = np.arange(cell_pitch)
+        scores = folded_profile[(phases[:, None] + phases[None, :]) % cell_pitch] @ get_cell_template(cell_pitch)
+        contrast = scores.max()*cell_pitch/profile.sum()
+        if best_fit == None or contrast > best_fit[2]:
+            best_fit = [int(np.argmax(scores)), cell_pitch, float(contrast)]
+    phase, cell_pitch, contrast = best_fit
+
+    cumulative_profile = np.concatenate([[0], np.cumsum(profile)])
+    x_mins = np.arange(phase, len(profile) - character_width, cell_pitch)
+    cell_pixel_counts = get_cell_pixel_counts(cumulative_profile, x_mins)
+    if (cell_pixel_counts >= cell_pixel_counts.max()/4).sum() < min_calibration_cells:
+        return None
+    #The non-white pixels of the 41 braille cells of the grid starting at every braille cell,
+    #for the grids that fit within the page.
+    cumulative_cell_pixel_counts = np.concatenate([[0], np.cumsum(cell_pixel_counts)])
+    grid_pixel_counts = (cumulative_cell_pixel_counts[characters_per_line:] -
+    cumulative_cell_pixel_counts[:-characters_per_line])
+    grid_x_mins = x_mins[:len(grid_pixel_counts)]
+    fitting_grids = ((grid_x_mins - crop_margin >= 0) &
+    (grid_x_mins + (characters_per_line-1)*cell_pitch + character_width + crop_margin <= len(profile)))
+    if not fitting_grids.any():
+        return None
+    grid_x_mins = grid_x_mins[fitting_grids & (grid_pixel_counts == grid_pixel_counts[fitting_grids].max())]
+    x_min = int(grid_x_mins[np.argmin(np.abs(grid_x_mins - nominal_x_min))])
+    return [x_min, cell_pitch, contrast]
+
+#The drift of the page relative to the cached grid is corrected by looking for the "x_min" (within
+#"max_grid_drift" pixels of that of the cached grid) for which the 41 braille cells of the lines
+#best match the template of a braille cell (see "get_cell_template"). The response of the template
+#is found for every x coordinate with "np.correlate", and then added up over the braille cells of
+#the grid for every candidate "x_min" at once. The x_min of the cached grid is kept should the
+#page hold no braille dots.
+def correct_grid_drift(profile, x_min, cell_pitch):
+    if profile.sum() == 0:
+        return x_min
+    template_responses = np.correlate(profile, get_cell_template(cell_pitch), "valid")
+    grid_length = (characters_per_line-1)*cell_pitch
+    x_mins = np.arange(max(crop_margin, x_min - max_grid_drift),
+    min(x_min + max_grid_drift, len(template_responses) - grid_length - 1, len(profile) - grid_length -
+    character_width - crop_margin) + 1)
+    if len(x_mins) == 0:
+        return x_min
+    scores = template_responses[x_mins[:, None] + cell_pitch*np.arange(characters_per_line)[None, :]].sum(axis=1)
+    #Should several x_min have the same score, the one closest to that of the cached grid is kept.
+    return int(x_mins[np.lexsort((np.abs(x_mins - x_min), -scores))[0]])
+
+#The page holds braille characters outside of the grid should the braille cell just before its
+#first braille cell (or just after its last one) be at least a quarter as inked as the most inked
+#braille cells of the grid, as for the lines of a page that are indented (or longer) than those of
+#the page on which the grid was calibrated, when the grid is shifted by one or more braille cells.
+def holds_cells_outside_grid(profile, x_min, cell_pitch):
+    cumulative_profile = np.concatenate([[0], np.cumsum(profile)])
+    grid_pixel_counts = get_cell_pixel_counts(cumulative_profile, x_min + cell_pitch*np.arange(characters_per_line))
+    outside_x_mins = np.array([x_min - cell_pitch, x_min + characters_per_line*cell_pitch])
+    outside_x_mins = outside_x_mins[(outside_x_mins >= 0) & (outside_x_mins + character_width <= len(profile))]
+    return bool((get_cell_pixel_counts(cumulative_profile, outside_x_mins) >= grid_pixel_counts.max()/4).any())
+
+#The braille character coordinates found by "segment_page" are moved to the calibrated grid,
+#line by line, the braille cells being spaced by "cell_pitch" pixels from "x_min".
+def place_grid(chars_x_y_coordinates, x_min, cell_pitch):
+    return [[[x_min + (i % characters_per_line)*cell_pitch, char_x_y_coordinates[0][1]],
+    [x_min + (i % characters_per_line)*cell_pitch + character_width, char_x_y_coordinates[1][1]]]
+    for i, char_x_y_coordinates in enumerate(chars_x_y_coordinates)]
+
+#With grid calibration, the braille character coordinates of the page (see "segment_page") are
+#moved to the grid calibrated for the scanner profile and the size of the page, after correcting
+#its drift on this page (see "correct_grid_drift"). When there is no calibration yet (or when the
+#page holds braille characters outside of the cached grid, see "holds_cells_outside_grid"), the
+#grid is fitted to the page (see "fit_grid", around the "x_min" given to "segment_page", or that of
+#the cached grid) and, should the fit be reliable enough, it is cached for the pages that follow.
+#Otherwise, the cached grid is kept, and without one, the braille character coordinates are
+#returned as they are (with the "x_min" given to "segment_page").
+def calibrate_grid(image, chars_x_y_coordinates):
+    if not grid_settings["calibration"] or len(chars_x_y_coordinates) == 0:
+        return chars_x_y_coordinates
+    start_time = start_stage()
+    profile = get_column_profile(image, chars_x_y_coordinates)
+    calibration_key = grid_settings["scanner_profile"] + " (" + str(image.shape[0]) + "x" + str(image.shape[1]) + ")"
+    with grid_calibration_lock:
+        calibration = grid_calibrations.get(calibration_key)
+        if calibration != None:
+            x_min = correct_grid_drift(profile, calibration["x_min"], calibration["cell_pitch"])
+        if calibration == None or holds_cells_outside_grid(profile, x_min, calibration["cell_pitch"]):
+            grid = None
+            if len(chars_x_y_coordinates)//characters_per_line >= min_calibration_lines:
+                grid = fit_grid(profile, nominal_x_min=chars_x_y_coordinates[0][0][0] if calibration == None else x_min)
+            if grid != None and grid[2] >= min_grid_contrast:
+                x_min = grid[0]
+                calibration = {"x_min": grid[0], "cell_pitch": grid[1], "contrast": round(grid[2], 3)}
+                if grid_calibrations.get(calibration_key) != calibration:
+                    grid_calibrations[calibration_key] = calibration
+                    if grid_settings["cache_file_path"] != None:
+                        write_file_atomically(grid_settings["cache_file_path"], json.dumps(grid_calibrations,
+                        indent=1))
+            elif calibration == None:
+                record_stage("grid_calibration", start_time, pages=1)
+                return chars_x_y_coordinates
+    record_stage("grid_calibration", start_time, pages=1)
+    return place_grid(chars_x_y_coordinates, x_min, calibration["cell_pitch"])
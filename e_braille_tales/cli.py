@@ -0,0 +1,409 @@
+import argparse
+import json
+import os
+from alive_progress import alive_bar
+
+from .batch import get_batch_documents, print_batch_summary, process_batch
+from .calibration import enable_grid_calibration
+from .confidences import enable_confidence_sidecars, find_low_confidence_cells, print_low_confidence_cells
+from .daemon import watch_folder
+from .dataset import build_dataset, print_dataset_summary
+from .debug_images import DebugImageWriter, debug_image_grids
+from .distillation import create_student_model, print_student_model_report
+from .fine_tuning import create_fine_tuned_model, print_fine_tuning_report
+from .distributed import assemble_documents, run_worker
+from .document import write_file_atomically, writers
+from .line_model import create_line_model, print_line_model_report
+from .recognition import (enable_dot_detection, enable_fine_tuned_models, enable_line_models, enable_student_models,
+load_model)
+from .pipeline import decode_grayscale_JPEG, generate_outputs, get_document_name, ocr_document, read_braille_text_file
+from .preview import parse_region, print_region_preview, recognize_region
+from .profiling import (enable_profiling, get_profile_report, print_memory_report, print_profile_summary,
+print_rule_profile, rule_sort_keys)
+from .segmentation import first_character_x_min
+from .server import serve
+
+#The number of pages between debug images is a positive integer, and their scale is
+#a number between 0 (excluded) and 1.
+def positive_integer(value):
+    if not value.isdigit() or int(value) == 0:
+        raise argparse.ArgumentTypeError("expected a positive integer, got " + repr(value))
+    return int(value)
+
+def scale_factor(value):
+    try:
+        scale = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected a number, got " + repr(value))
+    if not 0 < scale <= 1:
+        raise argparse.ArgumentTypeError("expected a number between 0 (excluded) and 1, got " + repr(value))
+    return scale
+
+#The region of interest of "--region" is given as "Y_MIN:Y_MAX" (see "parse_region").
+def region_of_interest(value):
+    try:
+        return parse_region(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+
+#The output formats are provided as a comma-separated list of format names (ex: "rtf,pef,brf,txt").
+def output_formats(value):
+    formats = [format_name.strip() for format_name in value.split(",") if format_name.strip() != ""]
+    unknown_formats = [format_name for format_name in formats if format_name not in writers]
+    if unknown_formats != []:
+        raise argparse.ArgumentTypeError("unknown output format(s): " + ", ".join(unknown_formats) +
+        " (available formats: " + ", ".join(writers) + ")")
+    return formats
+
+#Should a text file name be provided for a modified braille text file
+#(found within the "OCR Raw Data" subfolder of the current working folder,
+#ex: python3 e-braille-tales.py "my_file.txt") the OCR code will be
+#skipped altogether and only the writing of the output files, such as the
+#Portable Embosser Format (PEF) file and transcription to printed English
+#(RTF document), will be performed. If no file name is provided, the code will
+#carry on with the OCR step of the JPEG images found in the "OCR Raw Data" folder.
+#Several text file names may be provided, in which case they are processed one after
+#the other in batch mode (see "process_batch"). The "--batch" option also groups the
+#JPEG images of the "OCR Raw Data" folder into separate documents by their names.
+#The "--formats" option selects the output files to be generated in a single run
+#(ex: python3 e-braille-tales.py --formats rtf,pef,brf,txt), among the following:
+#RTF document ("rtf"), PEF file ("pef"), Braille Ready Format file ("brf") and
+#printed English plain text file ("txt"). The output files that are already up to
+#date (see "get_fingerprint") are skipped, unless the "--force" option is used.
+#The "--x-min" option sets the x pixel at which the first braille cell begins
+#in each line (see "Figure 1 (explanation of x_min).png"). The "--calibrate-grid" option finds
+#"x_min" and the pitch of the braille cells from the pages themselves instead, and caches them in
+#the "OCR Grid Calibration.json" file of the working folder for the scanner profile given after
+#the option (see "calibrate_grid"), "--x-min" only being used until the grid is calibrated.
+#The "--watch" option keeps the code running and processes the JPEG images as they are added
+#to the "OCR Raw Data" folder, checking for new images every "--interval" seconds (see "watch_folder").
+#The "--serve" option starts a local HTTP server instead, on the port given by
+#the "--port" option, to which the pages and braille text can be submitted
+#by other programs (see "RequestHandler" for the available requests).
+#The "--worker" and "--assemble" options share the OCR of the JPEG images of
+#the "OCR Raw Data" folder between several computers (see "run_worker").
+#The "--profile" option times every stage of the run (see "record_stage") and writes
+#the profile report to a JSON file at the end of the run, along with a summary. The
+#"--profile-rules" option also counts the matches and bytes copied by every transcription
+#rule (see "profile_rule"), and prints them in a table sorted by the "--sort-rules-by" column.
+#The "--memory-report" option accounts for the memory used by every stage and transcription
+#rule (see "start_memory_stage"), and flags the stages that grow super-linearly.
+#The "--debug-images" option writes the JPEG images with overlaid character rectangles
+#to the "Page image files with rectangles" folder, for one page out of every "--debug-every"
+#pages, downscaled by the "--debug-scale" factor (see "DebugImageWriter").
+#The "--convert-line-model" option converts the model into a line model, which classifies
+#all of the braille cells of a line in a single pass (see "convert_to_line_model"), fine-tunes
+#it for "--epochs" epochs on the dataset found in the folder given after the option, compares it
+#with the model and only writes it if its validation accuracy is at most "--accuracy-budget"
+#percentage points below that of the model (see "create_line_model"). The "--line-model" option
+#then uses the line model instead of the model for OCR, in every mode. The "--distill" option trains
+#a much smaller student model on the predictions of the model, for "--epochs" epochs, on the dataset
+#found in the folder given after the option, and only writes it if its validation accuracy is at
+#most "--accuracy-budget" percentage points below that of the model (see "create_student_model").
+#The "--student-model" option then uses the student model instead of the model for OCR, in every
+#mode (and with "--line-model", the line model converted from it). The "--build-dataset" option
+#aligns the braille cells of the JPEG images of the "OCR Raw Data" folder with the proofread
+#braille text of their documents, and writes them to a sharded dataset in the folder given after
+#the option, cropping the pages in "--processes" worker processes (see "build_dataset"). The
+#"--fine-tune" option adapts the model to another brailler by only training its classification
+#head, for "--epochs" epochs, on the embeddings of the braille cells of the dataset found in the
+#folder given after the option, which are computed once by the rest of the model and cached in
+#the dataset folder (see "create_fine_tuned_model"), and only writes the fine-tuned model if its
+#validation accuracy is at most "--accuracy-budget" percentage points below that of the model. The
+#"--fine-tuned-model" option then uses the fine-tuned model instead of the model for OCR, in every
+#mode. The "--confidences" option keeps the most probable braille cells of every braille cell (3 by
+#default, or the number given after the option) and their probabilities, in a sidecar file per page
+#(see "write_confidence_file"). The "--low-confidence" option then lists the braille cells of the
+#documents given after the option (or of every document) whose probability is below
+#"--confidence-threshold" percent, without submitting the pages to OCR again (see
+#"find_low_confidence_cells"). The "--preview" option only submits the line "--line" (starting at 1
+#from the top of the page, or at -1 from the bottom) or the region of interest "--region" of the
+#JPEG image given after the option to OCR, and prints its braille text and its transcription to
+#printed English (see "recognize_region"). The "--dot-detection" option decodes the braille cells
+#from their dots, and only submits the ambiguous ones to the model (see "recognize_cells").
+def get_parser():
+    parser = argparse.ArgumentParser(description="Braille OCR and transcription to printed English.")
+    parser.add_argument("file_names", nargs="*",
+    help='name(s) of modified braille text file(s) found in the "OCR Raw Data" folder')
+    parser.add_argument("--formats", type=output_formats, default="rtf,pef",
+    help="comma-separated list of output formats (default: rtf,pef), among: " + ", ".join(writers))
+    parser.add_argument("--force", action="store_true",
+    help="generate the output files again even if they are up to date")
+    parser.add_argument("--batch", action="store_true",
+    help='process the JPEG images of every document found in the "OCR Raw Data" folder')
+    parser.add_argument("--x-min", type=int, default=first_character_x_min,
+    help="x pixel at which the first braille cell begins in each line (default: " +
+    str(first_character_x_min) + ")")
+    parser.add_argument("--calibrate-grid", nargs="?", const="default", default=None, metavar="SCANNER_PROFILE",
+    help='find x_min and the pitch of the braille cells from the pages, and cache them for SCANNER_PROFILE '
+    '(default: "default") in the "OCR Grid Calibration.json" file of the working folder')
+    parser.add_argument("--watch", action="store_true",
+    help='keep running and process the JPEG images as they are added to the "OCR Raw Data" folder')
+    parser.add_argument("--interval", type=float, default=2,
+    help="number of seconds between checks of the \"OCR Raw Data\" folder with --watch (default: 2)")
+    parser.add_argument("--serve", action="store_true",
+    help="start a local HTTP server for page OCR and transcription requests")
+    parser.add_argument("--port", type=int, default=8765,
+    help="port of the HTTP server with --serve (default: 8765)")
+    parser.add_argument("--worker", action="store_true",
+    help='submit the pages found in the "OCR Raw Data" folder to OCR, along with the other workers '
+    'sharing the working folder')
+    parser.add_argument("--assemble", action="store_true",
+    help="generate the output files of the documents once all of their pages were processed by the workers")
+    parser.add_argument("--lease-duration", type=float, default=600,
+    help="number of seconds after which a page claimed by a worker may be claimed by another worker "
+    "(default: 600)")
+    parser.add_argument("--profile", nargs="?", const="e-Braille Tales profile.json", default=None,
+    metavar="JSON_FILE", help="time every stage of the run and write the profile report to JSON_FILE "
+    '(default: "e-Braille Tales profile.json" in the working folder)')
+    parser.add_argument("--profile-rules", action="store_true",
+    help="also profile every transcription rule (duration, regular expression matches and bytes copied), "
+    "which implies --profile")
+    parser.add_argument("--sort-rules-by", choices=rule_sort_keys, default="seconds",
+    help="column by which the transcription rules are sorted with --profile-rules (default: seconds)")
+    parser.add_argument("--memory-report", action="store_true",
+    help="also account for the memory allocated by every stage and transcription rule (with tracemalloc "
+    "and RSS sampling), which implies --profile")
+    parser.add_argument("--debug-images", choices=debug_image_grids, default="off",
+    help='write the page images overlaid with a rectangle around every braille cell ("cells") or line '
+    '("lines") to the "Page image files with rectangles" folder (default: off)')
+    parser.add_argument("--debug-every", type=positive_integer, default=1,
+    help="write a debug image for one page out of every DEBUG_EVERY pages (default: 1)")
+    parser.add_argument("--debug-scale", type=scale_factor, default=1.0,
+    help="scale factor of the debug images, ex: 0.25 (default: 1)")
+    parser.add_argument("--convert-line-model", default=None, metavar="DATASET_FOLDER",
+    help="convert the model into a line model classifying whole lines of braille cells, fine-tune it on the "
+    "dataset of braille cell images found in DATASET_FOLDER and compare it with the model")
+    parser.add_argument("--epochs", type=int, default=None,
+    help="number of epochs of fine-tuning of the line model with --convert-line-model (default: 1), of "
+    "training of the student model with --distill (default: 10), or of training of the classification head "
+    "with --fine-tune (default: 10)")
+    parser.add_argument("--line-model", action="store_true",
+    help='use the line model ("Model_Perkins_Brailler_acc9997-lines", see --convert-line-model) for OCR')
+    parser.add_argument("--distill", default=None, metavar="DATASET_FOLDER",
+    help="train a much smaller student model on the predictions of the model, over the dataset of braille "
+    "cell images found in DATASET_FOLDER, and compare it with the model")
+    parser.add_argument("--accuracy-budget", type=float, default=0.1,
+    help="number of percentage points by which the validation accuracy of the student model with --distill "
+    "(or of the line model with --convert-line-model, or of the fine-tuned model with --fine-tune) may fall "
+    "below that of the model (default: 0.1)")
+    parser.add_argument("--build-dataset", default=None, metavar="DATASET_FOLDER",
+    help='build a sharded dataset of braille cell images in DATASET_FOLDER from the JPEG images of the '
+    '"OCR Raw Data" folder and the proofread "-OCR results.txt" files of their documents')
+    parser.add_argument("--processes", type=positive_integer, default=None,
+    help="number of worker processes cropping the pages with --build-dataset (default: number of CPU cores)")
+    parser.add_argument("--student-model", action="store_true",
+    help='use the student model ("Model_Perkins_Brailler_acc9997-student", see --distill) for OCR')
+    parser.add_argument("--fine-tune", default=None, metavar="DATASET_FOLDER",
+    help="fine-tune the classification head of the model on the cached embeddings of the braille cell images "
+    "found in DATASET_FOLDER, and compare it with the model")
+    parser.add_argument("--fine-tuned-model", action="store_true",
+    help='use the fine-tuned model ("Model_Perkins_Brailler_acc9997-finetuned", see --fine-tune) for OCR')
+    parser.add_argument("--confidences", nargs="?", type=positive_integer, const=3, default=None, metavar="TOP_K",
+    help='write the TOP_K most probable braille cells of every braille cell and their probabilities to a sidecar '
+    'file per page, in the "-OCR confidences" folder of the document (default: 3)')
+    parser.add_argument("--low-confidence", nargs="*", default=None, metavar="DOCUMENT_NAME",
+    help="list the braille cells of the documents (default: every document of the \"OCR Predictions\" folder) "
+    "whose probability is below --confidence-threshold, from the sidecar files written with --confidences")
+    parser.add_argument("--confidence-threshold", type=float, default=90,
+    help="probability (in percent) below which the braille cells are listed with --low-confidence (default: 90)")
+    parser.add_argument("--preview", default=None, metavar="JPEG_FILE",
+    help='only submit a line (--line) or a region of interest (--region) of JPEG_FILE (found in the working '
+    'folder or in the "OCR Raw Data" folder) to OCR, and print its braille text and its transcription')
+    parser.add_argument("--line", type=int, default=None,
+    help="number of the line of braille cells to preview with --preview, starting at 1 from the top of the page, "
+    "or at -1 from the bottom (the last line typed)")
+    parser.add_argument("--region", type=region_of_interest, default=None, metavar="Y_MIN:Y_MAX",
+    help="range of y pixels spanned by the lines of braille cells to preview with --preview (the columns of the "
+    "JPEG image scanned in portrait mode)")
+    parser.add_argument("--dot-detection", action="store_true",
+    help="decode the braille cells from their dots, only submitting the ambiguous braille cells to the model")
+    return parser
+
+def main(argv=None):
+    #Clear the command line screen
+    os.system('clear')
+    cwd = os.getcwd()
+    parser = get_parser()
+    args = parser.parse_args(argv)
+
+    modes = [args.watch, args.serve, args.batch, args.worker, args.assemble, args.convert_line_model != None,
+    args.distill != None, args.build_dataset != None, args.fine_tune != None, args.low_confidence != None,
+    args.preview != None]
+    if len([mode for mode in modes if mode]) > 1:
+        parser.error("only one of --watch, --serve, --batch, --worker, --assemble, --convert-line-model, " +
+        "--distill, --build-dataset, --fine-tune, --low-confidence and --preview can be used at a time")
+    if any(modes) and args.file_names != []:
+        parser.error("text file names can't be provided along with --watch, --serve, --batch, --worker, " +
+        "--assemble, --convert-line-model, --distill, --build-dataset, --fine-tune, --low-confidence or --preview")
+    if args.preview != None and (args.line == None) == (args.region == None):
+        parser.error("either --line or --region must be provided along with --preview")
+    if args.preview == None and (args.line != None or args.region != None):
+        parser.error("--line and --region can only be used along with --preview")
+    if args.line_model and (args.convert_line_model != None or args.distill != None or args.build_dataset != None or
+    args.fine_tune != None):
+        parser.error("--line-model can't be used along with --convert-line-model, --distill, --build-dataset or " +
+        "--fine-tune")
+    if args.student_model and args.distill != None:
+        parser.error("--student-model can't be used along with --distill")
+    if args.fine_tuned_model and (args.distill != None or args.fine_tune != None):
+        parser.error("--fine-tuned-model can't be used along with --distill or --fine-tune")
+    if args.line_model:
+        enable_line_models()
+    if args.student_model:
+        enable_student_models()
+    if args.fine_tuned_model:
+        enable_fine_tuned_models()
+    if args.confidences != None:
+        enable_confidence_sidecars(args.confidences)
+    if args.dot_detection:
+        enable_dot_detection()
+    if args.calibrate_grid != None:
+        enable_grid_calibration(os.path.join(cwd, "OCR Grid Calibration.json"), args.calibrate_grid)
+    if (args.profile_rules or args.memory_report) and args.profile == None:
+        args.profile = "e-Braille Tales profile.json"
+    if args.profile == None:
+        run(args, cwd)
+        return
+    #The profile report is also written when the run is interrupted (for example, when
+    #stopping the "--watch" or "--serve" modes with "Ctrl+C") or ends with an error.
+    enable_profiling(args.profile_rules, args.memory_report)
+    try:
+        run(args, cwd)
+    finally:
+        report = get_profile_report()
+        profile_file_path = os.path.join(cwd, args.profile)
+        write_file_atomically(profile_file_path, json.dumps(report, indent=1))
+        print("\nProfile report written to " + profile_file_path + ":\n")
+        print_profile_summary(report)
+        if args.profile_rules:
+            print("\nTranscription rules (sorted by " + args.sort_rules_by + "):\n")
+            print_rule_profile(report, args.sort_rules_by)
+        if args.memory_report:
+            print("\nMemory report (traced Python allocations and RSS of the process):\n")
+            print_memory_report(report)
+
+#The debug images are written in the background while the documents are processed (see
+#"run_mode"), and the remaining ones are written before returning.
+def run(args, cwd):
+    if args.debug_images == "off":
+        run_mode(args, cwd, None)
+        return
+    debug_images = DebugImageWriter(cwd + "/Page image files with rectangles/", args.debug_images,
+    args.debug_every, args.debug_scale)
+    try:
+        run_mode(args, cwd, debug_images)
+    finally:
+        debug_images.close()
+
+#The documents are processed according to the mode selected by the command line options.
+def run_mode(args, cwd, debug_images):
+    if args.convert_line_model != None:
+        print_line_model_report(create_line_model(cwd, args.convert_line_model,
+        1 if args.epochs == None else args.epochs, args.accuracy_budget/100, args.x_min))
+        return
+    if args.build_dataset != None:
+        summary, index = build_dataset(cwd, os.path.join(cwd, args.build_dataset), args.x_min, args.processes)
+        print_dataset_summary(summary, index)
+        if any([row[6] != None for row in summary]):
+            raise SystemExit(1)
+        return
+    if args.distill != None:
+        print_student_model_report(create_student_model(cwd, args.distill, 10 if args.epochs == None else args.epochs,
+        args.accuracy_budget/100, args.x_min))
+        return
+    if args.low_confidence != None:
+        print_low_confidence_cells(*find_low_confidence_cells(cwd, args.low_confidence, args.confidence_threshold/100),
+        args.confidence_threshold/100)
+        return
+    if args.fine_tune != None:
+        print_fine_tuning_report(create_fine_tuned_model(cwd, args.fine_tune,
+        10 if args.epochs == None else args.epochs, args.accuracy_budget/100))
+        return
+    if args.preview != None:
+        JPEG_file_path = os.path.join(cwd, args.preview)
+        if not os.path.exists(JPEG_file_path):
+            JPEG_file_path = os.path.join(cwd, "OCR Raw Data", args.preview)
+        with open(JPEG_file_path, "rb") as JPEG_file:
+            text_image_gray = decode_grayscale_JPEG(JPEG_file.read())
+        try:
+            preview = recognize_region(load_model(cwd + '/Model_Perkins_Brailler_acc9997'), text_image_gray,
+            args.region, args.line, args.x_min)
+        except ValueError as error:
+            print("error: " + str(error))
+            raise SystemExit(1)
+        print_region_preview(preview)
+        return
+    if args.worker:
+        processed_page_count = run_worker(cwd, args.lease_duration, x_min=args.x_min, debug_images=debug_images)
+        print(str(processed_page_count) + " page(s) processed by this worker. All of the pages were processed.")
+        return
+    if args.assemble:
+        summary = assemble_documents(cwd, args.formats, args.force)
+        print_batch_summary(summary)
+        if any([row[5] != None for row in summary]):
+            raise SystemExit(1)
+        return
+    if args.serve:
+        try:
+            serve(load_model(cwd + '/Model_Perkins_Brailler_acc9997'), port=args.port, x_min=args.x_min)
+        except KeyboardInterrupt:
+            pass
+        return
+    if args.watch:
+        try:
+            watch_folder(cwd, args.formats, args.interval, x_min=args.x_min, debug_images=debug_images)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.batch or len(args.file_names) > 1:
+        if args.batch:
+            text_file_names = None
+            page_count = sum([len(document[1]) for document in get_batch_documents(cwd)])
+            print("Currently processing a total of " + str(page_count) + " JPEG scanned images of braille text.\n")
+        else:
+            text_file_names = args.file_names
+            page_count = 0
+        with alive_bar(page_count, disable=page_count == 0) as bar:
+            summary = process_batch(cwd, args.formats, text_file_names, args.force, args.x_min, bar, debug_images)
+        print_batch_summary(summary)
+        if any([row[5] != None for row in summary]):
+            raise SystemExit(1)
+        return
+
+    if args.file_names == []:
+        #The list "JPEG_file_names" is populated with the ".jpg" file names in
+        #the "OCR Raw Data" folder.
+        JPEG_file_names = ([file_name for file_name in sorted(os.listdir(cwd +
+        "/OCR Raw Data/")) if file_name[-4:] == ".jpg"])
+        OCR_text_file_name = get_document_name(JPEG_file_names[0])
+    else:
+        OCR_text_file_name = get_document_name(args.file_names[0])
+
+    #If there isn't already a subfolder by the name of the document in the
+    #"OCR Predictions" folder, such a one will be created.
+    path = cwd + "/OCR Predictions/" + OCR_text_file_name + "/"
+    if not os.path.exists(path):
+        os.makedirs(path)
+
+    if args.file_names == []:
+        print("Currently processing a total of " + str(len(JPEG_file_names)) +
+        ' JPEG scanned images of braille text written \non the Perkins Brailler. ' +
+        'For best results, these should be scanned as grayscale \nJPEG images on a ' +
+        'flatbed scanner at a resolution of 300 dpi.\n')
+
+        #This code obtains the individual character coordinates from the image files
+        #listed in the "JPEG_file_names" list and, with the "--debug-images" option, generates
+        #JPEG images with overlaid character rectangles in the "Page image files with rectangles" folder.
+        with alive_bar(len(JPEG_file_names)) as bar:
+            character_string = ocr_document(cwd + "/OCR Raw Data/", JPEG_file_names, path + OCR_text_file_name,
+            model_path=cwd + '/Model_Perkins_Brailler_acc9997', debug_images=debug_images, progress=bar,
+            x_min=args.x_min)
+    else:
+        #The modified text file present in the "OCR Raw Data" subfolder
+        #is opened and its text is stored as a string in "character_string".
+        character_string = read_braille_text_file(cwd + "/OCR Raw Data/" + args.file_names[0])
+
+    if generate_outputs(character_string, path + OCR_text_file_name, args.formats, args.force) == []:
+        print('The output files of "' + OCR_text_file_name + '" are already up to date.')
@@ -0,0 +1,108 @@
+import io
+import os
+import numpy as np
+
+from .cache import load_json_file
+
+'''CONFIDENCE SIDECAR PARAMETERS'''
+#The model predicts the probabilities of all of the braille cells for every braille cell of the
+#page, of which only the most probable one makes its way into the "-OCR results.txt" file. With
+#the "--confidences" option, the "top_k" most probable braille cells of every braille cell are
+#kept along with their probabilities, in a small binary file per page (a "sidecar", see
+#"write_confidence_file"), such that the braille cells that the model wasn't sure about can be
+#listed for proofreading without submitting the pages to OCR again (see "find_low_confidence_cells").
+confidence_settings = {"top_k": 0}
+def enable_confidence_sidecars(top_k=3):
+    confidence_settings["top_k"] = top_k
+
+#The sidecars of the pages of a document are found in the "-OCR confidences" folder next to its
+#"-OCR results.txt" file ("file_root" being the path of the output folder followed by the document
+#name), under the name of the JPEG image of the page, with the ".npz" extension.
+def get_confidence_file_path(file_root, JPEG_file_name):
+    return file_root + "-OCR confidences/" + os.path.splitext(JPEG_file_name)[0] + ".npz"
+
+#The sidecar of a page is an uncompressed numpy ".npz" file holding the arrays returned by
+#"recognize_page", keyed by line and column: the "top_k" most probable braille cells ("cells", as
+#the offsets of their Unicode code points from U+2800, in uint8), their probabilities
+#("probabilities", in float16) and the position of every braille cell within the braille text
+#of the page ("positions", -1 for the braille cells left out of it), along with the SHA-256 hash
+#of the JPEG image of the page ("sha256"), which tells whether the sidecar is up to date. A page
+#of 51 lines takes about 27 KB with the three most probable braille cells. The file is written
+#through a temporary file, so that an interrupted run never leaves it incomplete.
+def write_confidence_file(confidence_file_path, confidences, JPEG_hash):
+    os.makedirs(os.path.dirname(confidence_file_path), exist_ok=True)
+    confidence_bytes = io.BytesIO()
+    np.savez(confidence_bytes, cells=confidences["cells"], probabilities=confidences["probabilities"],
+    positions=confidences["positions"], sha256=np.array(JPEG_hash))
+    with open(confidence_file_path + ".tmp", "wb") as confidence_file:
+        confidence_file.write(confidence_bytes.getvalue())
+    os.replace(confidence_file_path + ".tmp", confidence_file_path)
+
+#The arrays of the sidecar are returned as a dictionary (the SHA-256 hash as a string), or None
+#if the sidecar doesn't exist.
+def load_confidence_file(confidence_file_path):
+    if not os.path.exists(confidence_file_path):
+        return None
+    with np.load(confidence_file_path) as confidence_file:
+        confidences = {name: confidence_file[name] for name in confidence_file.files}
+    confidences["sha256"] = str(confidences["sha256"])
+    return confidences
+
+#The braille cells of the documents found in the "OCR Predictions" folder of the "working_folder"
+#(or only those of "document_names") for which the probability of the predicted braille cell is
+#below "threshold" are listed from the sidecars of their pages, in the order of the pages given
+#by the checkpoint manifest of the document (see "ocr_document"). Nothing is submitted to OCR: the
+#pages without an up to date sidecar (whose SHA-256 hash differs from that of the checkpoint
+#manifest) are only counted. Every low-confidence braille cell is returned as [document name,
+#JPEG file name, line, column (both starting at 1), location in the "-OCR results.txt" file
+#("line:column", where every page is a line followed by an empty line, or "-" if the braille cell
+#was left out of the braille text), the top braille cells and their probabilities], along with
+#the summary of every document: [document name, number of pages, number of pages without an up to
+#date sidecar, number of braille cells, number of low-confidence braille cells].
+def find_low_confidence_cells(working_folder, document_names=None, threshold=0.9):
+    predictions_folder = os.path.join(working_folder, "OCR Predictions")
+    if document_names == None or document_names == []:
+        document_names = sorted([name for name in os.listdir(predictions_folder)
+        if os.path.isdir(os.path.join(predictions_folder, name))])
+    low_confidence_cells = []
+    summary = []
+    for document_name in document_names:
+        file_root = os.path.join(predictions_folder, document_name, document_name)
+        checkpoint = load_json_file(file_root + "-OCR checkpoint.json")
+        pages = checkpoint.get("pages", {})
+        document_summary = [document_name, len(pages), 0, 0, 0]
+        for page_index, (JPEG_file_name, checkpoint_page) in enumerate(pages.items()):
+            confidences = load_confidence_file(get_confidence_file_path(file_root, JPEG_file_name))
+            if confidences == None or confidences["sha256"] != checkpoint_page["sha256"]:
+                document_summary[2] += 1
+                continue
+            probabilities = confidences["probabilities"]
+            document_summary[3] += probabilities.shape[0]*probabilities.shape[1]
+            for line, column in zip(*np.nonzero(probabilities[:, :, 0] < threshold)):
+                position = int(confidences["positions"][line, column])
+                text_location = "-" if position < 0 else str(2*page_index + 1) + ":" + str(position + 1)
+                top_cells = [(chr(0x2800 + int(cell)), float(probability)) for cell, probability in
+                zip(confidences["cells"][line, column], probabilities[line, column]) if probability > 0]
+                low_confidence_cells.append([document_name, JPEG_file_name, int(line) + 1, int(column) + 1,
+                text_location, top_cells])
+                document_summary[4] += 1
+        summary.append(document_summary)
+    return low_confidence_cells, summary
+
+#The low-confidence braille cells of "find_low_confidence_cells" are printed as a table, followed
+#by the summary of every document.
+def print_low_confidence_cells(low_confidence_cells, summary, threshold=0.9):
+    rows = [["Document", "Page", "Line", "Column", "Text", "Predictions"]]
+    for document_name, JPEG_file_name, line, column, text_location, top_cells in low_confidence_cells:
+        rows.append([document_name, JPEG_file_name, str(line), str(column), text_location,
+        "  ".join([cell + " " + str(round(100*probability, 1)) + "%" for cell, probability in top_cells])])
+    if len(rows) > 1:
+        column_widths = [max([len(row[i]) for row in rows]) for i in range(5)]
+        for row in rows:
+            print("  ".join([row[i].ljust(column_widths[i]) for i in range(5)] + [row[5]]))
+        print()
+    for document_name, page_count, missing_page_count, cell_count, low_confidence_cell_count in summary:
+        print(document_name + ": " + str(low_confidence_cell_count) + " of " + str(cell_count) +
+        " braille cells below " + str(round(100*threshold, 3)) + "% confidence, in " +
+        str(page_count - missing_page_count) + " of " + str(page_count) + " page(s)" +
+        (" (the other pages have no up to date confidences, see --confidences)" if missing_page_count > 0 else "") + ".")
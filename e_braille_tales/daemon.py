@@ -0,0 +1,80 @@
+import os
+import time
+
+from .pipeline import generate_outputs, group_JPEG_files_by_document, ocr_document
+from .recognition import load_model
+from .segmentation import first_character_x_min
+
+#The size and modification time of the JPEG images in the "raw_data_folder" are
+#used to find out which images were added or modified since the last time around.
+def get_JPEG_file_states(raw_data_folder):
+    JPEG_file_states = {}
+    for file_name in os.listdir(raw_data_folder):
+        if file_name[-4:] == ".jpg":
+            try:
+                file_stat = os.stat(os.path.join(raw_data_folder, file_name))
+            except FileNotFoundError:
+                continue
+            JPEG_file_states[file_name] = [file_stat.st_size, file_stat.st_mtime_ns]
+    return JPEG_file_states
+
+#The "OCR Raw Data" folder of the "working_folder" is checked for new or modified JPEG
+#images every "interval" seconds, for as long as the process is running (press "Ctrl+C"
+#to stop it). The model is loaded only once, when starting up, such that the pages are
+#processed as soon as they are scanned, without having to wait for the deep learning
+#libraries and the model to be loaded every time. The JPEG images are grouped into
+#documents by their names (up to the last hyphen, see "group_JPEG_files_by_document"),
+#and the output files of every document are written to the "OCR Predictions/<document
+#name>/" folder, just like when running the code without the "--watch" option. As the
+#OCR results of every page are recorded in the checkpoint manifest of the document
+#(see "ocr_document"), only the new or modified pages are submitted to OCR, and only
+#the paragraphs that changed are transcribed again (see "transcribe_incrementally").
+#The JPEG images with overlaid character rectangles are written by the "debug_images"
+#writer, if one is provided.
+def watch_folder(working_folder, formats, interval=2, learn=None, x_min=first_character_x_min, debug_images=None):
+    raw_data_folder = os.path.join(working_folder, "OCR Raw Data")
+    if learn == None:
+        learn = load_model(os.path.join(working_folder, "Model_Perkins_Brailler_acc9997"))
+    print('Watching the "OCR Raw Data" folder for new JPEG images (press Ctrl+C to stop).')
+
+    #A scanner might still be writing a JPEG image when it is first seen in the folder.
+    #The pages of a document are thus only processed once the size and modification time
+    #of all of its JPEG images are the same as the last time around. The JPEG image states
+    #of every document are recorded once it is processed, such that it will only be
+    #processed again if one of its JPEG images is added, modified or removed. Should the
+    #processing of a document fail (for example, if a JPEG image can't be decoded), the
+    #error is reported and the document is skipped until one of its JPEG images changes.
+    previous_JPEG_file_states = {}
+    processed_document_states = {}
+    while True:
+        JPEG_file_states = get_JPEG_file_states(raw_data_folder)
+        documents = group_JPEG_files_by_document(JPEG_file_states)
+        for document_name, JPEG_file_names in documents.items():
+            document_states = {JPEG_file_name:JPEG_file_states[JPEG_file_name] for JPEG_file_name in JPEG_file_names}
+            if any([previous_JPEG_file_states.get(JPEG_file_name) != document_states[JPEG_file_name]
+            for JPEG_file_name in JPEG_file_names]):
+                continue
+            if processed_document_states.get(document_name) == document_states:
+                continue
+            processed_document_states[document_name] = document_states
+            start_time = time.perf_counter()
+            try:
+                process_document(working_folder, document_name, JPEG_file_names, formats, learn, x_min, debug_images)
+            except Exception as error:
+                print('Error while processing "' + document_name + '": ' + repr(error))
+                continue
+            print('"' + document_name + '" (' + str(len(JPEG_file_names)) + " page(s)) processed in " +
+            str(round(time.perf_counter() - start_time, 2)) + " seconds.")
+        previous_JPEG_file_states = JPEG_file_states
+        time.sleep(interval)
+
+#The pages of a document are submitted to OCR with the model that was already loaded,
+#and its output files are then generated.
+def process_document(working_folder, document_name, JPEG_file_names, formats, learn, x_min=first_character_x_min,
+debug_images=None):
+    path = os.path.join(working_folder, "OCR Predictions", document_name) + "/"
+    if not os.path.exists(path):
+        os.makedirs(path)
+    character_string = ocr_document(os.path.join(working_folder, "OCR Raw Data"), JPEG_file_names,
+    path + document_name, learn=learn, debug_images=debug_images, x_min=x_min)
+    generate_outputs(character_string, path + document_name, formats)
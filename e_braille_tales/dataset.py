@@ -0,0 +1,244 @@
+import collections
+import difflib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from .calibration import calibrate_grid, enable_grid_calibration, grid_settings
+from .document import write_file_atomically
+from .pipeline import decode_grayscale_JPEG, group_JPEG_files_by_document
+from .recognition import get_cell_lookup, load_model, round_trip_JPEG, run_model, select_page_cells
+from .segmentation import (character_height, character_width, crop_margin, first_character_x_min, gather_cells,
+segment_page)
+
+'''DATASET PARAMETERS'''
+#Instead of one JPEG image per braille cell, the braille cells of the dataset built from
+#scanned pages (see "build_dataset") are written to "shards" of at most "dataset_shard_size"
+#braille cells (about 176 MB each): a numpy array of cropped braille cells ("crops-1-00000.npy",
+#of shape (cells, height, width)), the category indices of their labels ("labels-1-00000.npy",
+#see "vocab" in the index) and their sources ("sources-1-00000.npy", the index of their page
+#in the index and of the braille cell within its page), the number after the name being that of
+#the build of the dataset ("build" in the index). The numpy arrays can be memory-mapped
+#(see "load_dataset_shard"), such that only the braille cells that are used are read. The
+#shards are listed in the index of the dataset ("dataset index.json").
+dataset_shard_size = 20000
+dataset_index_file_name = "dataset index.json"
+
+#The braille cells of a page are cropped in a worker process (see "build_dataset"), from the
+#JPEG image found at "JPEG_file_path". They are encoded as JPEG images and decoded again (see
+#"round_trip_JPEG"), just like the braille cells submitted to the model, and returned as a
+#numpy array of shape (cells, height, width).
+def crop_page_cells(JPEG_file_path, x_min=first_character_x_min):
+    with open(JPEG_file_path, "rb") as JPEG_file:
+        image = decode_grayscale_JPEG(JPEG_file.read())
+    chars_x_y_coordinates = calibrate_grid(image, segment_page(image, x_min))
+    return round_trip_JPEG(gather_cells(image, chars_x_y_coordinates))
+
+#The proofread braille text of a document is found in its "-OCR results.txt" file, in which
+#the pages are separated by an empty line ("\n\n", see "ocr_document"). Any other line breaks
+#are removed (see "read_braille_text_file"). A "ValueError" is raised if the number of pages
+#isn't the same as the number of JPEG images of the document.
+def read_proofread_pages(results_file_path, page_count):
+    with open(results_file_path, "r", encoding="utf-8") as results_file:
+        page_strings = [page_string.replace("\n", "") for page_string in results_file.read().split("\n\n")]
+    if len(page_strings) != page_count:
+        raise ValueError('"' + results_file_path + '" holds ' + str(len(page_strings)) + " page(s) instead of " +
+        str(page_count) + ".")
+    return page_strings
+
+#The braille cells of a page are aligned with its proofread braille text. The braille text is
+#first assembled from the predictions of the model ("code_points", see "select_page_cells"),
+#and then compared with the proofread braille text with "difflib". The braille cells that are
+#found in both texts are labeled with the proofread braille characters, and so are those
+#replaced by the same number of braille characters (the corrections of the misread braille
+#cells). The other braille cells (for example, those removed from the braille text as superfluous
+#empty braille cells, or around braille characters that were added or removed during the
+#proofreading) are left out. The indices of the labeled braille cells and the Unicode code
+#points of their labels are returned as numpy arrays.
+def align_page_cells(code_points, proofread_page_string):
+    kept_cells = select_page_cells(code_points)
+    page_string = code_points[kept_cells].astype("<u4").tobytes().decode("utf-32-le")
+    aligned_cells = []
+    for tag, start, end, proofread_start, proofread_end in difflib.SequenceMatcher(None, page_string,
+    proofread_page_string, autojunk=False).get_opcodes():
+        if tag == "equal" or tag == "replace" and end - start == proofread_end - proofread_start:
+            aligned_cells.append([kept_cells[start:end], range(proofread_start, proofread_end)])
+    if aligned_cells == []:
+        return np.empty(0, np.int64), np.empty(0, np.uint32)
+    return (np.concatenate([cell_indices for cell_indices, label_range in aligned_cells]),
+    np.array([ord(proofread_page_string[i]) for cell_indices, label_range in aligned_cells for i in label_range],
+    np.uint32))
+
+#The braille cells are written to the shards of the dataset as they are added, every shard
+#holding "shard_size" braille cells (the last one holding the rest), and the index of the
+#dataset is written when closing it (to a temporary file, which then replaces the index of any
+#previous dataset found in the same folder, see "write_file_atomically"). The shards are named
+#after the build of the dataset, which follows that of the previous dataset, such that the
+#previous dataset is left as it is (and can still be used) should the build fail. Its shards
+#(and those left by a failed build) are only removed once the new index is written.
+class DatasetShardWriter:
+    def __init__(self, dataset_folder, vocab, shard_size=dataset_shard_size):
+        self.dataset_folder = dataset_folder
+        self.shard_size = shard_size
+        self.previous_index = load_dataset_index(dataset_folder)
+        build = 1 if self.previous_index == None else self.previous_index.get("build", 0) + 1
+        self.index = {"version": 1, "build": build, "vocab": list(vocab), "crop_shape": [character_width +
+        2*crop_margin, character_height + 2*crop_margin], "shards": [], "pages": [], "label_counts": {}}
+        self.pending = []
+        self.pending_cell_count = 0
+        if not os.path.exists(dataset_folder):
+            os.makedirs(dataset_folder)
+
+    #The braille cells of a page ("crops") are added along with the category indices of their labels,
+    #and the indices of the braille cells within their page, the page being named "page_name".
+    def add_page(self, page_name, crops, labels, cell_indices):
+        page_index = len(self.index["pages"])
+        self.index["pages"].append(page_name)
+        sources = np.stack([np.full(len(crops), page_index, np.int32), cell_indices.astype(np.int32)], axis=1)
+        self.pending.append([crops, labels.astype(np.int64), sources])
+        self.pending_cell_count += len(crops)
+        for label in labels:
+            label_name = self.index["vocab"][label]
+            self.index["label_counts"][label_name] = self.index["label_counts"].get(label_name, 0) + 1
+        while self.pending_cell_count >= self.shard_size:
+            self.write_shard(self.shard_size)
+
+    def write_shard(self, cell_count):
+        arrays = [np.concatenate([pending_arrays[i] for pending_arrays in self.pending]) for i in range(3)]
+        self.pending = [[array[cell_count:] for array in arrays]]
+        self.pending_cell_count -= cell_count
+        shard = {"count": cell_count}
+        for name, array in zip(["crops", "labels", "sources"], arrays):
+            shard[name] = (name + "-" + str(self.index["build"]) + "-" + str(len(self.index["shards"])).zfill(5) +
+            ".npy")
+            shard_file_path = os.path.join(self.dataset_folder, shard[name])
+            with open(shard_file_path + ".tmp", "wb") as shard_file:
+                np.save(shard_file, np.ascontiguousarray(array[:cell_count]))
+            os.replace(shard_file_path + ".tmp", shard_file_path)
+        self.index["shards"].append(shard)
+
+    def close(self):
+        if self.pending_cell_count > 0:
+            self.write_shard(self.pending_cell_count)
+        write_file_atomically(os.path.join(self.dataset_folder, dataset_index_file_name),
+        json.dumps(self.index, ensure_ascii=False, indent=1))
+        shard_file_names = set([shard[name] for shard in self.index["shards"]
+        for name in ["crops", "labels", "sources"]])
+        for file_name in os.listdir(self.dataset_folder):
+            if (file_name.split("-")[0] in ["crops", "labels", "sources"] and file_name.endswith((".npy", ".npy.tmp"))
+            and file_name not in shard_file_names):
+                os.remove(os.path.join(self.dataset_folder, file_name))
+        return self.index
+
+#The index of the dataset is returned, or None if the folder doesn't hold a sharded dataset.
+def load_dataset_index(dataset_folder):
+    index_file_path = os.path.join(dataset_folder, dataset_index_file_name)
+    if not os.path.exists(index_file_path):
+        return None
+    with open(index_file_path, "r", encoding="utf-8") as index_file:
+        return json.load(index_file)
+
+#The braille cells of a shard (a memory-mapped numpy array, unless "mmap_mode" is None) are
+#returned along with the category indices of their labels. When a "vocab" is provided (such
+#as "learn.dls.vocab"), the category indices are those of its labels, and a "ValueError" is
+#raised if some labels of the dataset aren't in it.
+def load_dataset_shard(dataset_folder, index, shard, vocab=None, mmap_mode="r"):
+    crops = np.load(os.path.join(dataset_folder, shard["crops"]), mmap_mode=mmap_mode)
+    labels = np.load(os.path.join(dataset_folder, shard["labels"]))
+    if vocab is not None and list(vocab) != index["vocab"]:
+        vocab = list(vocab)
+        missing_labels = [label for label in index["vocab"] if label not in vocab]
+        if missing_labels != []:
+            raise ValueError("The labels " + ", ".join(missing_labels) + " of the dataset aren't in the vocabulary.")
+        labels = np.array([vocab.index(label) for label in index["vocab"]], np.int64)[labels]
+    return crops, labels
+
+#The JPEG images of every document of the "OCR Raw Data" folder of the "working_folder" are
+#aligned with the proofread braille text of the document (its "-OCR results.txt" file in the
+#"OCR Predictions" folder, see "align_page_cells"), and the labeled braille cells are written
+#to the sharded dataset of the "dataset_folder" (see "DatasetShardWriter"). The pages are
+#decoded, segmented and cropped in "processes" worker processes (as many as there are CPU
+#cores by default, see "crop_page_cells"), while the model (which only runs in the main
+#process) predicts the braille cells of the pages in order. The worker processes are started
+#before the model is loaded, and at most two pages per worker process are cropped ahead of
+#the model, which bounds the memory used. The documents without proofread braille text (or
+#with another number of pages) are left out. The summary of the dataset is returned as a list
+#of [document name, number of pages, number of braille cells, number of labeled braille cells,
+#number of corrected braille cells (labeled differently from the prediction of the model),
+#processing time in seconds, error (or None)], along with the index of the dataset.
+def build_dataset(working_folder, dataset_folder, x_min=first_character_x_min, processes=None,
+shard_size=dataset_shard_size):
+    raw_data_folder = os.path.join(working_folder, "OCR Raw Data")
+    summary = []
+    pages = []
+    for document_name, JPEG_file_names in group_JPEG_files_by_document(os.listdir(raw_data_folder)).items():
+        results_file_path = os.path.join(working_folder, "OCR Predictions", document_name, document_name +
+        "-OCR results.txt")
+        try:
+            proofread_page_strings = read_proofread_pages(results_file_path, len(JPEG_file_names))
+        except (FileNotFoundError, ValueError) as error:
+            summary.append([document_name, len(JPEG_file_names), 0, 0, 0, 0, repr(error)])
+            continue
+        document_summary = [document_name, len(JPEG_file_names), 0, 0, 0, 0, None]
+        summary.append(document_summary)
+        for JPEG_file_name, proofread_page_string in zip(JPEG_file_names, proofread_page_strings):
+            pages.append([document_summary, JPEG_file_name, proofread_page_string])
+
+    processes = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(processes, initializer=enable_grid_calibration, initargs=(grid_settings["cache_file_path"],
+    grid_settings["scanner_profile"], grid_settings["calibration"])) as executor:
+        futures = collections.deque()
+        def submit_pages():
+            while len(futures) < 2*processes and len(futures) + page_count < len(pages):
+                futures.append(executor.submit(crop_page_cells, os.path.join(raw_data_folder,
+                pages[len(futures) + page_count][1]), x_min))
+        page_count = 0
+        submit_pages()
+        learn = load_model(os.path.join(working_folder, "Model_Perkins_Brailler_acc9997"))
+        cell_lookup = get_cell_lookup(learn.dls.vocab)
+        category_indices = {int(code_point): i for i, code_point in enumerate(cell_lookup)}
+        writer = DatasetShardWriter(dataset_folder, learn.dls.vocab, shard_size)
+        for document_summary, JPEG_file_name, proofread_page_string in pages:
+            start_time = time.perf_counter()
+            try:
+                crops = futures.popleft().result()
+            except Exception as error:
+                document_summary[6] = repr(error)
+                crops = None
+            page_count += 1
+            submit_pages()
+            if crops is None or len(crops) == 0:
+                document_summary[5] += time.perf_counter() - start_time
+                continue
+            code_points = cell_lookup[run_model(learn, crops)]
+            cell_indices, label_code_points = align_page_cells(code_points, proofread_page_string)
+            #The proofread braille characters that aren't in the vocabulary of the model are left out.
+            known_labels = np.array([int(code_point) in category_indices for code_point in label_code_points],
+            np.bool_)
+            cell_indices = cell_indices[known_labels]
+            labels = np.array([category_indices[int(code_point)] for code_point in label_code_points[known_labels]],
+            np.int64)
+            writer.add_page(document_summary[0] + "/" + JPEG_file_name, crops[cell_indices], labels, cell_indices)
+            document_summary[2] += len(crops)
+            document_summary[3] += len(cell_indices)
+            document_summary[4] += int((code_points[cell_indices] != cell_lookup[labels]).sum())
+            document_summary[5] += time.perf_counter() - start_time
+        index = writer.close()
+    return summary, index
+
+#The summary of the dataset is printed as a table, followed by the totals.
+def print_dataset_summary(summary, index):
+    rows = [["Document", "Pages", "Cells", "Labeled", "Corrected", "Seconds"]]
+    for document_name, page_count, cell_count, labeled_cell_count, corrected_cell_count, duration, error in summary:
+        if error != None:
+            document_name += " (error: " + error + ")"
+        rows.append([document_name, str(page_count), str(cell_count), str(labeled_cell_count),
+        str(corrected_cell_count), str(round(duration, 2))])
+    column_widths = [max([len(row[i]) for row in rows]) for i in range(6)]
+    for row in rows:
+        print("  ".join([row[0].ljust(column_widths[0])] + [row[i].rjust(column_widths[i]) for i in range(1, 6)]))
+    print("\n" + str(sum([shard["count"] for shard in index["shards"]])) + " braille cells written to " +
+    str(len(index["shards"])) + " shard(s), " + str(len(index["label_counts"])) + " label(s), " +
+    str(len([row for row in summary if row[6] != None])) + " error(s).")
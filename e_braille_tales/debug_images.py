@@ -0,0 +1,82 @@
+import os
+import queue
+import threading
+import cv2
+
+from .profiling import record_stage, start_stage
+from .segmentation import characters_per_line, draw_character_rectangles
+
+#The JPEG images overlaid with green character rectangles (the "debug images", found in the
+#"Page image files with rectangles" folder) allow to check whether the coordinates of the
+#characters line up well, for example when calibrating "x_min" for a new brailler and scanner.
+#They are only generated when requested (with the "--debug-images" option), in one of the
+#following grids: "cells" (a rectangle around every braille cell) or "lines" (a single
+#rectangle around every line of braille cells, which is quicker to draw and to look over).
+debug_image_grids = ["off", "cells", "lines"]
+
+#The debug image of a page is drawn on a color copy of its grayscale image, which may be
+#downscaled by a factor of "scale" (ex: 0.25) to make it quicker to encode and smaller to store.
+def draw_debug_image(image, chars_x_y_coordinates, grid="cells", scale=1.0):
+    if grid == "lines":
+        chars_x_y_coordinates = [[chars_x_y_coordinates[i][0], chars_x_y_coordinates[i+characters_per_line-1][1]]
+        for i in range(0, len(chars_x_y_coordinates), characters_per_line)]
+    if scale != 1:
+        image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        chars_x_y_coordinates = [[[int(round(coordinate*scale)) for coordinate in corner] for corner in char_x_y_coordinates]
+        for char_x_y_coordinates in chars_x_y_coordinates]
+    image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    return draw_character_rectangles(image, chars_x_y_coordinates, max(1, int(round(3*scale))))
+
+#The debug images are drawn and written by a background thread, such that the OCR of the next
+#page doesn't wait for them. Only one page out of every "every" pages submitted to the writer
+#gets a debug image. At most "max_queued_pages" pages wait for their debug image at any given
+#time, after which "submit" waits for the writer to catch up, in order to bound the memory
+#used by the grayscale images of the queued pages. The "close" method waits for all of the
+#queued debug images to be written, and needs to be called before the end of the run.
+class DebugImageWriter:
+    def __init__(self, folder, grid="cells", every=1, scale=1.0, max_queued_pages=4):
+        self.folder = folder
+        self.grid = grid
+        self.every = every
+        self.scale = scale
+        self.pages = queue.Queue(max_queued_pages)
+        self.page_count = 0
+        self.lock = threading.Lock()
+        self.thread = None
+
+    #The debug image is named after the JPEG image of the page, with the added
+    #"with character rectangles" suffix.
+    def submit(self, image, chars_x_y_coordinates, JPEG_file_name):
+        with self.lock:
+            self.page_count += 1
+            if (self.page_count - 1) % self.every != 0:
+                return
+            if self.thread == None:
+                if not os.path.exists(self.folder):
+                    os.makedirs(self.folder, exist_ok=True)
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+        self.pages.put([image, chars_x_y_coordinates,
+        os.path.join(self.folder, JPEG_file_name[:-4] + ' with character rectangles.jpg')])
+
+    #An error while writing a debug image is reported, but doesn't stop the run.
+    def run(self):
+        while True:
+            page = self.pages.get()
+            if page == None:
+                return
+            image, chars_x_y_coordinates, debug_image_file_path = page
+            start_time = start_stage()
+            try:
+                cv2.imwrite(debug_image_file_path, draw_debug_image(image, chars_x_y_coordinates, self.grid, self.scale))
+            except Exception as error:
+                print('Error while writing "' + debug_image_file_path + '": ' + repr(error))
+            record_stage("debug_images", start_time, pages=1)
+
+    def close(self):
+        with self.lock:
+            thread = self.thread
+            self.thread = None
+        if thread != None:
+            self.pages.put(None)
+            thread.join()
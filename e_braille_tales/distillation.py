@@ -0,0 +1,163 @@
+import os
+import time
+import numpy as np
+
+from .line_model import get_accuracy, load_cell_dataset
+from .pipeline import decode_grayscale_JPEG, group_JPEG_files_by_document
+from .recognition import get_input_transform, load_model, round_trip_JPEG, run_model, student_model_suffix
+from .segmentation import first_character_x_min, gather_cells, segment_page
+
+#The model is much larger than needed to tell apart the 64 braille cells from crops of 80 by 110
+#pixels, where the dots are about 15 pixels wide. The "student model" is a much smaller network
+#that is trained to reproduce the predictions of the model (the "teacher", see "train_student_model").
+#It takes the same input as the model (three identical color channels, converted by the batch
+#transforms of the data loaders of the model, see "get_input_transform"), such that it can be used
+#in its place, but first halves the resolution of the braille cells with an average
+#pooling layer, followed by three small convolutions (the last of which keeps the resolution) and,
+#just like the model, an adaptive average pooling layer, a flattening layer and a linear layer. The
+#overall stride (8 pixels) divides the pitch of the braille cells (72 pixels), such that the student
+#model can also be converted into a line model (see "convert_to_line_model").
+def build_student_model(category_count, channels=(8, 16, 32)):
+    import torch
+    return torch.nn.Sequential(
+    torch.nn.AvgPool2d(2),
+    torch.nn.Conv2d(3, channels[0], 3, stride=2, padding=1), torch.nn.ReLU(), torch.nn.BatchNorm2d(channels[0]),
+    torch.nn.Conv2d(channels[0], channels[1], 3, stride=2, padding=1), torch.nn.ReLU(),
+    torch.nn.BatchNorm2d(channels[1]),
+    torch.nn.Conv2d(channels[1], channels[2], 3, stride=1, padding=1), torch.nn.ReLU(),
+    torch.nn.BatchNorm2d(channels[2]),
+    torch.nn.AdaptiveAvgPool2d(4), torch.nn.Flatten(), torch.nn.Linear(channels[2]*16, category_count))
+
+#The student model is trained on the "soft labels" of the model (its outputs, or "logits", for
+#every braille cell of the training set), which also tell how much every braille cell looks like
+#the other categories. The loss is the Kullback-Leibler divergence between the probabilities
+#given by both models, softened by the "temperature" (and multiplied by its square, such that
+#its gradients keep the same scale), weighted by "soft_label_weight", plus the cross-entropy
+#with the labels of the dataset for the remainder. The learning rate follows a one cycle
+#schedule (as with "fit_one_cycle" in fastai), over "epochs" epochs of batches of "batch_size"
+#braille cells drawn from the "training_cell_indices". The braille cells are converted like the
+#input of the model of "learn" (see "get_input_transform"), whose data loaders are exported along
+#with the student model.
+def train_student_model(learn, student_model, images, labels, teacher_logits, training_cell_indices, epochs=10,
+learning_rate=3e-3, batch_size=64, temperature=4, soft_label_weight=0.9, seed=0):
+    import torch
+    torch.manual_seed(seed)
+    device = next(student_model.parameters()).device
+    transform_input = get_input_transform(learn, device)
+    random_generator = np.random.default_rng(seed)
+    batch_count = -(-len(training_cell_indices)//batch_size)
+    optimizer = torch.optim.Adam(student_model.parameters(), lr=learning_rate)
+    scheduler = torch.optim.lr_scheduler.OneCycleLR(optimizer, learning_rate, total_steps=max(1, epochs*batch_count))
+    student_model.train()
+    for epoch in range(epochs):
+        shuffled_cell_indices = random_generator.permutation(training_cell_indices)
+        for i in range(0, len(shuffled_cell_indices), batch_size):
+            batch_cell_indices = shuffled_cell_indices[i:i+batch_size]
+            batch = transform_input(torch.from_numpy(images[batch_cell_indices]).to(device))
+            student_logits = student_model(batch)
+            soft_labels = torch.softmax(torch.from_numpy(teacher_logits[batch_cell_indices]).to(device)/temperature,
+            dim=1)
+            soft_label_loss = torch.nn.functional.kl_div(torch.log_softmax(student_logits/temperature, dim=1),
+            soft_labels, reduction="batchmean")*temperature**2
+            label_loss = torch.nn.functional.cross_entropy(student_logits,
+            torch.from_numpy(labels[batch_cell_indices]).to(device))
+            loss = soft_label_weight*soft_label_loss + (1 - soft_label_weight)*label_loss
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            scheduler.step()
+    return student_model.eval()
+
+#The model and the student model are compared on the JPEG images of the "raw_data_folder": the
+#braille cells of every page are gathered and encoded as JPEG images (see "round_trip_JPEG"),
+#which takes the same time for both models, and then classified by both models. The durations
+#of the JPEG encoding and of the inference of both models are returned along with the number of
+#braille cells and the number of them for which the predictions of both models agree.
+def compare_student_on_pages(learn, student_learn, raw_data_folder, x_min=first_character_x_min):
+    comparison = {"pages": 0, "cells": 0, "agreeing_cells": 0, "encoding_seconds": 0, "model_seconds": 0,
+    "student_model_seconds": 0}
+    for JPEG_file_names in group_JPEG_files_by_document(os.listdir(raw_data_folder)).values():
+        for JPEG_file_name in JPEG_file_names:
+            with open(os.path.join(raw_data_folder, JPEG_file_name), "rb") as JPEG_file:
+                image = decode_grayscale_JPEG(JPEG_file.read())
+            chars_x_y_coordinates = segment_page(image, x_min)
+            if len(chars_x_y_coordinates) == 0:
+                continue
+            start_time = time.perf_counter()
+            cell_images = round_trip_JPEG(gather_cells(image, chars_x_y_coordinates))
+            comparison["encoding_seconds"] += time.perf_counter() - start_time
+            start_time = time.perf_counter()
+            preds_argmax = run_model(learn, cell_images)
+            comparison["model_seconds"] += time.perf_counter() - start_time
+            start_time = time.perf_counter()
+            student_preds_argmax = run_model(student_learn, cell_images)
+            comparison["student_model_seconds"] += time.perf_counter() - start_time
+            comparison["pages"] += 1
+            comparison["cells"] += len(preds_argmax)
+            comparison["agreeing_cells"] += int((preds_argmax == student_preds_argmax).sum())
+    return comparison
+
+#The student model is distilled from the model of the "working_folder" on the dataset found in
+#the "dataset_folder" (see "load_cell_dataset"), 10% of which is set aside to compare the accuracy
+#of both models. The student model is only exported next to the model (with the "-student"
+#suffix, see "load_model") if its validation accuracy is at most "accuracy_budget" (as a fraction)
+#below that of the model, otherwise any student model exported before is left as it is. Both
+#models are then compared on the JPEG images of the "OCR Raw Data" folder. The report of the
+#comparison is returned.
+def create_student_model(working_folder, dataset_folder, epochs=10, accuracy_budget=0.001,
+x_min=first_character_x_min, validation_fraction=0.1):
+    from fastai.vision.all import CrossEntropyLossFlat, Learner
+    model_path = os.path.join(working_folder, "Model_Perkins_Brailler_acc9997")
+    learn = load_model(model_path)
+    images, labels = load_cell_dataset(dataset_folder, learn.dls.vocab)
+    cell_indices = np.random.default_rng(0).permutation(len(images))
+    validation_cell_count = max(1, int(len(images)*validation_fraction))
+    if validation_cell_count >= len(images):
+        raise ValueError('The dataset found in "' + dataset_folder + '" is too small to be split into ' +
+        "a training set and a validation set.")
+    validation_cell_indices = cell_indices[:validation_cell_count]
+    teacher_logits = run_model(learn, images, logits=True)
+    student_model = train_student_model(learn, build_student_model(len(learn.dls.vocab)), images, labels,
+    teacher_logits, cell_indices[validation_cell_count:], epochs)
+    student_preds_argmax = run_model(learn, images[validation_cell_indices], model=student_model)
+    report = {"student_model_path": model_path + student_model_suffix, "accuracy_budget": accuracy_budget,
+    "dataset": {"cells": len(images), "validation_cells": validation_cell_count,
+    "model_accuracy": get_accuracy(learn, images, labels, validation_cell_indices),
+    "student_model_accuracy": float((student_preds_argmax == labels[validation_cell_indices]).mean()),
+    "agreement": float((student_preds_argmax == teacher_logits[validation_cell_indices].argmax(axis=1)).mean())},
+    "pages": None}
+    report["accepted"] = (report["dataset"]["student_model_accuracy"] >=
+    report["dataset"]["model_accuracy"] - accuracy_budget)
+    student_learn = Learner(learn.dls, student_model, loss_func=CrossEntropyLossFlat())
+    if report["accepted"]:
+        student_learn.export(report["student_model_path"])
+    raw_data_folder = os.path.join(working_folder, "OCR Raw Data")
+    if os.path.isdir(raw_data_folder):
+        report["pages"] = compare_student_on_pages(learn, student_learn, raw_data_folder, x_min)
+    return report
+
+#The report of "create_student_model" is printed as a table.
+def print_student_model_report(report):
+    dataset = report["dataset"]
+    rows = [["", "Model", "Student model"],
+    ["Validation accuracy (" + str(dataset["validation_cells"]) + " of " + str(dataset["cells"]) + " cells)",
+    str(round(100*dataset["model_accuracy"], 3)) + "%", str(round(100*dataset["student_model_accuracy"], 3)) + "%"],
+    ["Validation predictions agreeing with the model", "", str(round(100*dataset["agreement"], 3)) + "%"]]
+    if report["pages"] != None and report["pages"]["cells"] > 0:
+        pages = report["pages"]
+        rows.append(["Inference per page (" + str(pages["pages"]) + " pages, " + str(pages["cells"]) + " cells)",
+        str(round(1000*pages["model_seconds"]/pages["pages"], 1)) + " ms",
+        str(round(1000*pages["student_model_seconds"]/pages["pages"], 1)) + " ms"])
+        rows.append(["JPEG encoding per page (both models)", "",
+        str(round(1000*pages["encoding_seconds"]/pages["pages"], 1)) + " ms"])
+        rows.append(["Predictions agreeing with the model", "",
+        str(round(100*pages["agreeing_cells"]/pages["cells"], 3)) + "%"])
+    column_widths = [max([len(row[i]) for row in rows]) for i in range(3)]
+    for row in rows:
+        print("  ".join([row[0].ljust(column_widths[0])] + [row[i].rjust(column_widths[i]) for i in [1, 2]]))
+    if report["accepted"]:
+        print("\nStudent model written to " + report["student_model_path"] + ".")
+    else:
+        print("\nThe validation accuracy of the student model is more than " +
+        str(round(100*report["accuracy_budget"], 3)) + " percentage point(s) below that of the model " +
+        "(see --accuracy-budget), so it wasn't written.")
@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import socket
+import time
+
+from .confidences import confidence_settings, get_confidence_file_path
+from .document import write_file_atomically
+from .pipeline import (generate_outputs, get_document_name, get_OCR_settings, group_JPEG_files_by_document,
+load_checkpoint, ocr_page, save_checkpoint, write_OCR_results)
+from .recognition import load_model
+from .segmentation import first_character_x_min
+
+#A large number of scanned pages found in the "OCR Raw Data" folder of a working folder shared
+#between several computers (for example, over a network file system) can be submitted to OCR by
+#running a worker on each of them (with the "--worker" option). The workers coordinate through
+#the "OCR Work Queue" folder, without any other service: before submitting a page to OCR, a worker
+#claims it by creating a lease file named after the JPEG image in the "leases" subfolder, and the
+#OCR results of the page are then written to the "results" subfolder. Once all of the pages are
+#processed, the documents are assembled and their output files generated (with the "--assemble"
+#option, see "assemble_documents").
+def get_work_queue_folders(working_folder):
+    work_queue_folder = os.path.join(working_folder, "OCR Work Queue")
+    lease_folder = os.path.join(work_queue_folder, "leases")
+    result_folder = os.path.join(work_queue_folder, "results")
+    for folder in [lease_folder, result_folder]:
+        if not os.path.exists(folder):
+            os.makedirs(folder, exist_ok=True)
+    return lease_folder, result_folder
+
+def read_json_file(file_path):
+    try:
+        with open(file_path, "r", encoding="utf-8") as json_file:
+            return json.load(json_file)
+    except (FileNotFoundError, ValueError):
+        return None
+
+#The OCR results of a page are only used if the size and modification time of its JPEG
+#image are the same as when it was processed, otherwise the page will be processed again.
+def get_page_result(result_folder, raw_data_folder, JPEG_file_name):
+    result = read_json_file(os.path.join(result_folder, JPEG_file_name + ".json"))
+    if result == None:
+        return None
+    file_stat = os.stat(os.path.join(raw_data_folder, JPEG_file_name))
+    if result["size"] != file_stat.st_size or result["mtime_ns"] != file_stat.st_mtime_ns:
+        return None
+    return result
+
+#A lease file holds the name of the worker that claimed the page and the time (in seconds
+#since the epoch) at which the lease expires, should the worker stop before finishing the
+#page (the clocks of the computers are thus expected to be synchronized). The lease file is
+#first written under a temporary name and then hard linked to its final name, which fails
+#if another worker already holds the lease, such that only one worker can claim a page. An
+#expired lease is first moved out of the way by renaming it, which also succeeds for a single
+#worker only. In the unlikely event that another worker claimed the page in the meantime, its
+#lease is put back and the page is left to it. At worst, a page is processed twice, and as the
+#results are written atomically, this has no effect on the results.
+def claim_lease(lease_folder, JPEG_file_name, worker_name, lease_duration):
+    lease_file_path = os.path.join(lease_folder, JPEG_file_name + ".lease")
+    lease = read_json_file(lease_file_path)
+    if lease != None:
+        if lease["expires"] > time.time():
+            return False
+        expired_lease_file_path = lease_file_path + "." + worker_name + ".expired"
+        try:
+            os.rename(lease_file_path, expired_lease_file_path)
+        except FileNotFoundError:
+            return False
+        if read_json_file(expired_lease_file_path) != lease:
+            try:
+                os.link(expired_lease_file_path, lease_file_path)
+            except FileExistsError:
+                pass
+            os.remove(expired_lease_file_path)
+            return False
+        os.remove(expired_lease_file_path)
+    elif os.path.exists(lease_file_path):
+        return False
+
+    temporary_lease_file_path = lease_file_path + "." + worker_name + ".tmp"
+    write_file_atomically(temporary_lease_file_path, json.dumps({"worker": worker_name,
+    "expires": time.time() + lease_duration}))
+    try:
+        os.link(temporary_lease_file_path, lease_file_path)
+    except FileExistsError:
+        return False
+    finally:
+        os.remove(temporary_lease_file_path)
+    return True
+
+#The lease is only removed if it is still held by the worker.
+def release_lease(lease_folder, JPEG_file_name, worker_name):
+    lease_file_path = os.path.join(lease_folder, JPEG_file_name + ".lease")
+    lease = read_json_file(lease_file_path)
+    if lease != None and lease["worker"] == worker_name:
+        try:
+            os.remove(lease_file_path)
+        except FileNotFoundError:
+            pass
+
+#A worker processes the pages that don't have OCR results yet, until all of the pages of
+#the "OCR Raw Data" folder are processed. The model is only loaded once, when the first
+#page is claimed. Every worker starts at a different place in the list of pages (based on
+#its name), such that the workers rarely compete for the same pages. When all of the
+#remaining pages are claimed by other workers, the worker waits "poll_interval" seconds
+#before checking again, in order to take over the pages of expired leases (for example,
+#if a computer was turned off while processing a page). The number of pages processed
+#by the worker is returned. The JPEG images with overlaid character rectangles are
+#written by the "debug_images" writer, if one is provided. With the "--confidences" option,
+#the sidecars of the pages (see "write_confidence_file") are written by the workers directly
+#to the output folders of their documents. Should a page fail (for example, if its JPEG image
+#is corrupt or truncated), the error is recorded as its result (instead of its braille cells),
+#and the worker carries on with the next page. The page is only processed again once its JPEG
+#image is modified, such that a single bad page can't stop all of the workers one after the other.
+def run_worker(working_folder, lease_duration=600, poll_interval=10, x_min=first_character_x_min,
+worker_name=None, debug_images=None):
+    raw_data_folder = os.path.join(working_folder, "OCR Raw Data")
+    lease_folder, result_folder = get_work_queue_folders(working_folder)
+    if worker_name == None:
+        worker_name = socket.gethostname() + "-" + str(os.getpid())
+    worker_offset = int(hashlib.sha256(worker_name.encode("utf-8")).hexdigest(), 16)
+    learn = None
+    processed_page_count = 0
+    while True:
+        JPEG_file_names = [JPEG_file_name for JPEG_file_names in
+        group_JPEG_files_by_document(os.listdir(raw_data_folder)).values() for JPEG_file_name in JPEG_file_names]
+        pending_JPEG_file_names = [JPEG_file_name for JPEG_file_name in JPEG_file_names
+        if get_page_result(result_folder, raw_data_folder, JPEG_file_name) == None]
+        if pending_JPEG_file_names == []:
+            return processed_page_count
+        start_index = worker_offset % len(pending_JPEG_file_names)
+        claimed_page_count = 0
+        for JPEG_file_name in pending_JPEG_file_names[start_index:] + pending_JPEG_file_names[:start_index]:
+            if not claim_lease(lease_folder, JPEG_file_name, worker_name, lease_duration):
+                continue
+            claimed_page_count += 1
+            try:
+                #The page might have been completed by another worker since the list of pages was made.
+                if get_page_result(result_folder, raw_data_folder, JPEG_file_name) != None:
+                    continue
+                JPEG_file_path = os.path.join(raw_data_folder, JPEG_file_name)
+                file_stat = os.stat(JPEG_file_path)
+                with open(JPEG_file_path, "rb") as JPEG_file:
+                    JPEG_bytes = JPEG_file.read()
+                if learn == None:
+                    learn = load_model(os.path.join(working_folder, "Model_Perkins_Brailler_acc9997"))
+                confidence_file_path = None
+                if confidence_settings["top_k"] > 0:
+                    document_name = get_document_name(JPEG_file_name)
+                    confidence_file_path = get_confidence_file_path(os.path.join(working_folder, "OCR Predictions",
+                    document_name, document_name), JPEG_file_name)
+                result = {"sha256": hashlib.sha256(JPEG_bytes).hexdigest(), "size": file_stat.st_size,
+                "mtime_ns": file_stat.st_mtime_ns, "worker": worker_name, "settings": get_OCR_settings(x_min)}
+                try:
+                    result["cells"] = ocr_page(learn, JPEG_bytes, x_min, debug_images, JPEG_file_name,
+                    confidence_file_path)
+                except Exception as error:
+                    result["error"] = repr(error)
+                write_file_atomically(os.path.join(result_folder, JPEG_file_name + ".json"),
+                json.dumps(result, ensure_ascii=False))
+                if "error" in result:
+                    print(worker_name + ": " + JPEG_file_name + " failed: " + result["error"])
+                    continue
+                processed_page_count += 1
+                print(worker_name + ": " + JPEG_file_name + " processed.")
+            finally:
+                release_lease(lease_folder, JPEG_file_name, worker_name)
+        if claimed_page_count == 0:
+            time.sleep(poll_interval)
+
+#The coordinator assembles the braille text of every document from the OCR results of its
+#pages (grouped by "group_JPEG_files_by_document"), and then writes its "-OCR results.txt"
+#file (see "write_OCR_results"), its checkpoint manifest (such that running the code without
+#the "--worker" option wouldn't submit the pages to OCR again) and its output files to its
+#subfolder of the "OCR Predictions" folder. The documents for which some pages weren't processed
+#yet are left for later, and those with failed pages are reported along with their errors (see
+#"run_worker"), until their JPEG images are replaced. The summary is returned in the same form
+#as that of "process_batch".
+def assemble_documents(working_folder, formats, force=False):
+    raw_data_folder = os.path.join(working_folder, "OCR Raw Data")
+    lease_folder, result_folder = get_work_queue_folders(working_folder)
+    summary = []
+    for document_name, JPEG_file_names in group_JPEG_files_by_document(os.listdir(raw_data_folder)).items():
+        start_time = time.perf_counter()
+        document_input = str(len(JPEG_file_names)) + " page(s)"
+        results = [get_page_result(result_folder, raw_data_folder, JPEG_file_name) for JPEG_file_name in JPEG_file_names]
+        missing_page_count = len([result for result in results if result == None])
+        if missing_page_count > 0:
+            summary.append([document_name, document_input, 0, [], time.perf_counter() - start_time,
+            str(missing_page_count) + " page(s) not processed yet"])
+            continue
+        failed_pages = [JPEG_file_name + " (" + result["error"] + ")" for JPEG_file_name, result in
+        zip(JPEG_file_names, results) if "error" in result]
+        if failed_pages != []:
+            summary.append([document_name, document_input, 0, [], time.perf_counter() - start_time,
+            str(len(failed_pages)) + " page(s) failed: " + ", ".join(failed_pages)])
+            continue
+        path = os.path.join(working_folder, "OCR Predictions", document_name) + "/"
+        if not os.path.exists(path):
+            os.makedirs(path)
+        checkpoint_file_path = path + document_name + "-OCR checkpoint.json"
+        checkpoint = load_checkpoint(checkpoint_file_path)
+        checkpoint["pages"] = {}
+        offset = 0
+        for JPEG_file_name, result in zip(JPEG_file_names, results):
+            checkpoint["pages"][JPEG_file_name] = {"sha256": result["sha256"], "cells": result["cells"], "offset": offset,
+            "settings": result.get("settings")}
+            offset += len(result["cells"]) + 2
+        write_OCR_results(path + document_name, checkpoint, [result["cells"] for result in results])
+        save_checkpoint(checkpoint_file_path, checkpoint, JPEG_file_names)
+        character_string = "".join([result["cells"] for result in results])
+        generated_formats = generate_outputs(character_string, path + document_name, formats, force)
+        summary.append([document_name, document_input, len(character_string), generated_formats,
+        time.perf_counter() - start_time, None])
+    return summary
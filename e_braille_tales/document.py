@@ -0,0 +1,266 @@
+import os
+import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .profiling import record_stage, start_stage
+from .transcription import transcribe
+
+#The braille text is converted only once into a compact intermediate representation
+#(see the "BrailleDocument" class below), from which every output format is generated.
+#The braille equivalents of the RTF commands affecting the layout of the page are
+#taken out of the braille cells and stored as layout commands, along with the index
+#of the braille cell before which they were found. The section break RTF command that
+#starts at a new page ("\sbkpage") maps to the braille characters "⠸⠡⠎⠃⠅⠏⠁⠛⠑", page
+#breaks "\page" map to "⠸⠡⠏⠁⠛⠑", new paragraphs "\par" map to "⠸⠡⠏⠜", carriage
+#returns "\line" map to "⠸⠡⠇⠔⠑" and tabs "\tab" map to "⠸⠡⠞⠁⠃". An empty braille cell
+#is included at the end of every pattern, as a space needs to be included after any
+#RTF command in this application.
+layout_commands = [["⠸⠡⠎⠃⠅⠏⠁⠛⠑⠀", "sbkpage"], ["⠸⠡⠏⠁⠛⠑⠀", "page"], ["⠸⠡⠏⠜⠀", "par"],
+["⠸⠡⠇⠔⠑⠀", "line"], ["⠸⠡⠞⠁⠃⠀", "tab"]]
+layout_command_pattern = re.compile("|".join([command[0] for command in layout_commands]))
+layout_command_names = {command[0]:command[1] for command in layout_commands}
+layout_command_braille = {command[1]:command[0] for command in layout_commands}
+
+#The typeform indicators for symbols ("⠆"), words ("⠂") and passages ("⠶") all
+#start with the following braille characters, for italics, bold, underline and
+#script, respectively. The passages end with the corresponding terminator ("⠄").
+typeform_prefixes = [["⠨", "italics"], ["⠘", "bold"], ["⠸", "underline"], ["⠈", "script"]]
+
+#The number of columns and rows per page of the Portable Embosser Format (PEF)
+#and Braille Ready Format (BRF) files could be changed by the users based on the
+#specifications of their braille embosser/e-reader.
+columns_per_page = 40
+lines_per_page = 25
+
+#The "BrailleDocument" holds the braille cells (with the braille layout commands removed)
+#and the list of layout commands in the form [cell index, command name]. The typeform
+#indicators are left in the braille cells, as these braille characters are carried over in
+#the PEF and BRF files, and converted to RTF commands by the transcription. As the RTF and
+#plain text writers both need the printed English transcription, it is only performed once,
+#by the first writer to need it, while the other writer waits for the result.
+class BrailleDocument:
+    def __init__(self, cells, layout):
+        self.cells = cells
+        self.layout = layout
+        self.transcription_lock = threading.Lock()
+        self.rtf_transcription = None
+
+    @classmethod
+    def from_braille(cls, character_string):
+        cell_segments = []
+        layout = []
+        cell_count = 0
+        previous_end = 0
+        for match in layout_command_pattern.finditer(character_string):
+            cell_segments.append(character_string[previous_end:match.start()])
+            cell_count += match.start() - previous_end
+            layout.append([cell_count, layout_command_names[match.group(0)]])
+            previous_end = match.end()
+        cell_segments.append(character_string[previous_end:])
+        cells = "".join(cell_segments)
+        return cls(cells, layout)
+
+    #The layout commands are inserted back in their braille form, which gives back
+    #the braille text from which the "BrailleDocument" was generated.
+    def to_braille(self):
+        braille_segments = []
+        previous_index = 0
+        for index, command in self.layout:
+            braille_segments.append(self.cells[previous_index:index])
+            braille_segments.append(layout_command_braille[command])
+            previous_index = index
+        braille_segments.append(self.cells[previous_index:])
+        return "".join(braille_segments)
+
+    def transcription(self):
+        with self.transcription_lock:
+            if self.rtf_transcription is None:
+                self.rtf_transcription = transcribe(self.to_braille())
+        return self.rtf_transcription
+
+
+#The braille cells are split at every empty braille cell ("⠀") and the resulting
+#words are added to the current row along with an empty braille cell, for as long
+#as they fit within "columns_per_page". Otherwise, a new row is started. Words that
+#are longer than a whole row are split over as many rows as needed. Successive empty
+#braille cells are retained, as they result in empty strings after splitting.
+def wrap_braille_cells(cells, columns_per_page):
+    rows = [""]
+    for word in cells.split("⠀"):
+        while len(word) > columns_per_page:
+            if rows[-1] != "":
+                rows.append("")
+            rows[-1] = word[:columns_per_page]
+            rows.append("")
+            word = word[columns_per_page:]
+        if rows[-1] == "" or len(rows[-1]) + len(word) <= columns_per_page:
+            rows[-1] += word + "⠀"
+        else:
+            rows.append(word + "⠀")
+    return [row.rstrip("⠀") for row in rows]
+
+#The braille cells of the document are laid out in a list of sections, each one of
+#them being a list of pages, which are in turn lists of rows. The tabs ("\tab") are
+#changed to two successive empty braille cells ("⠀⠀"), while new paragraphs ("\par")
+#start a new row beginning with two successive empty braille cells ("⠀⠀"), as new
+#paragraphs in braille documents are typically started by two empty braille cells that
+#serve as a tab. Line breaks ("\line") start a new row, page breaks ("\page") start a new
+#page and section breaks ("\sbkpage") start a new section. A new page is also started
+#whenever the current one already holds "lines_per_page" rows.
+def paginate_braille(document, columns_per_page, lines_per_page):
+    sections = [[[]]]
+    cells = ""
+    previous_index = 0
+    for index, command in document.layout + [[len(document.cells), None]]:
+        cells += document.cells[previous_index:index]
+        previous_index = index
+        if command == "tab":
+            cells += "⠀⠀"
+            continue
+        for row in wrap_braille_cells(cells, columns_per_page):
+            if len(sections[-1][-1]) == lines_per_page:
+                sections[-1].append([])
+            sections[-1][-1].append(row)
+        cells = ""
+        if command == "par":
+            cells = "⠀⠀"
+        elif command == "page":
+            sections[-1].append([])
+        elif command == "sbkpage":
+            sections.append([[]])
+    return sections
+
+
+#The writers are registered in the "writers" dictionary under their format name,
+#along with the file extension and encoding of the files they generate. Every
+#writer takes a "BrailleDocument" and returns the contents of the output file.
+writers = {}
+def register_writer(format_name, extension, encoding="utf-8"):
+    def register(writer):
+        writers[format_name] = [extension, encoding, writer]
+        return writer
+    return register
+
+#The Portable Embosser Format (PEF) file is generated from the braille cells before
+#removal of braille characters such as "dot locator for mention" or "transcriber-defined
+#typeform indicators", as these symbols could be relevant to the braille reader. The
+#variables "columns_per_page" and "lines_per_page" are included in the "<volume>" PEF tag
+#to ensure that the PEF file is generated according to the users specifications.
+@register_writer("pef", ".pef")
+def write_pef(document):
+    pef_file_string = []
+    for section in paginate_braille(document, columns_per_page, lines_per_page):
+        pef_file_string.append("\t\t\t<section>\n")
+        for page in section:
+            pef_file_string.append("\t\t\t\t<page>\n")
+            for row in page:
+                pef_file_string.append("\t\t\t\t\t<row>" + row + "</row>\n")
+            pef_file_string.append("\t\t\t\t</page>\n")
+        pef_file_string.append("\t\t\t</section>\n")
+    return ("""<?xml version="1.0" encoding="UTF-8"?>
+<pef version="2008-1" xmlns="http://www.daisy.org/ns/2008/pef">
+	<head>
+		<meta xmlns:dc="http://purl.org/dc/elements/1.1/">
+			<dc:format>application/x-pef+xml</dc:format>
+			<dc:identifier>org.pef-format.00002</dc:identifier>
+		</meta>
+	</head>
+	<body>
+		<volume cols=""" + '"' + str(columns_per_page) + '"' + " rows=" + '"'
+        + str(lines_per_page) +  '"' + """ rowgap="0" duplex="false">
+""" + "".join(pef_file_string) + """		</volume>
+	</body>
+</pef>""")
+
+#The Braille Ready Format (BRF) file uses the North American braille ASCII code, in
+#which every one of the 64 six-dot braille cells (from "⠀" to "⠿", in unicode order)
+#maps to one of the ASCII characters in "braille_ascii". Dots 7 and 8 are not encoded
+#in braille ASCII and are left out. The rows end with carriage returns and line feeds
+#and the pages are separated by form feeds.
+braille_ascii = " A1B'K2L@CIF/MSP\"E3H9O6R^DJG>NTQ,*5<-U8V.%[$+X!&;:4\\0Z7(_?W]#Y)="
+mapping_table_braille_ascii = {0x2800 + i:braille_ascii[i % 64] for i in range(256)}
+@register_writer("brf", ".brf", "ascii")
+def write_brf(document):
+    pages = [page for section in paginate_braille(document, columns_per_page, lines_per_page)
+    for page in section]
+    return "\f".join(["".join([row.translate(mapping_table_braille_ascii) + "\r\n" for row in page])
+    for page in pages])
+
+@register_writer("rtf", ".rtf")
+def write_rtf(document):
+    return r"{\rtf1 \ansi \deff0 {\fonttbl {\f0 Ubuntu;}}\f0 \fs24 " + document.transcription() + "}"
+
+#The plain text (UTF-8) file is derived from the RTF transcription. The capitalization
+#passages and words ("\caps ... \caps0") are changed to uppercase, the RTF escapes
+#(such as "\'92") are decoded from the Windows-1252 code page, the paragraph, line,
+#tab and page RTF commands are changed to their plain text equivalents, and the other RTF
+#commands (along with the curly brackets wrapped around single formatted characters)
+#are removed. The "\x0e" and "\x0f" control characters temporarily mark the beginning
+#and end of capitalized text, while "\x10" stands in for literal backslashes ("\\").
+@register_writer("txt", ".txt")
+def write_plain_text(document):
+    text = document.transcription().replace("\\\\", "\x10")
+    text = re.sub(r"\\caps0 ?", "\x0f", text)
+    text = re.sub(r"\\caps ?", "\x0e", text)
+    text = re.sub(r"\\'([0-9a-fA-F]{2})",
+    lambda match: bytes([int(match.group(1), 16)]).decode("cp1252", "replace"), text)
+    text = re.sub(r"\{\\(?:sub|super|i|b|ul|fs56) (.)\}", r"\1", text)
+    text = re.sub(r"\\par ?", "\n", text)
+    text = re.sub(r"\\line ?", "\n", text)
+    text = re.sub(r"\\tab ?", "\t", text)
+    text = re.sub(r"\\(?:sbkpage|page) ?", "\n\n", text)
+    text = re.sub(r"\\[a-zA-Z]+-?[0-9]* ?", "", text)
+    text = re.sub("\x0e([^\x0f]*)\x0f?", lambda match: match.group(1).upper(), text)
+    return text.replace("\x0f", "").replace("\x10", "\\") + "\n"
+
+#The output files are first written to a temporary file in the same folder, which
+#then replaces the output file in a single step ("os.replace"). This way, a run that
+#is interrupted while writing never leaves behind a partially written output file.
+#The temporary file is created with the usual permissions of new files, as the operating
+#system applies the "umask" of the current process to them, which is therefore never changed
+#(it is shared by all of the threads of the process). Its name is made unique with a random
+#suffix, and it is removed should anything (even a "KeyboardInterrupt") stop the writing.
+def write_file_atomically(file_path, contents, encoding="utf-8"):
+    temporary_file_path = file_path + "." + uuid.uuid4().hex[:8] + ".tmp"
+    file_descriptor = os.open(temporary_file_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with open(file_descriptor, "w", encoding=encoding, errors="replace", newline="") as temporary_file:
+            temporary_file.write(contents)
+            temporary_file.flush()
+            os.fsync(temporary_file.fileno())
+        os.replace(temporary_file_path, file_path)
+    except BaseException:
+        os.remove(temporary_file_path)
+        raise
+
+#The requested output formats are generated concurrently from the same
+#"BrailleDocument" and written next to one another, as "file_root" followed
+#by the extension of each format.
+def write_document(document, file_root, formats):
+    def write_format(format_name):
+        extension, encoding, writer = writers[format_name]
+        start_time = start_stage()
+        contents = writer(document)
+        record_stage("writer/" + format_name, start_time, characters=len(contents))
+        start_time = start_stage()
+        write_file_atomically(file_root + extension, contents, encoding)
+        record_stage("file_writing", start_time, files=1, characters=len(contents))
+    with ThreadPoolExecutor(max_workers=max(1, len(formats))) as executor:
+        futures = [executor.submit(write_format, format_name) for format_name in formats]
+        for future in futures:
+            future.result()
+
+
+#The braille text can also be converted directly to any of the output formats, without
+#writing it to a file (ex: "braille_to_rtf(character_string)" gives the contents of the
+#RTF document).
+def braille_to_format(character_string, format_name):
+    return writers[format_name][2](BrailleDocument.from_braille(character_string))
+
+def braille_to_rtf(character_string):
+    return braille_to_format(character_string, "rtf")
+
+def braille_to_pef(character_string):
+    return braille_to_format(character_string, "pef")
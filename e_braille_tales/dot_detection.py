@@ -0,0 +1,138 @@
+import cv2
+import numpy as np
+
+from .segmentation import (character_height, character_spacing, character_width, characters_per_line,
+crop_margin, gather_line_strips)
+
+'''DOT DETECTION PARAMETERS'''
+#The dots of the braille cells are found as the blobs of pixels darker than "dot_threshold"
+#(mostly their shadows). The blobs smaller than "min_dot_area" pixels are left out as noise,
+#while those larger than "max_dot_area" pixels (such as dots merged together by smudges or
+#by a fold of the paper) make the braille cells that they overlap ambiguous. The blobs that are
+#close to the area threshold (from "min_weak_dot_area" to "max_weak_dot_area" pixels), as well
+#as those whose darkest pixel is less than "weak_dot_contrast" below "dot_threshold", are weak
+#evidence of a dot (such as a faint dot whose shadow barely shows), and also make their braille
+#cell ambiguous, so that a dot that might have been missed (or found in noise) is never decoded
+#without being checked by the model.
+dot_threshold = 200
+min_dot_area = 30
+max_dot_area = 900
+min_weak_dot_area = 10
+max_weak_dot_area = 60
+weak_dot_contrast = 40
+#The dots of a braille cell lie on a lattice of 2 columns (along the x axis) by 3 rows (along
+#the y axis). The nominal positions of the columns and rows (in pixels from the top left corner
+#of the braille cell, see "segment_page") are refined on every page from the dots found on it
+#(see "get_dot_lattice"), provided that at least "min_lattice_dots" dots are found near them.
+#A dot further than "dot_snap_tolerance" pixels from the nearest column or row makes its
+#braille cell ambiguous.
+nominal_dot_columns = [character_width/4, 3*character_width/4]
+nominal_dot_rows = [character_height/6, character_height/2, 5*character_height/6]
+min_lattice_dots = 5
+dot_snap_tolerance = 9
+
+#The dot blobs of every line of braille cells are found in its line strip (see "gather_line_strips")
+#with "cv2.connectedComponentsWithStats". They are returned as a numpy array with one row per
+#blob: [line index, area, x and y coordinates of the centroid, x_min and x_max of the bounding box,
+#darkest pixel], the coordinates being relative to the top left corner of the first braille cell
+#of the line.
+def find_dot_blobs(image, chars_x_y_coordinates):
+    line_strips = gather_line_strips(image, chars_x_y_coordinates)
+    dot_masks = (line_strips < dot_threshold).view(np.uint8)
+    line_blobs = [np.empty((0, 7))]
+    for i in range(len(dot_masks)):
+        #OpenCV gives the coordinates as (column, row), which are the y and x coordinates of the page.
+        blob_count, labels, stats, centroids = cv2.connectedComponentsWithStats(dot_masks[i], connectivity=8)
+        darkest_pixels = np.full(blob_count, 255)
+        blob_pixels = dot_masks[i].view(np.bool_)
+        np.minimum.at(darkest_pixels, labels[blob_pixels], line_strips[i][blob_pixels])
+        blobs = np.empty((blob_count - 1, 7))
+        blobs[:, 0] = i
+        blobs[:, 1] = stats[1:, cv2.CC_STAT_AREA]
+        blobs[:, 2] = centroids[1:, 1] - crop_margin
+        blobs[:, 3] = centroids[1:, 0] - crop_margin
+        blobs[:, 4] = stats[1:, cv2.CC_STAT_TOP] - crop_margin
+        blobs[:, 5] = stats[1:, cv2.CC_STAT_TOP] + stats[1:, cv2.CC_STAT_HEIGHT] - 1 - crop_margin
+        blobs[:, 6] = darkest_pixels[1:]
+        line_blobs.append(blobs)
+    return np.concatenate(line_blobs)
+
+#The index of the braille cell within its line is found from the x coordinate (relative to the
+#first braille cell of the line), the space between two braille cells being split between them.
+#The pitch of the braille cells is that of the grid of the page (see "calibrate_grid").
+def get_cell_indices(x_coordinates, cell_pitch=character_width + character_spacing):
+    return np.clip(np.floor((x_coordinates + (cell_pitch - character_width)/2)/cell_pitch), 0,
+    characters_per_line-1).astype(np.int64)
+
+#The positions of the columns and rows of the dot lattice are the medians of the positions of
+#the dots found near each of them on the page (within half of the distance between them),
+#or their nominal positions when too few dots are found near them.
+def get_lattice_positions(offsets, nominal_positions):
+    half_distance = (nominal_positions[1] - nominal_positions[0])/2
+    positions = []
+    for nominal_position in nominal_positions:
+        near_offsets = offsets[np.abs(offsets - nominal_position) < half_distance]
+        if len(near_offsets) >= min_lattice_dots:
+            positions.append(float(np.median(near_offsets)))
+        else:
+            positions.append(nominal_position)
+    return np.array(positions)
+
+def get_dot_lattice(dot_blobs, cell_pitch=character_width + character_spacing):
+    x_offsets = dot_blobs[:, 2] - get_cell_indices(dot_blobs[:, 2], cell_pitch)*cell_pitch
+    return get_lattice_positions(x_offsets, nominal_dot_columns), get_lattice_positions(dot_blobs[:, 3], nominal_dot_rows)
+
+#The dots found on the page are snapped to the dot lattice of their braille cells. The dot
+#positions of every braille cell (in the order of "segment_page") are returned as a boolean
+#numpy array of shape (cells, 2, 3), along with a boolean array flagging the ambiguous braille
+#cells (blobs too large to be a single dot, weak evidence of a dot, or dots lying too far from
+#the dot lattice), which need to be submitted to the model. Should the segmentation not find
+#whole lines of braille cells, all of the braille cells are ambiguous.
+def detect_dots(image, chars_x_y_coordinates):
+    cell_count = len(chars_x_y_coordinates)
+    dot_positions = np.zeros((cell_count, 2, 3), np.bool_)
+    ambiguous_cells = np.zeros(cell_count, np.bool_)
+    if cell_count == 0 or cell_count % characters_per_line != 0:
+        ambiguous_cells[:] = True
+        return dot_positions, ambiguous_cells
+    cell_pitch = chars_x_y_coordinates[1][0][0] - chars_x_y_coordinates[0][0][0]
+    blobs = find_dot_blobs(image, chars_x_y_coordinates)
+    weak_blobs = blobs[(blobs[:, 1] >= min_weak_dot_area) & ((blobs[:, 1] <= max_weak_dot_area) |
+    (blobs[:, 6] > dot_threshold - weak_dot_contrast))]
+    ambiguous_cells[weak_blobs[:, 0].astype(np.int64)*characters_per_line +
+    get_cell_indices(weak_blobs[:, 2], cell_pitch)] = True
+    blobs = blobs[blobs[:, 1] >= min_dot_area]
+    large_blobs = blobs[blobs[:, 1] > max_dot_area]
+    dot_blobs = blobs[blobs[:, 1] <= max_dot_area]
+
+    #The braille cells overlapped by the large blobs are ambiguous.
+    line_offsets = large_blobs[:, 0].astype(np.int64)*characters_per_line
+    for first_cell_index, last_cell_index in zip(line_offsets + get_cell_indices(large_blobs[:, 4], cell_pitch),
+    line_offsets + get_cell_indices(large_blobs[:, 5], cell_pitch)):
+        ambiguous_cells[first_cell_index:last_cell_index+1] = True
+
+    dot_columns, dot_rows = get_dot_lattice(dot_blobs, cell_pitch)
+    cell_indices = get_cell_indices(dot_blobs[:, 2], cell_pitch)
+    x_offsets = dot_blobs[:, 2] - cell_indices*cell_pitch
+    column_distances = np.abs(x_offsets[:, None] - dot_columns[None, :])
+    row_distances = np.abs(dot_blobs[:, 3][:, None] - dot_rows[None, :])
+    columns = np.argmin(column_distances, axis=1)
+    rows = np.argmin(row_distances, axis=1)
+    off_lattice = ((column_distances[np.arange(len(columns)), columns] > dot_snap_tolerance) |
+    (row_distances[np.arange(len(rows)), rows] > dot_snap_tolerance))
+    cell_indices += dot_blobs[:, 0].astype(np.int64)*characters_per_line
+    ambiguous_cells[cell_indices[off_lattice]] = True
+    dot_positions[cell_indices[~off_lattice], columns[~off_lattice], rows[~off_lattice]] = True
+    return dot_positions, ambiguous_cells
+
+#The dot numbering gives the dot number (minus one) of every position of the dot lattice, by
+#column and row. As the orientation of the braille cells on the page depends on how the pages
+#are placed on the scanner, the numbering of the dots is found by comparing the braille cells
+#decoded with every candidate numbering to the predictions of the model (see "recognize_cells").
+dot_numberings = [[[0, 1, 2], [3, 4, 5]], [[3, 4, 5], [0, 1, 2]], [[2, 1, 0], [5, 4, 3]], [[5, 4, 3], [2, 1, 0]]]
+
+#The dot positions of the braille cells are decoded into the Unicode code points of the braille
+#cells (U+2800 plus the bits of the dots that are present).
+def decode_dot_positions(dot_positions, dot_numbering):
+    dot_bits = np.left_shift(1, np.array(dot_numbering, np.uint32))
+    return (0x2800 + (dot_positions*dot_bits).sum(axis=(1, 2))).astype(np.uint32)
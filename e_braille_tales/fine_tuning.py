@@ -0,0 +1,175 @@
+import copy
+import hashlib
+import json
+import os
+import time
+import numpy as np
+
+from .document import write_file_atomically
+from .line_model import get_accuracy, load_cell_dataset
+from .recognition import (fine_tuned_model_suffix, get_input_statistics, get_input_transform, load_model,
+model_settings, student_model_suffix)
+
+#Adapting the model to another brailler (or paper stock, or scanner) doesn't require training
+#all of its layers again: the "backbone" of the model (its convolutions, up to the flattening
+#layer, which gives the "embedding" of every braille cell) is kept frozen, and only the
+#"classification head" (the layers after the flattening layer) is fine-tuned. The model is
+#split at the last flattening layer found in it, looking into its last layer whenever it is
+#itself a sequence of layers (such as the head of the models of fastai's "cnn_learner", which
+#follows the body of the model). The backbone and the head share their layers with the model.
+#A "ValueError" is raised if the model holds no flattening layer.
+def split_model_head(model):
+    import torch
+    backbone_layers = []
+    layers = list(model)
+    while True:
+        flatten_indices = [i for i, layer in enumerate(layers) if "Flatten" in type(layer).__name__]
+        if flatten_indices != []:
+            backbone_layers += layers[:flatten_indices[-1]+1]
+            return torch.nn.Sequential(*backbone_layers), torch.nn.Sequential(*layers[flatten_indices[-1]+1:])
+        if layers == [] or not isinstance(layers[-1], torch.nn.Sequential):
+            raise ValueError("The model doesn't hold a flattening layer after which to split its classification head.")
+        backbone_layers += layers[:-1]
+        layers = list(layers[-1])
+
+#The fingerprint of the embeddings tells whether they were computed by the same model (the
+#size and modification time of its file, and the conversion of its input, see
+#"get_input_statistics") for the same braille cells (the images and labels of the dataset), such
+#that the cached embeddings are only used again if neither has changed.
+def get_embedding_fingerprint(learn, model_path, images, labels):
+    fingerprint = hashlib.sha1()
+    for i in range(0, len(images), 4096):
+        fingerprint.update(np.ascontiguousarray(images[i:i+4096]).data)
+    fingerprint.update(np.ascontiguousarray(labels).data)
+    model_file_status = os.stat(model_path)
+    return {"model_path": os.path.abspath(model_path), "model_size": model_file_status.st_size,
+    "model_mtime": model_file_status.st_mtime, "input_statistics": list(get_input_statistics(learn)),
+    "cells": len(images), "sha1": fingerprint.hexdigest()}
+
+#The frozen backbone of the model is run once over the braille cells of the dataset, converted
+#like the input of the model of "learn" (see "get_input_transform"), and their embeddings are
+#written batch by batch to a memory-mapped numpy array of float16 values (which halves its size,
+#the head being trained in float32), in the dataset folder, named after the model (ex:
+#"Model_Perkins_Brailler_acc9997 embeddings.npy", with the fingerprint of the embeddings in the
+#JSON file of the same name, see "get_embedding_fingerprint"). The array is written to a
+#temporary file first, and only replaces the cached embeddings once complete. When the cached
+#embeddings match the fingerprint, they are memory-mapped again instead, and the backbone isn't
+#run at all. The memory-mapped embeddings are returned along with a boolean telling whether they
+#were cached.
+def cache_embeddings(learn, backbone, images, cache_file_path, fingerprint, batch_size=256):
+    import torch
+    fingerprint_file_path = cache_file_path[:-len(".npy")] + ".json"
+    if os.path.exists(cache_file_path) and os.path.exists(fingerprint_file_path):
+        with open(fingerprint_file_path, "r", encoding="utf-8") as fingerprint_file:
+            if json.load(fingerprint_file) == fingerprint:
+                return np.load(cache_file_path, mmap_mode="r"), True
+    backbone = backbone.eval()
+    device = next(backbone.parameters()).device
+    transform_input = get_input_transform(learn, device)
+    with torch.no_grad():
+        embedding_size = backbone(torch.zeros(1, 3, *images.shape[1:], device=device)).shape[1]
+    temporary_file_path = cache_file_path[:-len(".npy")] + ".tmp.npy"
+    embeddings = np.lib.format.open_memmap(temporary_file_path, mode="w+", dtype=np.float16,
+    shape=(len(images), embedding_size))
+    with torch.no_grad():
+        for i in range(0, len(images), batch_size):
+            batch = transform_input(torch.from_numpy(np.ascontiguousarray(images[i:i+batch_size])).to(device))
+            embeddings[i:i+batch_size] = backbone(batch).cpu().numpy()
+    embeddings.flush()
+    del embeddings
+    os.replace(temporary_file_path, cache_file_path)
+    write_file_atomically(fingerprint_file_path, json.dumps(fingerprint, indent=1))
+    return np.load(cache_file_path, mmap_mode="r"), False
+
+#The classification head is trained on the cached embeddings of the braille cells drawn from the
+#"training_cell_indices", with the cross-entropy loss and a one cycle learning rate schedule (as
+#in "train_student_model"). Every batch is read from the memory-mapped embeddings (in the order
+#of the cells in the file, which keeps the reads sequential) and converted to float32, such that
+#the embeddings never need to fit in memory, and training only takes a few minutes on a CPU.
+def train_head(head, embeddings, labels, training_cell_indices, epochs=10, learning_rate=1e-3, batch_size=256,
+seed=0):
+    import torch
+    torch.manual_seed(seed)
+    device = next(head.parameters()).device
+    random_generator = np.random.default_rng(seed)
+    batch_count = -(-len(training_cell_indices)//batch_size)
+    optimizer = torch.optim.Adam(head.parameters(), lr=learning_rate)
+    scheduler = torch.optim.lr_scheduler.OneCycleLR(optimizer, learning_rate, total_steps=max(1, epochs*batch_count))
+    head.train()
+    for epoch in range(epochs):
+        shuffled_cell_indices = random_generator.permutation(training_cell_indices)
+        for i in range(0, len(shuffled_cell_indices), batch_size):
+            batch_cell_indices = np.sort(shuffled_cell_indices[i:i+batch_size])
+            batch = torch.from_numpy(embeddings[batch_cell_indices].astype(np.float32)).to(device)
+            loss = torch.nn.functional.cross_entropy(head(batch),
+            torch.from_numpy(labels[batch_cell_indices]).to(device))
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            scheduler.step()
+    return head.eval()
+
+#The classification head of a copy of the model of the "working_folder" (or of the student model,
+#when student models are enabled) is fine-tuned for "epochs" epochs on the dataset found in the
+#"dataset_folder" (see "load_cell_dataset"), from the cached embeddings of its braille cells (see
+#"cache_embeddings"), 10% of which are set aside to compare the accuracy of the model before and
+#after fine-tuning (the fine-tuned model being run in full on the braille cells, just like for
+#OCR). The fine-tuned model keeps the layers of the model, and is only exported next to it (with
+#the "-finetuned" suffix, see "load_model") if its validation accuracy is at most "accuracy_budget"
+#(as a fraction) below that of the model, otherwise any fine-tuned model exported before is left as
+#it is. It can then be used for OCR with the "--fine-tuned-model" option, or converted into a line
+#model (see "create_line_model"). The report of the fine-tuning is returned.
+def create_fine_tuned_model(working_folder, dataset_folder, epochs=10, accuracy_budget=0.001,
+validation_fraction=0.1):
+    from fastai.vision.all import CrossEntropyLossFlat, Learner
+    model_path = os.path.join(working_folder, "Model_Perkins_Brailler_acc9997")
+    learn = load_model(model_path)
+    if model_settings["student_models"]:
+        model_path += student_model_suffix
+    fine_tuned_model = copy.deepcopy(learn.model)
+    backbone, head = split_model_head(fine_tuned_model)
+    if len(list(head.parameters())) == 0:
+        raise ValueError("The classification head of the model has no parameters to fine-tune.")
+    images, labels = load_cell_dataset(dataset_folder, learn.dls.vocab)
+    cell_indices = np.random.default_rng(0).permutation(len(images))
+    validation_cell_count = max(1, int(len(images)*validation_fraction))
+    if validation_cell_count >= len(images):
+        raise ValueError('The dataset found in "' + dataset_folder + '" is too small to be split into ' +
+        "a training set and a validation set.")
+    validation_cell_indices = cell_indices[:validation_cell_count]
+    report = {"fine_tuned_model_path": model_path + fine_tuned_model_suffix, "accuracy_budget": accuracy_budget,
+    "cells": len(images), "validation_cells": validation_cell_count,
+    "model_accuracy": get_accuracy(learn, images, labels, validation_cell_indices)}
+
+    start_time = time.perf_counter()
+    embeddings, report["cached_embeddings"] = cache_embeddings(learn, backbone, images,
+    os.path.join(dataset_folder, os.path.basename(model_path) + " embeddings.npy"),
+    get_embedding_fingerprint(learn, model_path, images, labels))
+    report["embedding_seconds"] = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    train_head(head, embeddings, labels, cell_indices[validation_cell_count:], epochs)
+    report["training_seconds"] = time.perf_counter() - start_time
+    fine_tuned_learn = Learner(learn.dls, fine_tuned_model.eval(), loss_func=CrossEntropyLossFlat())
+    report["fine_tuned_model_accuracy"] = get_accuracy(fine_tuned_learn, images, labels, validation_cell_indices)
+    report["accepted"] = report["fine_tuned_model_accuracy"] >= report["model_accuracy"] - accuracy_budget
+    if report["accepted"]:
+        fine_tuned_learn.export(report["fine_tuned_model_path"])
+    return report
+
+#The report of "create_fine_tuned_model" is printed as a table.
+def print_fine_tuning_report(report):
+    rows = [["", "Model", "Fine-tuned model"],
+    ["Validation accuracy (" + str(report["validation_cells"]) + " of " + str(report["cells"]) + " cells)",
+    str(round(100*report["model_accuracy"], 3)) + "%", str(round(100*report["fine_tuned_model_accuracy"], 3)) + "%"],
+    ["Embeddings of the braille cells" + (" (cached)" if report["cached_embeddings"] else ""), "",
+    str(round(report["embedding_seconds"], 1)) + " s"],
+    ["Training of the classification head", "", str(round(report["training_seconds"], 1)) + " s"]]
+    column_widths = [max([len(row[i]) for row in rows]) for i in range(3)]
+    for row in rows:
+        print("  ".join([row[0].ljust(column_widths[0])] + [row[i].rjust(column_widths[i]) for i in [1, 2]]))
+    if report["accepted"]:
+        print("\nFine-tuned model written to " + report["fine_tuned_model_path"] + ".")
+    else:
+        print("\nThe validation accuracy of the fine-tuned model is more than " +
+        str(round(100*report["accuracy_budget"], 3)) + " percentage point(s) below that of the model " +
+        "(see --accuracy-budget), so it wasn't written.")
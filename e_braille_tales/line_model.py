@@ -0,0 +1,263 @@
+import copy
+import os
+import time
+import cv2
+import numpy as np
+
+from .dataset import load_dataset_index, load_dataset_shard
+from .pipeline import decode_grayscale_JPEG, group_JPEG_files_by_document
+from .recognition import (fine_tuned_model_suffix, get_input_transform, line_model_suffix, load_model, model_settings,
+predict_cells, predict_line_strips, run_model, student_model_suffix)
+from .segmentation import (character_height, character_spacing, character_width, characters_per_line,
+crop_margin, first_character_x_min, gather_cells, gather_line_strips, segment_page)
+
+#The model is split into the layers computing the features of the braille cells (its convolutions,
+#activations and batch normalizations) and its classification head, which starts with the last
+#adaptive pooling layer found in it (such as "AdaptiveAvgPool2d", or the "AdaptiveConcatPool2d" of
+#fastai), looking into its last layer whenever it is itself a sequence of layers (such as the head
+#of the models of fastai's "cnn_learner", which follows the body of the model, see also
+#"split_model_head"). Both parts share their layers with the model. A "ValueError" is raised if the
+#model holds no adaptive pooling layer.
+def split_model_features(model):
+    import torch
+    feature_layers = []
+    layers = list(model)
+    while True:
+        pooling_indices = [i for i, layer in enumerate(layers)
+        if "Adaptive" in type(layer).__name__ and "Pool" in type(layer).__name__]
+        if pooling_indices != []:
+            feature_layers += layers[:pooling_indices[-1]]
+            return torch.nn.Sequential(*feature_layers), torch.nn.Sequential(*layers[pooling_indices[-1]:])
+        if layers == [] or not isinstance(layers[-1], torch.nn.Sequential):
+            raise ValueError("The model doesn't hold an adaptive pooling layer before its classification head.")
+        feature_layers += layers[:-1]
+        layers = list(layers[-1])
+
+#The model classifies the braille cells one at a time, from crops that overlap with those of
+#the neighboring braille cells (by "2*crop_margin - character_spacing" pixels), and that are
+#padded with zeros at every convolution. As its layers before its classification head (see
+#"split_model_features") are convolutions (and activations or batch normalizations), the same
+#layers can be run once over a whole line of braille cells (a "line strip", see
+#"gather_line_strips"), and the classification head of the model is then run over the window
+#of features of every braille cell (see "SlidingWindowLineModel"), such that the "line model"
+#predicts the categories of the 41 braille cells of a line in a single pass. The stride of the
+#features (the number of pixels of the line strip per feature) is measured by running them over
+#two blank images of different widths. The pitch of the braille cells is stored along with the
+#line model (see "is_line_model"). The line model holds a copy of the layers of the model. A
+#"ValueError" is raised if the model can't be converted.
+def convert_to_line_model(model, cell_pitch=character_width + character_spacing):
+    import torch
+    from .sliding_window import SlidingWindowLineModel
+    features, head = split_model_features(copy.deepcopy(model).eval())
+    cell_width, cell_height = character_width + 2*crop_margin, character_height + 2*crop_margin
+    with torch.no_grad():
+        window_width = features(torch.zeros(1, 3, cell_width, cell_height)).shape[2]
+        feature_widths = [features(torch.zeros(1, 3, width, cell_height)).shape[2] for width in [960, 1920]]
+    if feature_widths[1] == feature_widths[0]:
+        raise ValueError("The features of the model don't follow the braille cells along the line.")
+    stride = round(960/(feature_widths[1] - feature_widths[0]))
+    return SlidingWindowLineModel(features, head, cell_pitch, stride, window_width).eval()
+
+#The dataset used to train the model holds a subfolder of JPEG images of braille cells for
+#every label (named after it, such as "⠁" or "empty_braille_cell"). The images (cropped like
+#those of "crop_cells") are returned as a numpy array of shape (images, height, width), along
+#with the category indices of their labels (see "learn.dls.vocab"). A "ValueError" is raised
+#if an image doesn't have the size of the cropped braille cells. The sharded datasets built
+#from scanned pages (see "build_dataset") are read in full from their shards instead.
+def load_cell_dataset(dataset_folder, vocab):
+    index = load_dataset_index(dataset_folder)
+    if index != None:
+        shards = [load_dataset_shard(dataset_folder, index, shard, vocab, None) for shard in index["shards"]]
+        if shards == []:
+            raise ValueError('The dataset found in "' + dataset_folder + '" holds no braille cells.')
+        return np.concatenate([crops for crops, labels in shards]), np.concatenate([labels for crops, labels in shards])
+    images = []
+    labels = []
+    for category_index, label in enumerate(vocab):
+        label_folder = os.path.join(dataset_folder, label)
+        if not os.path.isdir(label_folder):
+            continue
+        for file_name in sorted(os.listdir(label_folder)):
+            if file_name[-4:].lower() not in [".jpg", "jpeg"]:
+                continue
+            image = cv2.imread(os.path.join(label_folder, file_name), cv2.IMREAD_GRAYSCALE)
+            if image is None or image.shape != (character_width + 2*crop_margin, character_height + 2*crop_margin):
+                raise ValueError('"' + os.path.join(label_folder, file_name) + '" isn\'t a JPEG image of ' +
+                str(character_width + 2*crop_margin) + " by " + str(character_height + 2*crop_margin) + " pixels.")
+            images.append(image)
+            labels.append(category_index)
+    if images == []:
+        raise ValueError('No JPEG images of braille cells were found in "' + dataset_folder + '".')
+    return np.array(images), np.array(labels, np.int64)
+
+#The line strips used to fine-tune and evaluate the line model are tiled from the braille cells
+#of the dataset, given as a numpy array of shape (lines, 41, height, width). Every braille cell
+#is placed at its position along the line (a multiple of the pitch of the braille cells), such
+#that the margin of every braille cell overlaps with that of the next one, just like in the
+#scanned pages (where the overlapping pixels come from the next braille cell).
+def tile_line_strips(cell_images, cell_pitch=character_width + character_spacing):
+    strips = np.empty((len(cell_images), (characters_per_line-1)*cell_pitch + cell_images.shape[2],
+    cell_images.shape[3]), cell_images.dtype)
+    for i in range(characters_per_line):
+        strips[:, i*cell_pitch:i*cell_pitch + cell_images.shape[2]] = cell_images[:, i]
+    return strips
+
+#The braille cells of the dataset ("cell_indices") are arranged into lines of 41 braille cells,
+#the last line being completed with the first braille cells.
+def get_dataset_lines(cell_indices):
+    line_count = -(-len(cell_indices)//characters_per_line)
+    return np.resize(cell_indices, (line_count, characters_per_line))
+
+#The category indices predicted for the braille cells of the dataset (in "validation_lines") by
+#the model of "learn" (classifying them one at a time) or by the line model converted from it
+#("line_model", classifying them line by line) are returned with the shape of "validation_lines".
+def get_predictions(learn, images, validation_lines, line_model=None):
+    if line_model != None:
+        return run_model(learn, tile_line_strips(images[validation_lines], line_model.cell_pitch), 8,
+        model=line_model)
+    return run_model(learn, images[validation_lines.reshape(-1)]).reshape(validation_lines.shape)
+
+#The proportion of these braille cells for which the model (or the line model) predicts the right label.
+def get_accuracy(learn, images, labels, validation_lines, line_model=None):
+    return float((get_predictions(learn, images, validation_lines, line_model) == labels[validation_lines]).mean())
+
+#The line model is fine-tuned on line strips tiled from braille cells drawn at random from the
+#training set (as many lines per epoch as there are braille cells in the training set, divided
+#by 41), in order for it to adapt to seeing the neighboring braille cells instead of the zero
+#padding at the edges of the crops. The line strips are converted like the input of the model
+#of "learn" (see "get_input_transform"), and the batch normalization statistics of the model
+#are kept as they are.
+def fine_tune_line_model(learn, line_model, images, labels, training_cell_indices, epochs=1, learning_rate=1e-4,
+batch_size=8, seed=0):
+    import torch
+    device = next(line_model.parameters()).device
+    transform_input = get_input_transform(learn, device)
+    optimizer = torch.optim.Adam(line_model.parameters(), lr=learning_rate)
+    random_generator = np.random.default_rng(seed)
+    line_model.eval()
+    for epoch in range(epochs):
+        lines = random_generator.choice(training_cell_indices,
+        (max(1, len(training_cell_indices)//characters_per_line), characters_per_line))
+        for i in range(0, len(lines), batch_size):
+            strips = transform_input(torch.from_numpy(tile_line_strips(images[lines[i:i+batch_size]],
+            line_model.cell_pitch)).to(device))
+            loss = torch.nn.functional.cross_entropy(line_model(strips),
+            torch.from_numpy(labels[lines[i:i+batch_size]]).to(device))
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+    return line_model.eval()
+
+#The model and the line model are compared on the JPEG images of the "raw_data_folder": the
+#braille cells (and lines) of every page are gathered and classified by both models, and
+#the total durations (including the JPEG encoding of the braille cells for the model) are
+#returned along with the number of braille cells and the number of them for which the
+#predictions of both models agree.
+def compare_on_pages(learn, line_learn, raw_data_folder, x_min=first_character_x_min):
+    comparison = {"pages": 0, "cells": 0, "agreeing_cells": 0, "model_seconds": 0, "line_model_seconds": 0}
+    for JPEG_file_names in group_JPEG_files_by_document(os.listdir(raw_data_folder)).values():
+        for JPEG_file_name in JPEG_file_names:
+            with open(os.path.join(raw_data_folder, JPEG_file_name), "rb") as JPEG_file:
+                image = decode_grayscale_JPEG(JPEG_file.read())
+            chars_x_y_coordinates = segment_page(image, x_min)
+            start_time = time.perf_counter()
+            preds_argmax = predict_cells(learn, gather_cells(image, chars_x_y_coordinates))
+            comparison["model_seconds"] += time.perf_counter() - start_time
+            start_time = time.perf_counter()
+            line_preds_argmax = predict_line_strips(line_learn, gather_line_strips(image, chars_x_y_coordinates))
+            comparison["line_model_seconds"] += time.perf_counter() - start_time
+            comparison["pages"] += 1
+            comparison["cells"] += len(preds_argmax)
+            comparison["agreeing_cells"] += int((preds_argmax == line_preds_argmax).sum())
+    return comparison
+
+#The model of the "working_folder" is converted into a line model (see "convert_to_line_model"),
+#which is then fine-tuned for "epochs" epochs on the dataset found in the "dataset_folder", 10%
+#of which is set aside to compare the accuracy of the model with that of the line model, before
+#and after fine-tuning. The line model is only exported next to the model (with the "-lines"
+#suffix, see "load_model") if its validation accuracy is at most "accuracy_budget" (as a fraction)
+#below that of the model, otherwise any line model exported before is left as it is. Both models
+#are then compared on the JPEG images of the "OCR Raw Data" folder. When student models are
+#enabled, the student model (see "create_student_model") is converted instead, and the line model
+#is written with the "-student-lines" suffix (and likewise with the "-finetuned" suffix for the
+#fine-tuned model, see "create_fine_tuned_model"). The number of times that the features are
+#computed per line ("phases", see "SlidingWindowLineModel") is reported (with a warning when it
+#is above 1), as the line model is only faster than the model when the stride of the features
+#divides the pitch of the braille cells. The report of the comparison is returned.
+def create_line_model(working_folder, dataset_folder, epochs=1, accuracy_budget=0.001, x_min=first_character_x_min,
+validation_fraction=0.1):
+    from fastai.vision.all import CrossEntropyLossFlat, Learner
+    model_path = os.path.join(working_folder, "Model_Perkins_Brailler_acc9997")
+    learn = load_model(model_path)
+    line_model = convert_to_line_model(learn.model)
+    if len(line_model.phases) > 1:
+        print("Warning: the stride of the features of the model (" + str(line_model.stride) + " pixels) doesn't " +
+        "divide the pitch of the braille cells (" + str(line_model.cell_pitch) + " pixels), so the line model " +
+        "computes them " + str(len(line_model.phases)) + " times per line and won't be faster than the model " +
+        "(see --distill for a model whose stride divides it).\n")
+    if model_settings["student_models"]:
+        model_path += student_model_suffix
+    if model_settings["fine_tuned_models"]:
+        model_path += fine_tuned_model_suffix
+    images, labels = load_cell_dataset(dataset_folder, learn.dls.vocab)
+    cell_indices = np.random.default_rng(0).permutation(len(images))
+    validation_cell_count = max(1, int(len(images)*validation_fraction))
+    if validation_cell_count >= len(images):
+        raise ValueError('The dataset found in "' + dataset_folder + '" is too small to be split into ' +
+        "a training set and a validation set.")
+    validation_lines = get_dataset_lines(cell_indices[:validation_cell_count])
+    #The predictions of the line model are checked against those of the model (classifying the
+    #braille cells one at a time) on the validation lines.
+    preds_argmax = get_predictions(learn, images, validation_lines)
+    line_preds_argmax = get_predictions(learn, images, validation_lines, line_model)
+    report = {"line_model_path": model_path + line_model_suffix, "accuracy_budget": accuracy_budget,
+    "phases": len(line_model.phases), "dataset": {"cells": len(images), "validation_cells": validation_cell_count,
+    "model_accuracy": float((preds_argmax == labels[validation_lines]).mean()),
+    "converted_line_model_accuracy": float((line_preds_argmax == labels[validation_lines]).mean()),
+    "converted_line_model_agreement": float((line_preds_argmax == preds_argmax).mean())}, "pages": None}
+    line_model_accuracy = report["dataset"]["converted_line_model_accuracy"]
+    if epochs > 0:
+        fine_tune_line_model(learn, line_model, images, labels, cell_indices[validation_cell_count:], epochs)
+        line_preds_argmax = get_predictions(learn, images, validation_lines, line_model)
+        line_model_accuracy = float((line_preds_argmax == labels[validation_lines]).mean())
+        report["dataset"]["fine_tuned_line_model_accuracy"] = line_model_accuracy
+        report["dataset"]["fine_tuned_line_model_agreement"] = float((line_preds_argmax == preds_argmax).mean())
+    report["accepted"] = line_model_accuracy >= report["dataset"]["model_accuracy"] - accuracy_budget
+    line_learn = Learner(learn.dls, line_model, loss_func=CrossEntropyLossFlat(axis=1))
+    if report["accepted"]:
+        line_learn.export(report["line_model_path"])
+    raw_data_folder = os.path.join(working_folder, "OCR Raw Data")
+    if os.path.isdir(raw_data_folder):
+        report["pages"] = compare_on_pages(learn, line_learn, raw_data_folder, x_min)
+    return report
+
+#The report of "create_line_model" is printed as a table.
+def print_line_model_report(report):
+    dataset = report["dataset"]
+    rows = [["", "Model", "Line model"],
+    ["Validation accuracy (" + str(dataset["validation_cells"]) + " of " + str(dataset["cells"]) + " cells)",
+    str(round(100*dataset["model_accuracy"], 3)) + "%", str(round(100*dataset["converted_line_model_accuracy"], 3)) + "%"],
+    ["Validation predictions agreeing with the model", "",
+    str(round(100*dataset["converted_line_model_agreement"], 3)) + "%"]]
+    if "fine_tuned_line_model_accuracy" in dataset:
+        rows.append(["Validation accuracy after fine-tuning", "",
+        str(round(100*dataset["fine_tuned_line_model_accuracy"], 3)) + "%"])
+        rows.append(["Validation predictions agreeing with the model after fine-tuning", "",
+        str(round(100*dataset["fine_tuned_line_model_agreement"], 3)) + "%"])
+    rows.append(["Feature passes per line", "", str(report["phases"])])
+    if report["pages"] != None and report["pages"]["cells"] > 0:
+        pages = report["pages"]
+        rows.append(["Throughput (" + str(pages["cells"]) + " cells, " + str(pages["pages"]) + " pages)",
+        str(round(pages["cells"]/pages["model_seconds"])) + " cells/s",
+        str(round(pages["cells"]/pages["line_model_seconds"])) + " cells/s"])
+        rows.append(["Predictions agreeing with the model", "",
+        str(round(100*pages["agreeing_cells"]/pages["cells"], 3)) + "%"])
+    column_widths = [max([len(row[i]) for row in rows]) for i in range(3)]
+    for row in rows:
+        print("  ".join([row[0].ljust(column_widths[0])] + [row[i].rjust(column_widths[i]) for i in [1, 2]]))
+    if report["accepted"]:
+        print("\nLine model written to " + report["line_model_path"] + ".")
+    else:
+        print("\nThe validation accuracy of the line model is more than " +
+        str(round(100*report["accuracy_budget"], 3)) + " percentage point(s) below that of the model " +
+        "(see --accuracy-budget), so it wasn't written.")
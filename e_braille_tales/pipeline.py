@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import re
+import time
+import cv2
+import numpy as np
+
+from .cache import get_fingerprint, get_stale_formats, load_json_file, transcribe_incrementally
+from .calibration import grid_settings
+from .confidences import confidence_settings, get_confidence_file_path, load_confidence_file, write_confidence_file
+from .document import BrailleDocument, write_document, write_file_atomically
+from .profiling import record_stage, start_stage
+from .recognition import load_model, model_settings, recognize_page
+from .segmentation import first_character_x_min
+
+#The document name is extracted from the name of the first JPEG image (or from the name
+#of the modified ".txt" file), including all characters up to the last hyphen (e.g.
+#"Alice's Adventures in Wonderland Chapter 1-0001.jpg" would give the following
+#extracted name: "Alice's Adventures in Wonderland Chapter 1").
+def get_document_name(file_name):
+    hyphen_matches = re.finditer("-", file_name)
+    hyphen_indices = []
+    for match in hyphen_matches:
+        hyphen_indices.append(match.start())
+    return file_name[:hyphen_indices[-1]]
+
+#The JPEG images are grouped into documents according to their names, up to the last
+#hyphen (see "get_document_name" above). The images without a hyphen in their name are
+#left out, as the document that they belong to can't be determined. The dictionary maps
+#the document names to the sorted lists of the JPEG file names of their pages.
+def group_JPEG_files_by_document(file_names):
+    documents = {}
+    for file_name in sorted(file_names):
+        if file_name[-4:] == ".jpg" and "-" in file_name:
+            documents.setdefault(get_document_name(file_name), []).append(file_name)
+    return documents
+
+#The checkpoint manifest of the OCR step maps the JPEG file names to their SHA-256
+#hash, the OCR results of the page (braille cells), the offset of the page in the
+#"-OCR results.txt" file and the settings with which the page was submitted to OCR (see
+#"get_OCR_settings"). A new checkpoint is started if there isn't one already.
+def load_checkpoint(checkpoint_file_path):
+    if os.path.exists(checkpoint_file_path):
+        with open(checkpoint_file_path, "r", encoding="utf-8") as checkpoint_file:
+            return json.load(checkpoint_file)
+    return {"version": 1, "pages": {}}
+
+#The OCR results of a page depend on the settings below, besides its JPEG image: the x
+#coordinate of the first braille cell of every line ("x_min"), the model that is loaded (see
+#"load_model"), dot detection and grid calibration (along with its scanner profile). The pages
+#of the checkpoint manifest that were processed with other settings are submitted to OCR again.
+def get_OCR_settings(x_min=first_character_x_min):
+    return {"x_min": x_min, "line_models": model_settings["line_models"],
+    "student_models": model_settings["student_models"], "fine_tuned_models": model_settings["fine_tuned_models"],
+    "dot_detection": model_settings["dot_detection"], "grid_calibration": grid_settings["calibration"],
+    "scanner_profile": grid_settings["scanner_profile"] if grid_settings["calibration"] else None}
+
+#Only the pages of the JPEG images still present in the "OCR Raw Data" folder are
+#kept in the checkpoint, which is written atomically after every page.
+def save_checkpoint(checkpoint_file_path, checkpoint, JPEG_file_names):
+    start_time = start_stage()
+    checkpoint["pages"] = {JPEG_file_name:checkpoint["pages"][JPEG_file_name]
+    for JPEG_file_name in JPEG_file_names if JPEG_file_name in checkpoint["pages"]}
+    write_file_atomically(checkpoint_file_path, json.dumps(checkpoint, ensure_ascii=False, indent=1))
+    record_stage("checkpoint", start_time)
+
+#The "-OCR results.txt" file is meant to be proofread in place (see the README), and is thus
+#only written when the braille text of its pages ("page_strings") differs from that of the last
+#time it was written, whose SHA-256 hash is recorded in the checkpoint manifest ("results_sha256",
+#the checkpoint then needing to be saved). This way, rerunning the code with unchanged pages leaves
+#the corrections made to the file as they are. Should the file need to be written again (for
+#example, after a page was scanned again or a page was added) while it was modified since it was
+#last written, it is first kept as "-OCR results (proofread <date and time>).txt", so that the
+#corrections can be carried over to the new file.
+def write_OCR_results(file_root, checkpoint, page_strings):
+    results_file_path = file_root + "-OCR results.txt"
+    results_string = "\n\n".join(page_strings)
+    results_hash = hashlib.sha256(results_string.encode("utf-8")).hexdigest()
+    if os.path.exists(results_file_path):
+        with open(results_file_path, "rb") as results_file:
+            current_hash = hashlib.sha256(results_file.read()).hexdigest()
+        if current_hash != results_hash and current_hash != checkpoint.get("results_sha256"):
+            if checkpoint.get("results_sha256") == results_hash:
+                return
+            backup_file_path = (file_root + "-OCR results (proofread " + time.strftime("%Y-%m-%d %H-%M-%S") +
+            ").txt")
+            os.replace(results_file_path, backup_file_path)
+            print('The modified "' + os.path.basename(results_file_path) + '" file was kept as "' +
+            os.path.basename(backup_file_path) + '", as the OCR results of its pages changed.')
+        if current_hash == results_hash:
+            checkpoint["results_sha256"] = results_hash
+            return
+    write_file_atomically(results_file_path, results_string)
+    checkpoint["results_sha256"] = results_hash
+
+#A "ValueError" is raised if the bytes aren't those of a valid JPEG image.
+def decode_grayscale_JPEG(JPEG_bytes):
+    if len(JPEG_bytes) == 0:
+        raise ValueError("The JPEG image is empty.")
+    text_image_gray = cv2.imdecode(np.frombuffer(JPEG_bytes, np.uint8), cv2.IMREAD_GRAYSCALE)
+    if text_image_gray is None:
+        raise ValueError("The bytes aren't those of a valid JPEG image.")
+    return text_image_gray
+
+#The sidecar of a page is up to date if it exists and was written for the JPEG image whose
+#SHA-256 hash is "JPEG_hash" (see "write_confidence_file").
+def sidecar_is_up_to_date(confidence_file_path, JPEG_hash):
+    confidences = load_confidence_file(confidence_file_path)
+    return confidences != None and confidences["sha256"] == JPEG_hash
+
+#The braille text of a page is obtained from the bytes of its JPEG image, which is decoded
+#directly to grayscale (the scanned pages being grayscale JPEG images, this gives the same
+#pixels as decoding them in color and then converting them to grayscale, in about half the
+#time and a third of the memory). When a "DebugImageWriter" is provided as "debug_images",
+#the page is submitted to it (under the name of its JPEG image, "JPEG_file_name"), such that
+#its JPEG image with overlaid character rectangles is written in the background. When a
+#"confidence_file_path" is provided, the confidences of the braille cells of the page are
+#written to it (see "write_confidence_file").
+def ocr_page(learn, JPEG_bytes, x_min=first_character_x_min, debug_images=None, JPEG_file_name=None,
+confidence_file_path=None):
+    start_time = start_stage()
+    text_image_gray = decode_grayscale_JPEG(JPEG_bytes)
+    record_stage("decoding", start_time, pages=1, bytes=len(JPEG_bytes))
+    if confidence_file_path == None:
+        current_page_string, chars_x_y_coordinates = recognize_page(learn, text_image_gray, x_min)
+    else:
+        current_page_string, chars_x_y_coordinates, confidences = recognize_page(learn, text_image_gray, x_min,
+        confidence_settings["top_k"])
+        start_time = start_stage()
+        write_confidence_file(confidence_file_path, confidences, hashlib.sha256(JPEG_bytes).hexdigest())
+        record_stage("confidences", start_time, pages=1)
+    if debug_images != None:
+        debug_images.submit(text_image_gray, chars_x_y_coordinates, JPEG_file_name)
+    return current_page_string
+
+#The JPEG images "JPEG_file_names" of the "raw_data_folder" are submitted to OCR, and the
+#braille text of the document is returned. The OCR results are written to "file_root"
+#followed by "-OCR results.txt", and the checkpoint manifest to "file_root" followed by
+#"-OCR checkpoint.json". An already loaded model may be provided as "learn" (for example
+#by a process handling several documents), otherwise it is loaded from "model_path" when
+#at least one of the pages wasn't already processed in a previous run. When a
+#"DebugImageWriter" is provided as "debug_images", the JPEG images with overlaid
+#character rectangles of the pages submitted to OCR are written by it (see "ocr_page").
+#With the "--confidences" option, the confidences of the braille cells of every page are
+#written to its sidecar (see "get_confidence_file_path"). The "progress" function is called
+#after every page.
+def ocr_document(raw_data_folder, JPEG_file_names, file_root, model_path=None, learn=None,
+debug_images=None, progress=None, x_min=first_character_x_min):
+    #The OCR results of every page are recorded in a checkpoint manifest found in the output
+    #folder ("-OCR checkpoint.json"), along with the SHA-256 hash of the JPEG image and
+    #the offset of the page within the "-OCR results.txt" file. Should the code be interrupted
+    #before all of the pages are processed, running it again will skip over the pages for which
+    #the JPEG images are unchanged, and carry on with the remaining ones. Pages whose JPEG
+    #image was modified since the last run (for example after scanning it again) will be
+    #processed once more, as will the pages processed with other settings (see "get_OCR_settings").
+    #The checkpoint manifest should be removed to start over.
+    checkpoint_file_path = file_root + "-OCR checkpoint.json"
+    checkpoint = load_checkpoint(checkpoint_file_path)
+    OCR_settings = get_OCR_settings(x_min)
+    page_strings = []
+
+    for JPEG_file_name in JPEG_file_names:
+        start_time = start_stage()
+        with open(os.path.join(raw_data_folder, JPEG_file_name), "rb") as JPEG_file:
+            JPEG_bytes = JPEG_file.read()
+        JPEG_hash = hashlib.sha256(JPEG_bytes).hexdigest()
+        record_stage("reading", start_time, pages=1, bytes=len(JPEG_bytes))
+        checkpoint_page = checkpoint["pages"].get(JPEG_file_name)
+        confidence_file_path = None
+        if confidence_settings["top_k"] > 0:
+            confidence_file_path = get_confidence_file_path(file_root, JPEG_file_name)
+        #The pages that were processed without the "--confidences" option are submitted to OCR
+        #again when it is used, in order to write their sidecar, as are the pages whose sidecar
+        #was written for another JPEG image (for example, before the page was scanned again).
+        if (checkpoint_page != None and checkpoint_page["sha256"] == JPEG_hash and
+        checkpoint_page.get("settings") == OCR_settings and
+        (confidence_file_path == None or sidecar_is_up_to_date(confidence_file_path, JPEG_hash))):
+            page_strings.append(checkpoint_page["cells"])
+            if progress != None:
+                progress()
+            continue
+
+        if learn == None:
+            learn = load_model(model_path)
+
+        current_page_string = ocr_page(learn, JPEG_bytes, x_min, debug_images, JPEG_file_name, confidence_file_path)
+
+        #The page is recorded in the checkpoint manifest, which is saved after every page.
+        #Every page in the ".txt" file will be separated by an empty line ("\n\n"), to
+        #facilitate making corrections if needed, hence the "+ 2" in the offset. If the ".txt"
+        #file is resubmitted to the present code to generate updated RTF and PEF files reflecting
+        #the corrections, these "\n\n" would be removed to ensure that no superfluous line breaks
+        #make their way into the final documents.
+        checkpoint["pages"][JPEG_file_name] = {"sha256": JPEG_hash, "cells": current_page_string,
+        "offset": sum([len(page_string) + 2 for page_string in page_strings]), "settings": OCR_settings}
+        page_strings.append(current_page_string)
+        save_checkpoint(checkpoint_file_path, checkpoint, JPEG_file_names)
+        if progress != None:
+            progress()
+
+    #The "-OCR results.txt" file is written in full once all of the pages are processed,
+    #through a temporary file, so that an interrupted run never leaves it incomplete.
+    #Rerunning the code replaces it (see "write_OCR_results") rather than appending the text again.
+    write_OCR_results(file_root, checkpoint, page_strings)
+    save_checkpoint(checkpoint_file_path, checkpoint, JPEG_file_names)
+    return "".join(page_strings)
+
+#The text of a modified braille text file is returned after removal of the "\n\n"
+#carriage returns that were included to facilitate reviewing the braille text page by page.
+def read_braille_text_file(file_path):
+    with open(file_path, "r", encoding="utf-8") as g:
+        return g.read().replace("\n", "")
+
+#The braille text is converted only once into a "BrailleDocument", from which the
+#requested output files that are missing or out of date are then generated concurrently,
+#as "file_root" followed by the extension of each format. Their fingerprints are then
+#updated in the "-fingerprints.json" file. The formats that were generated are returned
+#(an empty list meaning that all of the output files were already up to date).
+def generate_outputs(character_string, file_root, formats, force=False):
+    start_time = start_stage()
+    fingerprints_file_path = file_root + "-fingerprints.json"
+    fingerprints = load_json_file(fingerprints_file_path)
+    if force:
+        stale_formats = formats
+    else:
+        stale_formats = get_stale_formats(character_string, file_root, formats, fingerprints)
+    record_stage("fingerprints", start_time, formats=len(formats))
+    if stale_formats == []:
+        return stale_formats
+    start_time = start_stage()
+    document = BrailleDocument.from_braille(character_string)
+    record_stage("parsing", start_time, cells=len(character_string))
+    #The RTF document and plain text file are generated from the transcription to printed
+    #English, which is assembled from the transcription cache (see "transcribe_incrementally").
+    #The "force" option starts over with an empty cache.
+    if "rtf" in stale_formats or "txt" in stale_formats:
+        transcription_cache_file_path = file_root + "-transcription cache.json"
+        if force:
+            transcription_cache = {}
+        else:
+            transcription_cache = load_json_file(transcription_cache_file_path)
+        document.rtf_transcription, transcription_cache = transcribe_incrementally(document.to_braille(),
+        transcription_cache)
+        write_file_atomically(transcription_cache_file_path, json.dumps(transcription_cache, ensure_ascii=False))
+    write_document(document, file_root, stale_formats)
+    for format_name in stale_formats:
+        fingerprints[format_name] = get_fingerprint(character_string, format_name)
+    write_file_atomically(fingerprints_file_path, json.dumps(fingerprints, indent=1, sort_keys=True))
+    return stale_formats
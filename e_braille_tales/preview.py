@@ -0,0 +1,95 @@
+import time
+import numpy as np
+
+from .calibration import calibrate_grid
+from .document import braille_to_format
+from .recognition import assemble_page_string, recognize_cells
+from .segmentation import character_height, characters_per_line, first_character_x_min, segment_page
+
+'''PREVIEW PARAMETERS'''
+#A line can be checked right after typing it (a "preview"), without submitting the whole page
+#to OCR: only the braille cells of the region of interest of the page (or of a single line of
+#braille cells) are segmented and submitted to the model, and their braille text is returned
+#along with its transcription to printed English (see "recognize_region"). The region of interest
+#is given as the range of y pixels [y_min, y_max] that it spans (the y coordinates being those of
+#"segment_page", that is, the columns of the JPEG image scanned in portrait mode). It is padded
+#with "band_padding" white pixels on both sides before segmentation (as "segment_page" leaves
+#out the lines too close to the edges of the image).
+band_padding = 2*character_height
+
+#The region of interest is given as "Y_MIN:Y_MAX" (ex: "1500:1700"). A "ValueError" is raised if
+#it isn't a range of at least one pixel.
+def parse_region(value):
+    bounds = value.split(":")
+    if len(bounds) != 2 or not all([bound.strip().isdigit() for bound in bounds]) or int(bounds[0]) >= int(bounds[1]):
+        raise ValueError('The region of interest should be given as "Y_MIN:Y_MAX", with Y_MIN < Y_MAX, got ' +
+        repr(value) + ".")
+    return [int(bounds[0]), int(bounds[1])]
+
+#Only the band of the page spanning the region of interest is segmented: its pixels are copied
+#into a white image, padded on both sides (see "band_padding"), which is then segmented by
+#"segment_page". As "segment_page" only registers a line of braille cells when its dots are
+#followed by other non-white pixels (such as the darkened edge of the scanned page), the last
+#column of the band is made dark, standing in for the edge of the page. The braille character
+#coordinates are then moved back to the coordinates of the page.
+def segment_band(image, y_min, y_max, x_min=first_character_x_min):
+    y_min, y_max = max(0, y_min), min(image.shape[1], y_max)
+    if y_min >= y_max:
+        raise ValueError("The region of interest lies outside of the image.")
+    band = np.full((image.shape[0], y_max - y_min + 2*band_padding), 255, image.dtype)
+    band[:, band_padding:band_padding + y_max - y_min] = image[:, y_min:y_max]
+    band[:, -1] = 0
+    y_offset = y_min - band_padding
+    return [[[char_x_y_coordinates[0][0], char_x_y_coordinates[0][1] + y_offset],
+    [char_x_y_coordinates[1][0], char_x_y_coordinates[1][1] + y_offset]]
+    for char_x_y_coordinates in segment_page(band, x_min)]
+
+#The braille character coordinates of a single line of braille cells are returned, the lines
+#being numbered from the top of the page starting at 1 (or from the bottom, starting at -1 for
+#the last line, which is usually the line that was just typed). The whole page is segmented (in
+#a few milliseconds), such that the lines are numbered just like in the page OCR. A "ValueError"
+#is raised if there is no such line on the page.
+def segment_line(image, line_number, x_min=first_character_x_min):
+    chars_x_y_coordinates = segment_page(image, x_min)
+    line_count = len(chars_x_y_coordinates)//characters_per_line
+    if line_number == 0 or abs(line_number) > line_count:
+        raise ValueError("There is no line " + str(line_number) + " on the page, which holds " + str(line_count) +
+        " line(s) of braille cells.")
+    line_index = line_number - 1 if line_number > 0 else line_count + line_number
+    return chars_x_y_coordinates[line_index*characters_per_line:(line_index+1)*characters_per_line]
+
+#The braille cells of the region of interest ("region", see "segment_band") or of the line
+#"line_number" (see "segment_line") of the page are recognized with the model already loaded
+#("learn", see "recognize_cells", to which the "predict" function is handed, such as that of
+#the server), and a dictionary is returned with their braille text ("cells", assembled as for
+#a page, see "assemble_page_string"), its transcription to printed English ("text", as in the
+#"txt" output format), the [y_min, y_max] coordinates of the lines of braille cells that were
+#found ("lines", such that the region can be adjusted) and the timings in seconds ("timings").
+#The grid of the braille cells is calibrated (see "calibrate_grid") whenever a calibration is
+#cached for the scanner profile, as a few lines aren't enough to calibrate it.
+def recognize_region(learn, image, region=None, line_number=None, x_min=first_character_x_min, predict=None):
+    start_time = time.perf_counter()
+    if line_number != None:
+        chars_x_y_coordinates = segment_line(image, line_number, x_min)
+    else:
+        chars_x_y_coordinates = segment_band(image, region[0], region[1], x_min)
+    chars_x_y_coordinates = calibrate_grid(image, chars_x_y_coordinates)
+    segmentation_time = time.perf_counter()
+    code_points = recognize_cells(learn, image, chars_x_y_coordinates, predict)
+    recognition_time = time.perf_counter()
+    current_page_string = assemble_page_string(code_points)
+    text = braille_to_format(current_page_string, "txt").rstrip("\n") if current_page_string != "" else ""
+    return {"cells": current_page_string, "text": text,
+    "lines": [[int(char_x_y_coordinates[0][1]), int(char_x_y_coordinates[1][1])]
+    for char_x_y_coordinates in chars_x_y_coordinates[::characters_per_line]],
+    "timings": {"segmentation": segmentation_time - start_time, "recognition": recognition_time - segmentation_time,
+    "transcription": time.perf_counter() - recognition_time}}
+
+#The preview of "recognize_region" is printed: the braille text of the lines, their
+#transcription to printed English and the timings (in milliseconds).
+def print_region_preview(preview):
+    print("Lines (y_min:y_max): " + (", ".join([str(y_min) + ":" + str(y_max) for y_min, y_max in preview["lines"]])
+    or "none found in the region of interest"))
+    print("\n" + preview["cells"] + "\n\n" + preview["text"] + "\n")
+    print(", ".join([timing_name + ": " + str(round(duration*1000, 1)) + " ms"
+    for timing_name, duration in preview["timings"].items()]))
@@ -0,0 +1,311 @@
+import math
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+import types
+
+#When profiling is enabled (with the "--profile" option), the duration of every stage of
+#the pipeline (decoding of the JPEG images, segmentation, cropping, inference, generation
+#of the output files, every transcription rule family, etc.) is added up in the "stages"
+#dictionary, which maps the stage names to [total seconds, number of calls, counts], where
+#the counts are a dictionary of the quantities handled by the stage (ex: pages, cells,
+#lines, bytes). The stages with a "/" in their names are part of the stage before the "/"
+#(ex: "transcription/shortform" is included in "transcription"). The stages are recorded
+#by the threads of the writers and of the server alike, hence the lock. When profiling
+#is disabled, "record_stage" returns right away. The transcription rules are only
+#profiled in more detail (see "profile_rule") when "rules" is set to "True", and the
+#memory used by every stage is only accounted for (see "start_memory_stage") when
+#"memory" is set to "True".
+profile = {"enabled": False, "rules": False, "memory": False, "start_time": None, "stages": {}, "memory_stages": {}}
+profile_lock = threading.Lock()
+
+def enable_profiling(rules=False, memory=False):
+    with profile_lock:
+        profile["enabled"] = True
+        profile["rules"] = rules
+        profile["memory"] = memory
+        profile["stages"] = {}
+        profile["memory_stages"] = {}
+        if memory:
+            tracemalloc.start()
+            threading.Thread(target=sample_resident_set_size, daemon=True).start()
+        profile["start_time"] = time.perf_counter()
+
+def profiling_enabled():
+    return profile["enabled"]
+
+def rule_profiling_enabled():
+    return profile["rules"]
+
+#Every stage starts by calling "start_stage", which returns the current time (from
+#"time.perf_counter()"), or the memory accounting of the stage in memory mode.
+def start_stage():
+    if not profile["memory"]:
+        return time.perf_counter()
+    return start_memory_stage()
+
+#The stage started at "start_time" (obtained from "start_stage") ends now, and the
+#quantities that it handled are provided as keyword arguments (ex: cells=41).
+def record_stage(stage_name, start_time, **counts):
+    if not profile["enabled"]:
+        return
+    end_time = time.perf_counter()
+    if isinstance(start_time, dict):
+        end_memory_stage(stage_name, start_time, counts)
+        start_time = start_time["start_time"]
+    add_stage_duration(stage_name, end_time - start_time, counts)
+
+def add_stage_duration(stage_name, duration, counts):
+    with profile_lock:
+        stage = profile["stages"].setdefault(stage_name, [0.0, 0, {}])
+        stage[0] += duration
+        stage[1] += 1
+        for count_name, count in counts.items():
+            stage[2][count_name] = stage[2].get(count_name, 0) + count
+
+#In memory mode (with the "--memory-report" option), the memory allocated by Python during
+#every stage is traced with "tracemalloc", while the resident set size (RSS) of the process,
+#which also includes the memory allocated by numpy, OpenCV and PyTorch outside of Python,
+#is sampled every "rss_sampling_interval" seconds by a background thread. The peak of the
+#traced memory is reset at the start and end of every stage, after being carried over to
+#all of the stages that are still running (such as the "transcription" stage during its
+#rules). As the traced memory and RSS belong to the whole process, the stages running
+#concurrently in other threads (for example, the output writers) share their allocations.
+rss_sampling_interval = 0.005
+running_memory_stages = []
+
+def get_resident_set_size():
+    try:
+        with open("/proc/self/statm", "r") as statm_file:
+            return int(statm_file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        #Outside of Linux, the maximum RSS of the process (in kilobytes) is used instead.
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def sample_resident_set_size():
+    while profile["memory"]:
+        resident_set_size = get_resident_set_size()
+        with profile_lock:
+            for memory_stage in running_memory_stages:
+                memory_stage["rss_peak"] = max(memory_stage["rss_peak"], resident_set_size)
+        time.sleep(rss_sampling_interval)
+
+#This function needs to be called while holding the "profile_lock".
+def update_traced_peaks():
+    traced_memory, traced_peak = tracemalloc.get_traced_memory()
+    for memory_stage in running_memory_stages:
+        memory_stage["traced_peak"] = max(memory_stage["traced_peak"], traced_peak)
+    tracemalloc.reset_peak()
+    return traced_memory
+
+def start_memory_stage():
+    resident_set_size = get_resident_set_size()
+    with profile_lock:
+        traced_memory = update_traced_peaks()
+        memory_stage = {"traced_start": traced_memory, "traced_peak": traced_memory,
+        "rss_start": resident_set_size, "rss_peak": resident_set_size}
+        running_memory_stages.append(memory_stage)
+        memory_stage["start_time"] = time.perf_counter()
+    return memory_stage
+
+#Every call of a stage adds a sample of [input size, peak allocation] to the stage, where
+#the input size is the first of the following counts handled by the stage, and the peak
+#allocation is the peak of the traced memory above its level at the start of the stage.
+size_count_names = ["cells", "characters", "input_bytes", "bytes", "paragraphs", "pages"]
+def end_memory_stage(stage_name, memory_stage, counts):
+    resident_set_size = get_resident_set_size()
+    with profile_lock:
+        traced_memory = update_traced_peaks()
+        running_memory_stages.remove(memory_stage)
+        peak_allocation = memory_stage["traced_peak"] - memory_stage["traced_start"]
+        rss_increase = max(memory_stage["rss_peak"], resident_set_size) - memory_stage["rss_start"]
+        memory = profile["memory_stages"].setdefault(stage_name, {"peak_allocation": 0, "allocated": 0,
+        "retained": 0, "peak_rss_increase": 0, "samples": []})
+        memory["peak_allocation"] = max(memory["peak_allocation"], peak_allocation)
+        memory["allocated"] += peak_allocation
+        memory["retained"] += traced_memory - memory_stage["traced_start"]
+        memory["peak_rss_increase"] = max(memory["peak_rss_increase"], rss_increase)
+        size_count_name = next((count_name for count_name in size_count_names if count_name in counts), None)
+        if size_count_name != None:
+            memory["samples"].append([counts[size_count_name], peak_allocation])
+
+#The growth exponent of the peak allocation of a stage with respect to its input size is the
+#slope of the least squares line through the samples on a log-log scale (1 for an allocation
+#proportional to the input size, 2 for a quadratic growth). It is only estimated when the
+#input sizes of the samples span at least a factor of "min_size_ratio". The stages with a
+#growth exponent above "super_linear_exponent" are flagged as growing super-linearly.
+min_size_ratio = 2
+super_linear_exponent = 1.2
+def get_growth_exponent(samples):
+    samples = [sample for sample in samples if sample[0] > 0 and sample[1] > 0]
+    if len(samples) < 3 or max([sample[0] for sample in samples]) < min_size_ratio*min([sample[0] for sample in samples]):
+        return None
+    log_sizes = [math.log(sample[0]) for sample in samples]
+    log_allocations = [math.log(sample[1]) for sample in samples]
+    mean_log_size = sum(log_sizes)/len(log_sizes)
+    mean_log_allocation = sum(log_allocations)/len(log_allocations)
+    return (sum([(log_size - mean_log_size)*(log_allocation - mean_log_allocation)
+    for log_size, log_allocation in zip(log_sizes, log_allocations)]) /
+    sum([(log_size - mean_log_size)**2 for log_size in log_sizes]))
+
+#The maximum RSS of the process is given in kilobytes on Linux (and in bytes on macOS).
+def get_peak_resident_set_size():
+    import resource
+    peak_resident_set_size = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak_resident_set_size
+    return peak_resident_set_size * 1024
+
+#The regular expression functions used by the transcription rules ("re.finditer" and
+#"re.sub") are counted by this stand-in for the "re" module, which otherwise gives
+#access to the functions of the "re" module.
+class MatchCounter:
+    def __init__(self):
+        self.match_count = 0
+
+    def finditer(self, pattern, string, flags=0):
+        for match in re.finditer(pattern, string, flags):
+            self.match_count += 1
+            yield match
+
+    def sub(self, pattern, repl, string, count=0, flags=0):
+        new_string, substitution_count = re.subn(pattern, repl, string, count=count, flags=flags)
+        self.match_count += substitution_count
+        return new_string
+
+    def __getattr__(self, name):
+        return getattr(re, name)
+
+#When the transcription rules are profiled (with the "--profile-rules" option), every rule
+#is first timed on its own, and its result returned. The rule is then run a second time
+#(such that the counting doesn't add to its duration), on a copy of the function that uses
+#a "MatchCounter" instead of the "re" module, in order to count the regular expression
+#matches, and under a trace function (in the current thread only) that adds up the sizes
+#in bytes of the successive versions of "new_character_string" built by the rule (which
+#are copies of the whole braille text, give or take the changes). The string methods
+#(such as "str.replace") aren't counted in the matches. These counts are recorded along
+#with the duration of the rule, as the "transcription/" stage of the rule.
+def profile_rule(rule_name, rule, character_string):
+    start_time = start_stage()
+    new_character_string = rule(character_string)
+    end_time = time.perf_counter()
+    if isinstance(start_time, dict):
+        end_memory_stage("transcription/" + rule_name, start_time, {"characters": len(character_string)})
+        start_time = start_time["start_time"]
+    duration = end_time - start_time
+
+    match_counter = MatchCounter()
+    counting_rule = types.FunctionType(rule.__code__, dict(rule.__globals__, re=match_counter),
+    rule.__name__, rule.__defaults__, rule.__closure__)
+    copied_strings = [0, character_string]
+    def trace_lines(frame, event, arg):
+        current_string = frame.f_locals.get("new_character_string")
+        if isinstance(current_string, str) and current_string is not copied_strings[1]:
+            copied_strings[0] += sys.getsizeof(current_string)
+            copied_strings[1] = current_string
+        return trace_lines
+    def trace_calls(frame, event, arg):
+        if frame.f_code is rule.__code__:
+            return trace_lines
+        return None
+    previous_trace = sys.gettrace()
+    sys.settrace(trace_calls)
+    try:
+        counting_rule(character_string)
+    finally:
+        sys.settrace(previous_trace)
+
+    add_stage_duration("transcription/" + rule_name, duration, {"matches": match_counter.match_count,
+    "bytes_copied": copied_strings[0], "input_bytes": sys.getsizeof(character_string)})
+    return new_character_string
+
+#The profile report is returned as a dictionary (to be saved as a JSON file), in which
+#the stages are sorted from the longest to the shortest total duration.
+def get_profile_report():
+    with profile_lock:
+        total_seconds = time.perf_counter() - profile["start_time"]
+        stages = sorted(profile["stages"].items(), key=lambda stage: stage[1][0], reverse=True)
+        report = {"version": 1, "total_seconds": total_seconds,
+        "stages": {stage_name: {"seconds": seconds, "calls": calls, "counts": dict(counts)}
+        for stage_name, [seconds, calls, counts] in stages}}
+        #In memory mode, the report also gives the peak of the traced memory and RSS of the
+        #whole run and, for every stage, the largest peak allocation of a single call, the
+        #sum of the peak allocations of all of its calls ("allocated"), the traced memory left
+        #allocated at the end of its calls ("retained"), the largest increase of the RSS during
+        #a call, the growth exponent of its peak allocation and whether it grows super-linearly.
+        if profile["memory"]:
+            update_traced_peaks()
+            memory_stages = sorted(profile["memory_stages"].items(), key=lambda stage: stage[1]["peak_allocation"],
+            reverse=True)
+            report["memory"] = {"traced_memory": tracemalloc.get_traced_memory()[0],
+            "peak_rss": get_peak_resident_set_size(), "stages": {}}
+            for stage_name, memory in memory_stages:
+                growth_exponent = get_growth_exponent(memory["samples"])
+                report["memory"]["stages"][stage_name] = {"peak_allocation": memory["peak_allocation"],
+                "allocated": memory["allocated"], "retained": memory["retained"],
+                "peak_rss_increase": memory["peak_rss_increase"], "samples": len(memory["samples"]),
+                "growth_exponent": growth_exponent,
+                "super_linear": growth_exponent != None and growth_exponent > super_linear_exponent}
+        return report
+
+#The human-readable summary of the profile report gives the total duration of every stage,
+#its share of the run time, the number of calls, the mean duration per call and the counts.
+def print_profile_summary(report):
+    rows = [["Stage", "Seconds", "% of run", "Calls", "ms/call", "Counts"]]
+    for stage_name, stage in report["stages"].items():
+        rows.append([stage_name, str(round(stage["seconds"], 3)),
+        str(round(100*stage["seconds"]/max(report["total_seconds"], 1e-9), 1)), str(stage["calls"]),
+        str(round(1000*stage["seconds"]/stage["calls"], 3)),
+        ", ".join([count_name + ": " + str(count) for count_name, count in stage["counts"].items()])])
+    column_widths = [max([len(row[i]) for row in rows]) for i in range(5)]
+    for row in rows:
+        print("  ".join([row[0].ljust(column_widths[0])] + [row[i].rjust(column_widths[i]) for i in range(1, 5)] +
+        [row[5]]))
+    print("\nTotal run time: " + str(round(report["total_seconds"], 2)) + ' seconds (the stages with a "/" ' +
+    "in their names are included in the stage before it).")
+
+#The transcription rules of the profile report are printed as a table sorted by "sort_key"
+#in decreasing order: "seconds", "calls", "matches", "bytes_copied" or "copies" (the number
+#of bytes copied per byte of braille text submitted to the rule).
+rule_sort_keys = ["seconds", "calls", "matches", "bytes_copied", "copies"]
+def print_rule_profile(report, sort_key="seconds"):
+    rules = []
+    for stage_name, stage in report["stages"].items():
+        if stage_name.startswith("transcription/") and "matches" in stage["counts"]:
+            rules.append({"rule": stage_name[len("transcription/"):], "seconds": stage["seconds"],
+            "calls": stage["calls"], "matches": stage["counts"]["matches"],
+            "bytes_copied": stage["counts"]["bytes_copied"],
+            "copies": stage["counts"]["bytes_copied"]/max(stage["counts"]["input_bytes"], 1)})
+    rules = sorted(rules, key=lambda rule: rule[sort_key], reverse=True)
+    total_seconds = max(sum([rule["seconds"] for rule in rules]), 1e-9)
+    rows = [["Rule", "Seconds", "% of rules", "Calls", "Matches", "Bytes copied", "Copies"]]
+    for rule in rules:
+        rows.append([rule["rule"], str(round(rule["seconds"], 4)), str(round(100*rule["seconds"]/total_seconds, 1)),
+        str(rule["calls"]), str(rule["matches"]), str(rule["bytes_copied"]), str(round(rule["copies"], 1))])
+    column_widths = [max([len(row[i]) for row in rows]) for i in range(7)]
+    for row in rows:
+        print("  ".join([row[0].ljust(column_widths[0])] + [row[i].rjust(column_widths[i]) for i in range(1, 7)]))
+
+#The memory report prints the memory accounting of every stage (in megabytes), from the
+#largest to the smallest peak allocation, flagging the stages that grow super-linearly.
+def print_memory_report(report):
+    megabyte = 1024*1024
+    rows = [["Stage", "Peak MB", "Allocated MB", "Retained MB", "RSS increase MB", "Growth", ""]]
+    for stage_name, memory in report["memory"]["stages"].items():
+        if memory["growth_exponent"] == None:
+            growth = "-"
+        else:
+            growth = str(round(memory["growth_exponent"], 2))
+        rows.append([stage_name, str(round(memory["peak_allocation"]/megabyte, 2)),
+        str(round(memory["allocated"]/megabyte, 2)), str(round(memory["retained"]/megabyte, 2)),
+        str(round(memory["peak_rss_increase"]/megabyte, 2)), growth, "super-linear" if memory["super_linear"] else ""])
+    column_widths = [max([len(row[i]) for row in rows]) for i in range(6)]
+    for row in rows:
+        print(("  ".join([row[0].ljust(column_widths[0])] + [row[i].rjust(column_widths[i]) for i in range(1, 6)] +
+        [row[6]])).rstrip())
+    print("\nPeak RSS of the process: " + str(round(report["memory"]["peak_rss"]/megabyte, 1)) + " MB. The growth is " +
+    "the exponent of the peak allocation of a stage with respect to its input size (1 for a linear growth).")
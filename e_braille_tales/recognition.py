@@ -0,0 +1,476 @@
+import cv2
+import numpy as np
+
+from .calibration import calibrate_grid
+from .dot_detection import decode_dot_positions, detect_dots, dot_numberings
+from .profiling import record_stage, start_stage
+from .segmentation import (character_width, characters_per_line, crop_margin, first_character_x_min, gather_cells,
+gather_line_strips, segment_page)
+
+#Import the convoluted neural network (cnn) deep learning model for OCR prediction.
+#My optimal model trained on 58 braille pages typed on 8 1/2" x 11" pages in landscape mode
+#on a Perkins Brailler. The model was trained using a batch size of 64, a learning rate of 0.005
+#and 3 epochs of training, yieling a validation accuracy of 99.9777% (about one error per 4,500 characters!).
+#The deep learning libraries are only imported when the model is loaded, so that the
+#other functions of the package (such as the transcription to printed English) can be
+#used without them. Every model is only loaded once per process, and then shared by
+#all of the documents processed afterwards (see "process_batch"). When line models are
+#enabled (with the "--line-model" option), the line model converted from the model (see
+#"convert_to_line_model") is loaded instead, from the same path followed by "-lines".
+#When student models are enabled (with the "--student-model" option), the smaller model
+#distilled from the model (see "create_student_model") is loaded instead, from the same path
+#followed by "-student" (and then by "-lines" for the line model converted from it).
+#When fine-tuned models are enabled (with the "--fine-tuned-model" option), the model whose
+#classification head was fine-tuned on another dataset (see "create_fine_tuned_model") is
+#loaded instead, from the same path followed by "-finetuned" (after "-student" and before
+#"-lines", when these are enabled as well).
+#When dot detection is enabled (with the "--dot-detection" option), the braille cells are
+#decoded from their dots whenever possible, and only the ambiguous ones are submitted to
+#the model (see "recognize_cells").
+loaded_models = {}
+model_settings = {"line_models": False, "student_models": False, "fine_tuned_models": False, "dot_detection": False}
+line_model_suffix = "-lines"
+student_model_suffix = "-student"
+fine_tuned_model_suffix = "-finetuned"
+def enable_line_models(enabled=True):
+    model_settings["line_models"] = enabled
+
+def enable_student_models(enabled=True):
+    model_settings["student_models"] = enabled
+
+def enable_fine_tuned_models(enabled=True):
+    model_settings["fine_tuned_models"] = enabled
+
+def enable_dot_detection(enabled=True):
+    model_settings["dot_detection"] = enabled
+
+def load_model(model_path):
+    if model_settings["student_models"]:
+        model_path += student_model_suffix
+    if model_settings["fine_tuned_models"]:
+        model_path += fine_tuned_model_suffix
+    if model_settings["line_models"]:
+        model_path += line_model_suffix
+    if model_path not in loaded_models:
+        start_time = start_stage()
+        from fastai.vision.all import load_learner
+        loaded_models[model_path] = load_learner(model_path)
+        record_stage("model_loading", start_time)
+    return loaded_models[model_path]
+
+#The fastai data loaders convert every batch of images with their batch transforms
+#("learn.dls.after_batch"): the pixels are converted to floats divided by 255 ("IntToFloatTensor")
+#and, for the models trained with it (such as those of "cnn_learner", with the statistics of
+#ImageNet), every color channel is normalized with a mean and a standard deviation ("Normalize").
+#These statistics are returned as lists (the mean and standard deviation being None without
+#normalization). The other batch transforms (such as data augmentation) only apply to training.
+#The item transforms ("learn.dls.after_item") are applied to every image before the batch
+#transforms. As the braille cells are submitted to the model directly (see "run_model"), only
+#the conversion of the images to tensors ("ToTensor") and the transforms that only apply to
+#training (whose "split_idx" is 0) are supported, and a "ValueError" is raised for any other item
+#transform (such as "Resize"), which would otherwise silently change the input of the model.
+def get_input_statistics(learn):
+    unsupported_transforms = [type(transform).__name__ for transform in getattr(learn.dls, "after_item", [])
+    if type(transform).__name__ != "ToTensor" and getattr(transform, "split_idx", None) != 0]
+    if unsupported_transforms != []:
+        raise ValueError("The item transforms of the model (" + ", ".join(unsupported_transforms) +
+        ") can't be applied when submitting the braille cells to the model directly.")
+    div, mean, std = 255., None, None
+    for transform in getattr(learn.dls, "after_batch", []):
+        if type(transform).__name__ == "IntToFloatTensor":
+            div = float(transform.div) if transform.div else 1.
+        elif type(transform).__name__ == "Normalize" and transform.mean is not None:
+            mean = [float(value) for value in transform.mean.reshape(-1)]
+            std = [float(value) for value in transform.std.reshape(-1)]
+    return div, mean, std
+
+#The function returned converts a batch of grayscale images (a torch uint8 tensor of shape
+#(images, height, width), on the "device" of the model) in one step to the float tensor expected
+#by the model of "learn": three identical color channels (as fastai opens the grayscale JPEG
+#images in RGB), converted with the batch transforms of its data loaders (see
+#"get_input_statistics"). The models trained from it (such as the student models, see
+#"create_student_model") are exported along with the same data loaders, and take the same input.
+def get_input_transform(learn, device):
+    import torch
+    div, mean, std = get_input_statistics(learn)
+    if mean is not None:
+        mean = torch.tensor(mean, device=device).reshape(1, -1, 1, 1)
+        std = torch.tensor(std, device=device).reshape(1, -1, 1, 1)
+    def transform_input(batch):
+        batch = batch[:, None].expand(-1, 3, -1, -1).float().div_(div)
+        if mean is not None:
+            batch = batch.sub_(mean).div_(std)
+        return batch
+    return transform_input
+
+#The grayscale images (a numpy array of shape (images, height, width)) are converted to the
+#input of the model (see "get_input_transform"), and the model is called directly on batches of
+#"batch_size" images, without going through the fastai data loaders. The "model" is that of the
+#learner "learn" unless another model taking the same input is given (such as a model being
+#trained). The category indices predicted for every image are returned as a numpy array (of shape
+#(images, 41) for the line models, which predict the category of every braille cell of a line),
+#or the raw outputs of the model (as a float numpy array) when "logits" is True. When
+#"probabilities" is True, the probabilities of every category are returned instead (the
+#softmax of the outputs of the model, as a float32 numpy array with the categories along
+#the last axis, of shape (images, categories), or (images, 41, categories) for the line models).
+inference_batch_size = 256
+def run_model(learn, images, batch_size=inference_batch_size, logits=False, probabilities=False, model=None):
+    import torch
+    if model is None:
+        model = learn.model
+    model = model.eval()
+    device = next(model.parameters()).device
+    transform_input = get_input_transform(learn, device)
+    outputs = []
+    with torch.no_grad():
+        for i in range(0, len(images), batch_size):
+            batch = transform_input(torch.from_numpy(images[i:i+batch_size]).to(device))
+            if logits:
+                outputs.append(model(batch).float().cpu().numpy())
+            elif probabilities:
+                outputs.append(torch.softmax(model(batch).float(), dim=1).movedim(1, -1).cpu().numpy())
+            else:
+                #Determine which is the category index for the argmax of the character one-hot vectors.
+                outputs.append(model(batch).argmax(dim=1).cpu().numpy())
+    return np.concatenate(outputs)
+
+#The cropped braille cells (numpy arrays of grayscale images, either as a list or as a single
+#array such as that returned by "gather_cells") are encoded as JPEG images in memory and decoded
+#again, just like the images of the training dataset, such that the model sees the same JPEG
+#artifacts as during training. The decoded braille cells are written to a single array of
+#shape (cells, height, width) ("round_trip_JPEG"), which is submitted to the model (see
+#"run_model"). The predicted category indices (see "learn.dls.vocab") are returned as a
+#numpy array, in the same order (or the probabilities of every category, when "probabilities"
+#is True).
+def round_trip_JPEG(cell_images):
+    cell_images = np.asarray(cell_images)
+    cell_images = cell_images.reshape((-1,) + cell_images.shape[-2:])
+    decoded_cell_images = np.empty_like(cell_images)
+    for i in range(len(cell_images)):
+        decoded_cell_images[i] = cv2.imdecode(cv2.imencode(".jpg", cell_images[i])[1], cv2.IMREAD_GRAYSCALE)
+    return decoded_cell_images
+
+def predict_cells(learn, cell_images, probabilities=False):
+    if len(cell_images) == 0:
+        return get_empty_predictions(learn, probabilities)
+    start_time = start_stage()
+    decoded_cell_images = round_trip_JPEG(cell_images)
+    record_stage("encoding", start_time, cells=len(decoded_cell_images))
+    start_time = start_stage()
+    preds_argmax = run_model(learn, decoded_cell_images, probabilities=probabilities)
+    record_stage("inference", start_time, cells=len(decoded_cell_images))
+    return preds_argmax
+
+def get_empty_predictions(learn, probabilities=False):
+    if probabilities:
+        return np.empty((0, len(learn.dls.vocab)), np.float32)
+    return np.empty(0, np.int64)
+
+#The line models (see "convert_to_line_model") are told apart from the models classifying
+#one braille cell at a time by the pitch of the braille cells, which is stored along with them.
+def is_line_model(learn):
+    return hasattr(learn.model, "cell_pitch")
+
+#The lines of braille cells (such as those returned by "gather_line_strips") are submitted
+#as they are to the line model, which classifies all of the braille cells of a line in a
+#single pass (there is no JPEG encoding, as the line model only sees whole lines). The
+#predicted category indices (or probabilities) are returned line by line, in the same order as
+#for "predict_cells".
+def predict_line_strips(learn, line_strips, probabilities=False):
+    if len(line_strips) == 0:
+        return get_empty_predictions(learn, probabilities)
+    start_time = start_stage()
+    preds_argmax = run_model(learn, np.asarray(line_strips), max(1, inference_batch_size//characters_per_line),
+    probabilities=probabilities)
+    record_stage("inference", start_time, cells=len(line_strips)*characters_per_line)
+    return preds_argmax.reshape((-1,) + preds_argmax.shape[2:])
+
+#The line models expect the braille cells to be spaced by the pitch with which they were
+#converted. Should the pitch of the braille cells of the page differ (see "calibrate_grid"),
+#the lines of braille cells are resized along the x axis to the length that they would have
+#with that pitch.
+def gather_model_line_strips(learn, image, chars_x_y_coordinates):
+    line_strips = gather_line_strips(image, chars_x_y_coordinates)
+    strip_length = (characters_per_line-1)*learn.model.cell_pitch + character_width + 2*crop_margin
+    if line_strips.shape[1] == strip_length:
+        return line_strips
+    return np.array([cv2.resize(line_strip, (line_strip.shape[1], strip_length), interpolation=cv2.INTER_AREA)
+    for line_strip in line_strips]).reshape(len(line_strips), strip_length, line_strips.shape[2])
+
+#The images submitted to the model for a page are either its braille cells (as a numpy array
+#of shape (cells, height, width)) or, for the line models, its lines of braille cells (see
+#"gather_model_line_strips"). The predicted category indices are obtained with "predict_inputs".
+def gather_inputs(learn, image, chars_x_y_coordinates):
+    if is_line_model(learn):
+        return gather_model_line_strips(learn, image, chars_x_y_coordinates)
+    cell_images = gather_cells(image, chars_x_y_coordinates)
+    return cell_images.reshape((-1,) + cell_images.shape[2:])
+
+def predict_inputs(learn, inputs, probabilities=False):
+    if is_line_model(learn):
+        return predict_line_strips(learn, inputs, probabilities)
+    return predict_cells(learn, inputs, probabilities)
+
+#The labels predicted for the braille cells are returned in the same order.
+def classify_cells(learn, cell_images):
+    preds_argmax = predict_cells(learn, cell_images)
+    #Convert the category index for each character to its label and assemble
+    #a list of labels by list comprehension.
+    character_list = [learn.dls.vocab[preds_argmax[i]] for i in range(len(preds_argmax))]
+
+    #If you want to print out the dictionary mapping the labels to the label
+    #indices, uncomment the following line:
+    # print(learn.dls.vocab.o2i)
+    return character_list
+
+#The Unicode code points of the braille cells are looked up from the category indices predicted
+#by the model with a numpy array mapping every index of the vocabulary to the code point of its
+#label. The labels that were written in long form for compatibility reasons ("empty_braille_cell")
+#are mapped to an actual empty braille cell "⠀". The array is only built once per vocabulary.
+cell_lookups = {}
+def get_cell_lookup(vocab):
+    vocab = tuple(vocab)
+    if vocab not in cell_lookups:
+        cell_lookups[vocab] = np.array([ord("⠀") if label == "empty_braille_cell" else ord(label)
+        for label in vocab], np.uint32)
+    return cell_lookups[vocab]
+
+#The runs of successive True values of the boolean array "mask" are returned as the arrays of
+#their starting indices and of their lengths.
+def get_runs(mask):
+    changes = np.flatnonzero(np.diff(np.concatenate([[False], mask, [False]]).astype(np.int8)))
+    return changes[::2], changes[1::2] - changes[::2]
+
+#The first "counts" elements of every run (given by its starting index "starts") are flagged
+#in a boolean array of length "length", the runs being separated by at least one element.
+def flag_run_prefixes(length, starts, counts):
+    boundaries = np.zeros(length + 1, np.int8)
+    boundaries[starts] += 1
+    boundaries[starts + counts] -= 1
+    return np.cumsum(boundaries[:-1]) > 0
+
+#The Unicode code points of the braille cells of a page (41 per line) are assembled into the
+#braille text of the page ("current_page_string", see "assemble_page_string"), working on the
+#whole numpy array at once. The indices of the braille cells that are kept in the braille text
+#are returned by "select_page_cells", in order (for example, to align the braille cells with
+#the proofread braille text, see "align_page_cells").
+def select_page_cells(cells):
+    cells = np.asarray(cells, np.uint32).reshape(-1, 41)
+    if len(cells) == 0:
+        return np.empty(0, np.int64)
+    empty_cells = cells == ord("⠀")
+    #As the character cropping continued until the end of every line whether or not
+    #it still contained characters, there could be a series of superfluous spaces
+    #at the end of a line. That is to say, if a line contains less than 41 actual
+    #braille characters (not empty braille cells), there will be one or more superfluous
+    #empty braille cells at the end of it. There is no need to use the line continuation
+    #with or without space braille symbols, as the code will automatically append the
+    #contents of the next line to the previous line.
+    #All but one of the empty braille cells are removed from the lines that end with more
+    #than one successive empty braille cell. For example, if there are three empty braille
+    #cells at the end of a line, only one will remain. The lines comprised only of empty
+    #braille cells are left as they are (and removed below as instances of 41 successive
+    #empty braille cells), unless the line before them ends with a braille character,
+    #in which case a single empty braille cell remains to separate them from the next line.
+    #The index of the last braille character among the first 40 cells of every line is
+    #found by looking for the first one from the end (-1 if there isn't any).
+    last_characters = 39 - np.argmax(~empty_cells[:, 39::-1], axis=1)
+    last_characters[empty_cells[:, :40].all(axis=1)] = -1
+    previous_line_ends = np.concatenate([[False], ~empty_cells[:-1, 40]])
+    trimmed_lines = empty_cells[:, 39] & empty_cells[:, 40] & ((last_characters >= 0) | previous_line_ends)
+    cell_indices = np.arange(41)
+    superfluous_cells = (trimmed_lines[:, None] & (cell_indices > last_characters[:, None])
+    & (cell_indices < 40))
+    kept_cells = np.flatnonzero(~superfluous_cells)
+    cells = cells.reshape(-1)
+
+    #Instances of 41 successive empty braille cells are then removed (as many times as they
+    #fit in every run of empty braille cells), which removes any empty lines left above.
+    starts, lengths = get_runs(cells[kept_cells] == ord("⠀"))
+    kept_cells = kept_cells[~flag_run_prefixes(len(kept_cells), starts, lengths - lengths%41)]
+
+    #Any instances of at least two successive full braille cells
+    #(denoting typos) are then removed.
+    starts, lengths = get_runs(cells[kept_cells] == ord("⠿"))
+    return kept_cells[~flag_run_prefixes(len(kept_cells), starts, np.where(lengths > 1, lengths, 0))]
+
+def assemble_page_string(cells):
+    cells = np.asarray(cells, np.uint32).reshape(-1)
+    current_page_string = cells[select_page_cells(cells)].astype("<u4").tobytes().decode("utf-32-le")
+
+    #The line continuations with a space braille symbols ("⠐⠐") are changed for a space,
+    #The spaces need to be added after removal of the superfluous spaces (code directly above),
+    #otherwise they wouldn't be retained. As the code already stitches any given line to the
+    #contents of the preceding line, line continuations without spaces ("⠐") shouldn't be used
+    #in the current application, as these would lead to confusion with other braille characters,
+    #such as intial-letter contractions.
+    #The line continuation braille symbols with spaces need to be removed, as the PEF file will
+    #likely not have the same margins as the Perkins Brailler and as they are irrelevant in the
+    #printed English RTF document.
+    current_page_string.replace("⠐⠐", "⠀")
+    return current_page_string
+
+#The labels predicted for the braille cells of a page are assembled into the braille
+#text of the page ("current_page_string", see "assemble_page_string").
+def get_page_string(character_list):
+    return assemble_page_string([ord("⠀") if label == "empty_braille_cell" else ord(label)
+    for label in character_list])
+
+#The category indices predicted by the model for the braille cells flagged in the boolean
+#array "cell_mask" are returned. Only the lines holding at least one of them are gathered,
+#and submitted as a whole to the line models. The "predict" function takes the inputs of
+#the model and the number of braille cells that they hold (see "recognize_cells"), and may
+#return the probabilities of every category instead of the category indices.
+def predict_cell_subset(learn, image, chars_x_y_coordinates, cell_mask, predict, probabilities=False):
+    line_mask = cell_mask.reshape(-1, characters_per_line).any(axis=1)
+    line_cell_mask = cell_mask.reshape(-1, characters_per_line)[line_mask]
+    if len(line_cell_mask) == 0:
+        return get_empty_predictions(learn, probabilities)
+    line_chars_x_y_coordinates = [chars_x_y_coordinates[i] for i in range(len(chars_x_y_coordinates))
+    if line_mask[i//characters_per_line]]
+    if is_line_model(learn):
+        preds_argmax = predict(gather_model_line_strips(learn, image, line_chars_x_y_coordinates),
+        line_cell_mask.size)
+        return preds_argmax.reshape(line_cell_mask.shape + preds_argmax.shape[1:])[line_cell_mask]
+    cell_images = gather_cells(image, line_chars_x_y_coordinates)[line_cell_mask]
+    return predict(cell_images, len(cell_images))
+
+#A few of the braille cells decoded from their dots are checked against the predictions of the
+#model on every page ("verification_cell_count" of those with dots, and as many of those decoded
+#as empty braille cells, should a dot have been missed), and more of those with dots are used to
+#find the dot numbering on the first page ("calibration_cell_count", see "dot_numberings"). The dot numbering
+#is only kept if it agrees with the model for at least "min_calibration_agreement" of the braille
+#cells, and it is then stored on the learner ("calibrated_dot_numbering"), such that it is used
+#for all of the pages processed afterwards with the same model, and goes away along with it.
+verification_cell_count = 8
+calibration_cell_count = 82
+min_calibration_agreement = 0.95
+
+#The "top_k" most probable braille cells of every braille cell (in decreasing order of probability)
+#are returned as the offsets of their Unicode code points from U+2800 (a uint8 numpy array of shape
+#(cells, top_k)), along with their probabilities (a float16 numpy array of the same shape), from
+#the probabilities of every category predicted by the model (see "run_model").
+def get_top_cells(cell_probabilities, cell_lookup, top_k):
+    top_categories = np.argsort(-cell_probabilities, axis=1, kind="stable")[:, :top_k]
+    return ((cell_lookup[top_categories] - ord("⠀")).astype(np.uint8),
+    np.take_along_axis(cell_probabilities, top_categories, 1).astype(np.float16))
+
+#The Unicode code points of the braille cells of a page are returned as a numpy array. The
+#"predict" function submits the inputs of the model ("gather_inputs") holding a given number
+#of braille cells to the model and returns the predicted category indices (by default, see
+#"predict_inputs"). With dot detection, the braille cells are decoded from the positions of
+#their dots (see "detect_dots"), and only the ambiguous braille cells are submitted to the
+#model, along with a few braille cells for which the decoded dots are checked against the
+#predictions of the model. Should any of them disagree (or the dot numbering be unknown),
+#all of the braille cells of the page are submitted to the model. When "top_k" is above zero,
+#the "predict" function returns the probabilities of every category instead, and the "top_k"
+#most probable braille cells of every braille cell are returned along with the code points,
+#with their probabilities (see "get_top_cells"). The braille cells decoded from their dots are
+#given a probability of one.
+def recognize_cells(learn, image, chars_x_y_coordinates, predict=None, top_k=0):
+    cell_lookup = get_cell_lookup(learn.dls.vocab)
+    if predict == None:
+        def predict(inputs, cell_count):
+            return predict_inputs(learn, inputs, top_k > 0)
+    cell_probabilities = np.zeros((len(chars_x_y_coordinates), len(cell_lookup)), np.float32)
+    model_cells = np.ones(len(chars_x_y_coordinates), np.bool_)
+
+    #The code points of the braille cells flagged in "cell_mask" are looked up from the
+    #predictions of the model, keeping their probabilities when "top_k" is above zero.
+    def lookup_cells(preds_argmax, cell_mask):
+        if top_k > 0:
+            cell_probabilities[cell_mask] = preds_argmax
+            preds_argmax = preds_argmax.argmax(axis=1)
+        return cell_lookup[preds_argmax]
+
+    if not model_settings["dot_detection"]:
+        start_time = start_stage()
+        inputs = gather_inputs(learn, image, chars_x_y_coordinates)
+        record_stage("cropping", start_time, cells=len(chars_x_y_coordinates))
+        code_points = lookup_cells(predict(inputs, len(chars_x_y_coordinates)), model_cells)
+    else:
+        code_points = recognize_cells_with_dots(learn, image, chars_x_y_coordinates, predict, top_k > 0,
+        lookup_cells, model_cells)
+    if top_k == 0:
+        return code_points
+    top_cells, top_probabilities = get_top_cells(cell_probabilities, cell_lookup, top_k)
+    top_cells[~model_cells] = 0
+    top_cells[~model_cells, 0] = code_points[~model_cells] - ord("⠀")
+    top_probabilities[~model_cells] = 0
+    top_probabilities[~model_cells, 0] = 1
+    return code_points, top_cells, top_probabilities
+
+#The braille cells are recognized with dot detection (see "recognize_cells"). The code points
+#of the braille cells submitted to the model are looked up by "lookup_cells", and those of the
+#other braille cells are decoded from their dots, which are flagged as False in "model_cells".
+def recognize_cells_with_dots(learn, image, chars_x_y_coordinates, predict, probabilities, lookup_cells,
+model_cells):
+    start_time = start_stage()
+    dot_positions, ambiguous_cells = detect_dots(image, chars_x_y_coordinates)
+    dot_numbering = getattr(learn, "calibrated_dot_numbering", None)
+    if dot_numbering == None:
+        sample_size = calibration_cell_count
+    else:
+        sample_size = verification_cell_count
+    #The sample of braille cells is spread evenly over the unambiguous braille cells with dots,
+    #and over those without any dots (which are only used to check the decoded braille cells).
+    dotted_cells = dot_positions.any(axis=(1, 2))
+    def spread_sample(candidate_cells, sample_size):
+        return candidate_cells[np.linspace(0, len(candidate_cells) - 1,
+        min(sample_size, len(candidate_cells))).astype(np.int64)]
+    dotted_sample_cells = spread_sample(np.flatnonzero(~ambiguous_cells & dotted_cells), sample_size)
+    sample_cells = np.concatenate([dotted_sample_cells,
+    spread_sample(np.flatnonzero(~ambiguous_cells & ~dotted_cells), verification_cell_count)])
+    model_cells[:] = ambiguous_cells
+    model_cells[sample_cells] = True
+    record_stage("dot_detection", start_time, cells=len(chars_x_y_coordinates),
+    ambiguous_cells=int(ambiguous_cells.sum()))
+
+    code_points = np.empty(len(chars_x_y_coordinates), np.uint32)
+    code_points[model_cells] = lookup_cells(predict_cell_subset(learn, image, chars_x_y_coordinates,
+    model_cells, predict, probabilities), model_cells)
+    if dot_numbering == None and len(dotted_sample_cells) >= verification_cell_count:
+        agreements = [np.mean(decode_dot_positions(dot_positions[dotted_sample_cells], candidate_numbering) ==
+        code_points[dotted_sample_cells]) for candidate_numbering in dot_numberings]
+        if max(agreements) >= min_calibration_agreement:
+            dot_numbering = dot_numberings[int(np.argmax(agreements))]
+            learn.calibrated_dot_numbering = dot_numbering
+    if dot_numbering == None or (decode_dot_positions(dot_positions[sample_cells], dot_numbering) !=
+    code_points[sample_cells]).any():
+        other_cells = ~model_cells
+        code_points[other_cells] = lookup_cells(predict_cell_subset(learn, image, chars_x_y_coordinates,
+        other_cells, predict, probabilities), other_cells)
+        model_cells[:] = True
+    else:
+        code_points[~model_cells] = decode_dot_positions(dot_positions[~model_cells], dot_numbering)
+    return code_points
+
+#The braille text of a page is obtained from the numpy array of its grayscale image
+#and returned along with the braille character coordinates (see "segment_page"), which
+#are moved to the calibrated grid with grid calibration (see "calibrate_grid"). When "top_k"
+#is above zero, the confidences of the braille cells are also returned, as a dictionary of
+#numpy arrays with one row per line and one column per braille cell of the line: the "top_k"
+#most probable braille cells ("cells") and their probabilities ("probabilities", see
+#"recognize_cells"), and the position of every braille cell within the braille text of the
+#page ("positions", -1 for the braille cells left out of it, see "select_page_cells").
+def recognize_page(learn, image, x_min=first_character_x_min, top_k=0):
+    start_time = start_stage()
+    chars_x_y_coordinates = segment_page(image, x_min)
+    record_stage("segmentation", start_time, pages=1, lines=len(chars_x_y_coordinates)//41)
+    chars_x_y_coordinates = calibrate_grid(image, chars_x_y_coordinates)
+    if top_k == 0:
+        code_points = recognize_cells(learn, image, chars_x_y_coordinates)
+    else:
+        code_points, top_cells, top_probabilities = recognize_cells(learn, image, chars_x_y_coordinates, None, top_k)
+    start_time = start_stage()
+    current_page_string = assemble_page_string(code_points)
+    record_stage("post_processing", start_time, cells=len(code_points))
+    if top_k == 0:
+        return current_page_string, chars_x_y_coordinates
+    positions = np.full(len(code_points), -1, np.int32)
+    kept_cells = select_page_cells(code_points)
+    positions[kept_cells] = np.arange(len(kept_cells))
+    line_shape = (-1, characters_per_line)
+    return current_page_string, chars_x_y_coordinates, {"cells": top_cells.reshape(line_shape + top_cells.shape[1:]),
+    "probabilities": top_probabilities.reshape(line_shape + top_probabilities.shape[1:]),
+    "positions": positions.reshape(line_shape)}
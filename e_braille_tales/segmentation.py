@@ -0,0 +1,243 @@
+import threading
+import cv2
+import numpy as np
+
+'''CHARACTER WIDTH AND SPACING PARAMETERS'''
+#The "character_width" and "character_height" parameters were
+#based on the pixel counts for the braille cells in the JPEG
+#images scanned at a resolution of 300 dpi. The braille cells of
+#a line are separated by "character_spacing" pixels, and up to
+#41 braille cells ("characters_per_line") can be typed on a line
+#of a 8 1/2" by 11" page in landscape mode on a Perkins Brailler.
+character_width = 60
+character_height = 90
+character_spacing = 12
+characters_per_line = 41
+#The minimum x pixel at which the first braille cell begins in each line
+#(see "x_min" below and "Figure 1 (explanation of x_min).png").
+first_character_x_min = 282
+#The braille cells are cropped with a margin of 10 pixels on every side.
+crop_margin = 10
+
+#The non-white pixels (!= 255) of the page are flagged in a boolean mask (one byte per pixel),
+#and then counted along the 0 axis by "cv2.reduce" (as the page is in landscape mode), which
+#gives the number of non-white pixels along the x axis for every y coordinate. The mask is
+#kept from one page to the next (in every thread, as the pages may be processed concurrently
+#by the server), such that it is only allocated again when the size of the pages changes.
+segmentation_buffers = threading.local()
+def count_non_white_pixels(image):
+    mask = getattr(segmentation_buffers, "mask", None)
+    if mask is None or mask.shape != image.shape:
+        mask = np.empty(image.shape, np.bool_)
+        segmentation_buffers.mask = mask
+    np.not_equal(image, 255, out=mask)
+    return cv2.reduce(mask.view(np.uint8), 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S)[0]
+
+#The function "segment_page" takes the numpy array of a grayscale JPEG image of a page of
+#scanned braille text written using a Perkins Brailler, at 300 dpi resolution and with
+#the smallest possible left margin on a 8 1/2" by 11" page typed in landscape mode.
+#It returns the braille character coordinates, line by line from the top of the page.
+#Importantly, the page must be scanned with the left margin placed in such a way that the
+#shadows produced by the scanner light will face away from the left margin (the shadows will
+#face the right margin of the page, then the page is viewed in landscape mode). This is
+#because the non-white pixels actually result from the presence of shadows, the orientation
+#of which plays a major role in image segmentation (determining the x and y coordinates
+#of the individual characters) and optical character recognition (OCR). For best results,
+#the braille document should be typed on white braille paper or cardstock and scanned as
+#grayscale images on a flatbed scanner at a 300 dpi resolution with the paper size setting
+#of the scanner set to letter 8 1/2" x 11" (A4). The darkness settings of the scanner might
+#also need to be adjusted to acheive an optimal braille shadow to noise ratio.
+def segment_page(image, x_min=first_character_x_min):
+    #Since the braille pages are typed in landscape mode the "imgheight" is actually
+    #the width of the page (shape[1]) as it would be layed out for reading.
+    imgheight=image.shape[1]
+    imgwidth=image.shape[0]
+    lines_y_min_maxes = [[]]
+    #The number of non-white pixels along the x axis is determined for every y coordinate
+    #(see "count_non_white_pixels" above), only once for all of the cutoffs below. The
+    #y coordinates where the number of non-white pixels exceed 30 are extracted
+    #using the np.where() function, which gives the indices (y pixel numbers) in the
+    #original version of the array y_pixels where there are at least 30 non white pixels,
+    #along the x axis.
+    non_white_pixel_counts = count_non_white_pixels(image)
+    #The cutoff corresponds to the required amount of non-white pixels after summation
+    #of the values along the x axis, for a given y coordinate to be included in the numpy
+    #array "y_pixels". As the non-white pixels actually result from the shadows of the
+    #embossed braille characters, the segmentation results vary greatly from scanner to
+    #scanner. The optimization of the cutoff allows for the segmentation to be more
+    #generalizable. For best segmentation results, this process is repeated for every JPEG
+    #image in the list "JPEG_file_names".
+    cutoff_results = []
+    for cutoff in range(30,300,10):
+        #Here axis 0 is used for the "y_pixels", as the page was written in landscape mode,
+        #but scanned in portrait mode. The non-white x pixels (in landscape mode) were counted
+        #for every y pixel (in landscape mode) within the image.
+        y_pixels = np.where(non_white_pixel_counts > cutoff)[0]
+        lines_y_min_maxes = []
+        #Only the y pixels that are followed by a gap of more than 15 pixels (found
+        #with np.diff) are looked at, instead of every y pixel of the "y_pixels" array.
+        #If the difference in pixel numbers between the curent and the next
+        #y pixel in the "y_pixels" array is over 15 pixels (indicating a new line,
+        #as dots within a braille cell would be within 15 pixels), then the line
+        #is considered for inclusion in the "lines_y_min_maxes" list. As all braille
+        #cells have the same height (around 90 pixels), the minimum y value can be found
+        #by subtracting  "character_height" from the pixel number of the current
+        #y pixel ("y_pixels[k]").
+        for k in np.flatnonzero(np.diff(y_pixels) > 15):
+            #The "if" statement excludes detected lines if they are overlapping with
+            #the upper or lower borders of the page. The scanned image might have darkened
+            #edges, as the scanner plate is larger than the page. Also, the "if" statement
+            #excludes overlapping lines (of which the difference between the y minima is less
+            #than "character_height"). "y_pixels[k] - 2*character_height" comes from
+            #subtracting the "character_height" from the line y minimum, which is equal to
+            #"y_pixels[k] - character_height". "(y_pixels[k]-character_height)-lines_y_min_maxes[-1][0]"
+            #refers to the difference between the y minima of the pixel under investigation at
+            #index "i" of "y_pixels" and that of the last y pixel included in the list
+            #"lines_y_min_maxes". If the difference is less than "character_height",
+            #then the lines are overlapping and y_pixels[k] is therefore not
+            #included in the list "lines_y_min_maxes".
+            if (y_pixels[k] - 2*character_height <= 0 or y_pixels[k] + character_height >= imgheight or
+            len(lines_y_min_maxes) > 0 and
+            (y_pixels[k]-character_height)-lines_y_min_maxes[-1][0] < character_height):
+                pass
+            else:
+                lines_y_min_maxes.append([y_pixels[k] - character_height, y_pixels[k]])
+        #A maximum of 19 lines can be written in landscape mode on a 8 1/2" by 11" (A4)
+        #sheet of paper on a Perkins brailler. Only the cutoff values for lists
+        #"lines_y_min_maxes" with a maximum of 19 elements will thus be included in
+        #the list "cutoff_results".
+        if len(lines_y_min_maxes) <= 19:
+            cutoff_results.append([len(lines_y_min_maxes), cutoff])
+
+    #As the cutoff value increases, the number of y pixels above the threshold
+    #(having a sum of non-white pixels along the x axis for a given y coordinate
+    #above the cutoff value) will be more scarce. This effectively results in a
+    #decreased number of y coordinates in the array "y_pixels" that can be compared
+    #to the last entry in order to determine whether the y coordinate will
+    #constitute the start of a new line. Also, the same maximal amount of lines
+    #found during segmentation (up to a maximum of 19 lines) could be observed
+    #at several different cutoff values. Consequently, particularly when analyzing
+    #images with very faint shadows, the lowest cutoff value associated with the
+    #maximal amount of elements in the "lines_y_min_maxes" list should be selected.
+    #The lowest cutoff value will likely give better segmentation results, as it is based on
+    #more y coordinates to start with, effectively increasing the resolution of the
+    #segmentation.
+    cutoff_results = sorted(cutoff_results)
+    max_number_of_lines = max([cutoff_result[0] for cutoff_result in cutoff_results])
+    cutoff = next(cutoff_result for cutoff_result in cutoff_results if cutoff_result[0] == max_number_of_lines)[1]
+
+    y_pixels = np.where(non_white_pixel_counts > cutoff)[0]
+    lines_y_min_maxes = []
+    #If the difference between the pixel numbers between the curent and the next
+    #y pixel in the "y_pixels" array is over 15 pixels (indicating a new line,
+    #as dots within a braille cell would be within 15 pixels), then the line
+    #is registered in the "lines_y_min_maxes" list. As all braille cells have
+    #the same height (around 90 pixels), the minimum y value can be found
+    #by subtracting  "character_height" from the pixel number of the current
+    #y pixel ("y_pixels[l]").
+    for l in np.flatnonzero(np.diff(y_pixels) > 15):
+        if (y_pixels[l] - 2*character_height <= 0 or y_pixels[l] + character_height >= imgheight or
+        len(lines_y_min_maxes) > 0 and
+        (y_pixels[l]-character_height)-lines_y_min_maxes[-1][0] < character_height):
+            pass
+        else:
+            lines_y_min_maxes.append([y_pixels[l] - character_height, y_pixels[l]])
+
+    characters_x_min_maxes = []
+    #The minimum x pixel "x_min" defaults to 282, which is the x pixel (in landscape mode,
+    #in an image scanned at 300 dpi in portrait mode, with the left margin facing up) at which
+    #the first braille cell begins in each line, with the left margin set at its minimal setting
+    #on the Perkins Brailler.
+    for _ in range(characters_per_line):
+        characters_x_min_maxes.append([x_min, x_min + character_width])
+        x_min += character_width + character_spacing
+
+    chars_x_y_coordinates = []
+    #This loop is proceeding in reverse order, as the origin of the scanned image (0,0 x, y coordinates)
+    #lies at the bottom of the page. In order for the characters to be cropped line by line starting from
+    #the top of the page, the loop needs to begin from the end of the "lines_y_min_maxes" list.
+    for m in range (len(lines_y_min_maxes)-1, -1, -1):
+        #The "if" statement excludes detected characters if they are overlapping with the upper or lower borders
+        #of the page. The scanned image might have darkened edges, as the scanner plate is larger than the page.
+        #Also, the "if" statement excludes overlapping lines (of which the difference between the y minima is less
+        #than "character_height").
+        line_index = lines_y_min_maxes.index(lines_y_min_maxes[m])
+        if ((lines_y_min_maxes[m][0] - character_height <= 0 or
+        lines_y_min_maxes[m][1] + character_height >= imgheight) or
+        (line_index > 0 and lines_y_min_maxes[m][0]-lines_y_min_maxes[line_index-1][0] < character_height)):
+            pass
+        #Otherwise, the list "chars_x_y_coordinates" is populated with the character coordinates,
+        #in the form [[x min, y min], [x max, y max]].
+        else:
+            for character_x_min_max in characters_x_min_maxes:
+                (chars_x_y_coordinates.append([[character_x_min_max[0], lines_y_min_maxes[m][0]],
+                [character_x_min_max[1], lines_y_min_maxes[m][1]]]))
+
+    return chars_x_y_coordinates
+
+
+#Drawing the rectangles in green on a copy of the image, to be saved in the "Page image files
+#with rectangles" folder to check whether the coordinates of the characters line up well. When
+#drawing the character rectangles, the y coordinates are given before the x coordinates, as the
+#image was written in landscape mode but scanned in portrait mode. The lines of the rectangles
+#are "thickness" pixels wide.
+def draw_character_rectangles(image, chars_x_y_coordinates, thickness=3):
+    image_with_rectangles = image.copy()
+    for char_x_y_coordinates in chars_x_y_coordinates:
+        (cv2.rectangle(image_with_rectangles, (char_x_y_coordinates[0][1], char_x_y_coordinates[0][0]),
+        (char_x_y_coordinates[1][1], char_x_y_coordinates[1][0]), (0,255,0),thickness))
+    return image_with_rectangles
+
+#The individual braille cells are cropped from the grayscale image (with a margin of
+#"crop_margin" pixels) in order to be submitted to the model for prediction.
+def crop_cells(image, chars_x_y_coordinates):
+    return [image[char_x_y_coordinates[0][0]-crop_margin:char_x_y_coordinates[1][0]+crop_margin,
+    char_x_y_coordinates[0][1]-crop_margin:char_x_y_coordinates[1][1]+crop_margin]
+    for char_x_y_coordinates in chars_x_y_coordinates]
+
+#The braille cells of a page are gathered (with the same margin of "crop_margin" pixels as in
+#"crop_cells") into a single numpy array of shape (lines, 41, height, width), ready to be
+#submitted to the model as a batch. As the braille cells of a line are evenly spaced, every
+#line is seen as a strided view of the image (the view moving by one braille cell pitch from
+#one cell to the next), which is copied in one step, instead of copying every braille cell
+#on its own and then stacking them. A "ValueError" is raised if a braille cell (and its
+#margin) lies outside of the image, as the strided view isn't checked against its bounds.
+def gather_cells(image, chars_x_y_coordinates):
+    line_count = len(chars_x_y_coordinates)//characters_per_line
+    cell_width = character_width + 2*crop_margin
+    cell_height = character_height + 2*crop_margin
+    cells = np.empty((line_count, characters_per_line, cell_width, cell_height), image.dtype)
+    if line_count == 0:
+        return cells
+    x_min = chars_x_y_coordinates[0][0][0] - crop_margin
+    pitch = chars_x_y_coordinates[1][0][0] - chars_x_y_coordinates[0][0][0]
+    stride_0, stride_1 = image.strides
+    for i in range(line_count):
+        y_min = chars_x_y_coordinates[i*characters_per_line][0][1] - crop_margin
+        if (x_min < 0 or y_min < 0 or x_min + (characters_per_line-1)*pitch + cell_width > image.shape[0]
+        or y_min + cell_height > image.shape[1]):
+            raise ValueError("The braille cells of line " + str(i+1) + " lie outside of the image.")
+        cells[i] = np.lib.stride_tricks.as_strided(image[x_min:, y_min:], (characters_per_line, cell_width, cell_height),
+        (pitch*stride_0, stride_0, stride_1), writeable=False)
+    return cells
+
+#The lines of braille cells are gathered (with the same margin of "crop_margin" pixels around
+#the braille cells of every line) into a single numpy array of shape (lines, length, height),
+#in order to be submitted to a line model (see "convert_to_line_model"), which classifies
+#all of the braille cells of a line at once. A "ValueError" is raised if a line (and its
+#margin) lies outside of the image.
+def gather_line_strips(image, chars_x_y_coordinates):
+    line_count = len(chars_x_y_coordinates)//characters_per_line
+    if line_count == 0:
+        return np.empty((0, (characters_per_line-1)*(character_width + character_spacing) + character_width +
+        2*crop_margin, character_height + 2*crop_margin), image.dtype)
+    x_min = chars_x_y_coordinates[0][0][0] - crop_margin
+    x_max = chars_x_y_coordinates[characters_per_line-1][1][0] + crop_margin
+    strips = np.empty((line_count, x_max - x_min, character_height + 2*crop_margin), image.dtype)
+    for i in range(line_count):
+        y_min = chars_x_y_coordinates[i*characters_per_line][0][1] - crop_margin
+        strip = image[max(0, x_min):x_max, max(0, y_min):y_min + strips.shape[2]]
+        if strip.shape != strips.shape[1:]:
+            raise ValueError("The braille cells of line " + str(i+1) + " lie outside of the image.")
+        strips[i] = strip
+    return strips
@@ -0,0 +1,212 @@
+import json
+import queue
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+
+from .calibration import calibrate_grid
+from .document import braille_to_format, writers
+from .pipeline import decode_grayscale_JPEG
+from .preview import parse_region, recognize_region
+from .recognition import assemble_page_string, predict_inputs, recognize_cells
+from .segmentation import first_character_x_min, segment_page
+
+#The braille cells of the pages submitted concurrently to the server are classified
+#together by a single inference thread, which owns the model. Every request adds its
+#cropped braille cells (or its lines of braille cells for the line models, see
+#"gather_inputs") to the queue and waits for its predictions. The inference thread
+#takes the first request in the queue and then waits up to "max_wait" seconds for
+#other requests to join it (up to a total of "max_batch_cells" braille cells), such
+#that the model handles one large batch instead of many smaller ones when several
+#pages are submitted at the same time. A page on its own is only delayed by "max_wait".
+class InferenceBatcher:
+    def __init__(self, learn, max_batch_cells=2048, max_wait=0.01):
+        self.learn = learn
+        self.max_batch_cells = max_batch_cells
+        self.max_wait = max_wait
+        self.requests = queue.Queue()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    #The predicted category indices of the "cell_count" braille cells of the "inputs" are
+    #returned (see "predict_inputs"), along with the timings of the request ("queue" is the
+    #time spent waiting for the batch to start and "inference" the time taken by the model
+    #to classify the whole batch) and the size of the batch.
+    def classify(self, inputs, cell_count):
+        request = {"inputs": inputs, "cells": cell_count, "done": threading.Event(), "submitted": time.perf_counter()}
+        self.requests.put(request)
+        request["done"].wait()
+        if "error" in request:
+            raise request["error"]
+        return request["preds_argmax"], request["timings"], request["batch"]
+
+    def run(self):
+        while True:
+            batch_requests = [self.requests.get()]
+            batch_cells = batch_requests[0]["cells"]
+            deadline = time.perf_counter() + self.max_wait
+            while batch_cells < self.max_batch_cells:
+                try:
+                    request = self.requests.get(timeout=max(0, deadline - time.perf_counter()))
+                except queue.Empty:
+                    break
+                batch_requests.append(request)
+                batch_cells += request["cells"]
+
+            start_time = time.perf_counter()
+            try:
+                inputs = np.concatenate([request["inputs"] for request in batch_requests])
+                preds_argmax = predict_inputs(self.learn, inputs)
+            except Exception as error:
+                for request in batch_requests:
+                    request["error"] = error
+                    request["done"].set()
+                continue
+            end_time = time.perf_counter()
+
+            label_index = 0
+            for request in batch_requests:
+                request["preds_argmax"] = preds_argmax[label_index:label_index + request["cells"]]
+                label_index += request["cells"]
+                request["timings"] = {"queue": start_time - request["submitted"], "inference": end_time - start_time}
+                request["batch"] = {"pages": len(batch_requests), "cells": batch_cells}
+                request["done"].set()
+
+#The media types of the output formats (the other formats are sent as plain text).
+content_types = {"rtf": "application/rtf", "pef": "application/x-pef+xml"}
+
+#The server answers the following requests (the connections are kept alive between requests):
+#- POST /ocr with the bytes of a JPEG image of a braille page returns a JSON object with the
+#  braille text of the page ("cells"), the timings of the request in seconds ("timings") and
+#  the size of the inference batch that the page was part of ("batch").
+#- POST /preview?line=LINE_NUMBER or /preview?region=Y_MIN:Y_MAX with the bytes of a JPEG image
+#  of a braille page only submits the line of braille cells "LINE_NUMBER" (starting at 1 from the
+#  top of the page, or at -1 from the bottom) or the lines found in the region of interest to OCR
+#  (see "recognize_region"), and returns a JSON object with their braille text ("cells"), its
+#  transcription to printed English ("text"), the y coordinates of the lines ("lines"), the
+#  timings of the request ("timings") and the size of the inference batch ("batch").
+#- POST /rtf, /pef, /brf or /txt (any of the output formats, see "writers") with braille text
+#  (UTF-8) returns the contents of the corresponding output file.
+#The timings of every request are also reported in the "Server-Timing" header (in milliseconds).
+class RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "e-Braille-Tales"
+
+    def do_POST(self):
+        start_time = time.perf_counter()
+        request_body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        url = urllib.parse.urlsplit(self.path)
+        route = url.path.strip("/")
+        try:
+            if route in ["ocr", "preview"]:
+                if route == "ocr":
+                    response = self.server.ocr_page(request_body)
+                else:
+                    response = self.server.preview_region(request_body, urllib.parse.parse_qs(url.query))
+                response["timings"]["total"] = time.perf_counter() - start_time
+                self.send_body(200, "application/json", json.dumps(response, ensure_ascii=False), response["timings"])
+            elif route in writers:
+                contents = braille_to_format(request_body.decode("utf-8").replace("\n", ""), route)
+                self.send_body(200, content_types.get(route, "text/plain"), contents,
+                {"transcription": time.perf_counter() - start_time}, writers[route][1])
+            else:
+                self.send_body(404, "text/plain", "Unknown request: " + self.path + "\n")
+        except ValueError as error:
+            self.send_body(400, "text/plain", str(error) + "\n")
+        except Exception as error:
+            self.send_body(500, "text/plain", repr(error) + "\n")
+
+    def send_body(self, status, content_type, contents, timings=None, encoding="utf-8"):
+        body = contents.encode(encoding, "replace")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type + "; charset=" + encoding)
+        self.send_header("Content-Length", str(len(body)))
+        if timings != None:
+            self.send_header("Server-Timing", ", ".join([timing_name + ";dur=" + str(round(duration*1000, 3))
+            for timing_name, duration in timings.items()]))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+#Every connection is handled by its own thread, in which the JPEG images are decoded and
+#segmented, and the braille text is transcribed, while the model stays loaded in the
+#inference thread of the "InferenceBatcher" for as long as the server is running.
+class BrailleServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, server_address, learn, x_min=first_character_x_min,
+    max_batch_cells=2048, max_wait=0.01, quiet=False):
+        ThreadingHTTPServer.__init__(self, server_address, RequestHandler)
+        self.batcher = InferenceBatcher(learn, max_batch_cells, max_wait)
+        self.x_min = x_min
+        self.quiet = quiet
+
+    #The braille cells of a request are submitted to the inference thread by the "predict" function
+    #handed to "recognize_cells" (at most twice with dot detection, in which case the "queue" and
+    #"inference" timings are added up, and "batch" is that of the last batch).
+    def get_predict(self, timings, batch):
+        def predict(inputs, cell_count):
+            preds_argmax, request_timings, request_batch = self.batcher.classify(inputs, cell_count)
+            timings["queue"] += request_timings["queue"]
+            timings["inference"] += request_timings["inference"]
+            batch.update(request_batch)
+            return preds_argmax
+        return predict
+
+    #The "cropping" timing is the rest of the time taken by "recognize_cells" (gathering the
+    #braille cells and detecting their dots). The "segmentation" timing includes the grid
+    #calibration (see "calibrate_grid").
+    def ocr_page(self, JPEG_bytes):
+        start_time = time.perf_counter()
+        text_image_gray = decode_grayscale_JPEG(JPEG_bytes)
+        decoding_time = time.perf_counter()
+        chars_x_y_coordinates = calibrate_grid(text_image_gray, segment_page(text_image_gray, self.x_min))
+        segmentation_time = time.perf_counter()
+        timings = {"queue": 0, "inference": 0}
+        batch = {"pages": 0, "cells": 0}
+        code_points = recognize_cells(self.batcher.learn, text_image_gray, chars_x_y_coordinates,
+        self.get_predict(timings, batch))
+        recognition_time = time.perf_counter()
+        current_page_string = assemble_page_string(code_points)
+        timings = {"decoding": decoding_time - start_time, "segmentation": segmentation_time - decoding_time,
+        "cropping": recognition_time - segmentation_time - timings["queue"] - timings["inference"],
+        "queue": timings["queue"], "inference": timings["inference"],
+        "post_processing": time.perf_counter() - recognition_time}
+        return {"cells": current_page_string, "timings": timings, "batch": batch}
+
+    #The line or region of interest is given by the "line" or "region" parameter of the query
+    #string (parsed by "urllib.parse.parse_qs"). A "ValueError" is raised if neither is given,
+    #or if they aren't valid. The "recognition" timing includes the "queue" and "inference" timings.
+    def preview_region(self, JPEG_bytes, query):
+        if "line" in query:
+            if not query["line"][0].lstrip("-").isdigit():
+                raise ValueError("The line number should be an integer, got " + repr(query["line"][0]) + ".")
+            line_number, region = int(query["line"][0]), None
+        elif "region" in query:
+            line_number, region = None, parse_region(query["region"][0])
+        else:
+            raise ValueError('The "line" or "region" parameter is missing from the query string.')
+        start_time = time.perf_counter()
+        text_image_gray = decode_grayscale_JPEG(JPEG_bytes)
+        decoding_time = time.perf_counter()
+        timings = {"queue": 0, "inference": 0}
+        batch = {"pages": 0, "cells": 0}
+        response = recognize_region(self.batcher.learn, text_image_gray, region, line_number, self.x_min,
+        self.get_predict(timings, batch))
+        response["timings"] = dict({"decoding": decoding_time - start_time}, **response["timings"], **timings)
+        response["batch"] = batch
+        return response
+
+#The server only listens on the local computer ("127.0.0.1") by default.
+def serve(learn, host="127.0.0.1", port=8765, x_min=first_character_x_min):
+    server = BrailleServer((host, port), learn, x_min)
+    print("Listening on http://" + host + ":" + str(server.server_address[1]) + "/ (press Ctrl+C to stop).")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
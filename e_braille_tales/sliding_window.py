@@ -0,0 +1,45 @@
+import torch
+
+from .segmentation import characters_per_line
+
+#The line model converted from a model (see "convert_to_line_model") runs the layers of the model
+#before its classification head (the "features", such as the body of the models of fastai's
+#"cnn_learner") once over a whole line of braille cells (a "line strip", see "gather_line_strips"),
+#and then runs the classification head of the model (from its adaptive pooling layer onwards) over
+#the window of features of every braille cell, which is as wide as the features of a single braille
+#cell ("window_width") and moved along the line by the pitch of the braille cells. The features
+#only line up with the braille cells whose first pixel is a multiple of the "stride" of the features
+#away from the start of the line strip. The braille cells are therefore grouped by the remainder
+#of that division (their "phase"), and the features are computed once per phase, over the line
+#strip shifted by that many pixels. When the pitch of the braille cells is a multiple of the stride
+#(such as for the student models, see "build_student_model"), there is a single phase. The outputs
+#are returned like those of the models, with the categories along the second axis, followed by
+#the 41 braille cells of the line.
+class SlidingWindowLineModel(torch.nn.Module):
+    def __init__(self, features, head, cell_pitch, stride, window_width):
+        super().__init__()
+        self.features = features
+        self.head = head
+        self.cell_pitch = cell_pitch
+        self.stride = stride
+        self.window_width = window_width
+        self.phases = {}
+        for i in range(characters_per_line):
+            self.phases.setdefault(i*cell_pitch % stride, []).append(i)
+
+    def forward(self, strips):
+        outputs = [None]*characters_per_line
+        for phase, cell_indices in self.phases.items():
+            features = self.features(strips[:, :, phase:])
+            offsets = [(i*self.cell_pitch - phase)//self.stride for i in cell_indices]
+            #The features are padded with zeros (as by the convolutions of the model) should the
+            #window of the last braille cell go past the end of the line strip.
+            missing_width = offsets[-1] + self.window_width - features.shape[2]
+            if missing_width > 0:
+                features = torch.nn.functional.pad(features, (0, 0, 0, missing_width))
+            windows = torch.stack([features[:, :, offset:offset + self.window_width] for offset in offsets], 1)
+            cell_outputs = self.head(windows.reshape((-1,) + windows.shape[2:]))
+            cell_outputs = cell_outputs.reshape(len(strips), len(cell_indices), -1)
+            for j, i in enumerate(cell_indices):
+                outputs[i] = cell_outputs[:, j]
+        return torch.stack(outputs, 2)